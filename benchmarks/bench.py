@@ -0,0 +1,231 @@
+"""
+Time the solver's stages on synthetic graphs of growing size.
+
+    python -m benchmarks run --out before.json
+    python -m benchmarks run --generators grid odd --sizes 100 1000 --out after.json
+    python -m benchmarks compare before.json after.json
+
+Each case generates a seeded graph, makes it Eularian and walks its circuit,
+timing every phase the solver marks with profiling.phase(). The JSON written
+by `run` can be compared with an earlier run's to flag regressions.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from chinesepostman import eularian
+from chinesepostman import profiling
+from chinesepostman import sparse
+
+from .generators import GENERATORS
+
+SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+STAGES = ('pair solutions', 'pairing', 'circuit')  # Reported first, in order
+
+
+def run_case(generator, size, seed=0, strategy='blossom', backend='auto', repeat=1,
+             max_pairs=None):
+    """
+    Return the timings of solving one generated graph.
+
+    The fastest time of each phase over `repeat` runs is kept. Graphs with
+    more than `max_pairs` odd node pairs are not solved, and marked skipped.
+    """
+    graph = GENERATORS[generator](size, seed=seed)
+    odd = len(graph.odd_nodes)
+    case = {
+        'generator': generator,
+        'size': size,
+        'seed': seed,
+        'edges': len(graph),
+        'nodes': len(graph.node_keys),
+        'odd_nodes': odd,
+    }
+    pairs = odd * (odd - 1) // 2
+    if max_pairs is not None and pairs > max_pairs:
+        case['skipped'] = 'Too many odd node pairs: {}'.format(pairs)
+        return case
+
+    phases = {}
+    for i in range(repeat):
+        if i:
+            graph = GENERATORS[generator](size, seed=seed)  # Solving changes it
+        with profiling.Stats() as stats:
+            eularian_graph, _ = eularian.make_eularian(graph, strategy, backend)
+            route, _ = eularian.eularian_path(eularian_graph)
+        if not route:
+            raise ValueError('No circuit found for {} {}'.format(generator, size))
+        for name, phase in stats.phases.items():
+            phases[name] = min(phases.get(name, phase['seconds']), phase['seconds'])
+        phases['total'] = min(phases.get('total', stats.seconds), stats.seconds)
+        case['counters'] = stats.counters
+    order = [x for x in STAGES if x in phases] + sorted(set(phases) - set(STAGES))
+    case['seconds'] = {name: phases[name] for name in order}
+    return case
+
+
+def run(generators=None, sizes=SIZES, seed=0, strategy='blossom', backend='auto',
+        repeat=1, max_pairs=10 ** 6, max_seconds=60.0, progress=None):
+    """
+    Return the results of timing every generator at every size.
+
+    Once a case of a generator takes over `max_seconds`, its larger sizes are
+    skipped. `progress` is called with each case as it finishes.
+    """
+    cases = []
+    for generator in generators or sorted(GENERATORS):
+        too_slow = False
+        for size in sorted(sizes):
+            if too_slow:
+                case = {'generator': generator, 'size': size, 'seed': seed,
+                        'skipped': 'A smaller size took over {}s'.format(max_seconds)}
+            else:
+                case = run_case(generator, size, seed, strategy, backend, repeat,
+                                max_pairs)
+                too_slow = case.get('seconds', {}).get('total', 0) > max_seconds
+            cases.append(case)
+            if progress is not None:
+                progress(case)
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'strategy': strategy,
+        'backend': backend,
+        'scipy': sparse.AVAILABLE,
+        'repeat': repeat,
+        'cases': cases,
+    }
+
+
+def compare(old, new, threshold=1.25, min_seconds=0.005):
+    """
+    Return rows comparing the stage timings of two runs.
+
+    Each row is (case, stage, old seconds, new seconds, ratio, regressed). A
+    stage regressed if it got over `threshold` times slower, and by at least
+    `min_seconds`, so the noise of tiny timings isn't flagged.
+    """
+    def timings(results):
+        return {
+            '{generator}/{size}/{seed}'.format(**x): x['seconds']
+            for x in results['cases'] if 'seconds' in x
+        }
+
+    old_timings, new_timings = timings(old), timings(new)
+    rows = []
+    for case, seconds in new_timings.items():
+        if case not in old_timings:
+            continue
+        for stage, new_seconds in seconds.items():
+            old_seconds = old_timings[case].get(stage)
+            if old_seconds is None:
+                continue
+            ratio = new_seconds / old_seconds if old_seconds else float('inf')
+            regressed = ratio > threshold and new_seconds - old_seconds >= min_seconds
+            rows.append((case, stage, old_seconds, new_seconds, ratio, regressed))
+    return rows
+
+
+def print_case(case):
+    """Print a line about a finished case."""
+    name = '{generator:<10} {size:>8}'.format(**case)
+    if 'skipped' in case:
+        print('{}  skipped: {}'.format(name, case['skipped']), flush=True)
+        return
+    stages = '  '.join(
+        '{} {:.4f}s'.format(x, case['seconds'][x]) for x in STAGES + ('total',)
+        if x in case['seconds']
+    )
+    print('{} {:>8} edges {:>7} odd  {}'.format(
+        name, case['edges'], case['odd_nodes'], stages
+    ), flush=True)
+
+
+def setup_args(argv=None):
+    """Setup argparse for the run & compare commands."""
+    parser = argparse.ArgumentParser(description='Benchmark the solver.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    runner = commands.add_parser('run', help='Time the solver on generated graphs.')
+    runner.add_argument(
+        '--generators',
+        nargs='+',
+        choices=sorted(GENERATORS),
+        help='Graph generators to use. All by default.'
+    )
+    runner.add_argument(
+        '--sizes',
+        nargs='+',
+        type=int,
+        default=SIZES,
+        help='Rough numbers of edges of each graph.'
+    )
+    runner.add_argument('--seed', type=int, default=0, help='Random seed.')
+    runner.add_argument('--repeat', type=int, default=1, help='Runs per case.')
+    runner.add_argument(
+        '--strategy', choices=eularian.PAIRING_STRATEGIES, default='blossom'
+    )
+    runner.add_argument('--backend', choices=eularian.PATH_BACKENDS, default='auto')
+    runner.add_argument(
+        '--max-pairs',
+        type=int,
+        default=10 ** 6,
+        help='Skip graphs with more odd node pairs than this.'
+    )
+    runner.add_argument(
+        '--max-seconds',
+        type=float,
+        default=60.0,
+        help='Skip larger sizes of a generator once a case takes this long.'
+    )
+    runner.add_argument('--out', metavar='FILE', help='Write the results as JSON.')
+
+    comparer = commands.add_parser('compare', help='Flag regressions between runs.')
+    comparer.add_argument('old', help='JSON results of the earlier run.')
+    comparer.add_argument('new', help='JSON results of the later run.')
+    comparer.add_argument(
+        '--threshold',
+        type=float,
+        default=1.25,
+        help='Slowdown ratio counted as a regression.'
+    )
+    comparer.add_argument(
+        '--min-seconds',
+        type=float,
+        default=0.005,
+        help='Ignore slowdowns smaller than this.'
+    )
+    return parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+
+def main(argv=None):
+    """Run benchmarks or compare them. Returns 1 if anything regressed."""
+    args = setup_args(argv)
+    if args.command == 'run':
+        results = run(
+            args.generators, args.sizes, args.seed, args.strategy, args.backend,
+            args.repeat, args.max_pairs, args.max_seconds, progress=print_case,
+        )
+        if args.out:
+            with open(args.out, 'w') as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    rows = compare(old, new, args.threshold, args.min_seconds)
+    print('{:<28}{:<16}{:>10}{:>10}{:>8}'.format('Case', 'Stage', 'Old', 'New', 'Ratio'))
+    for case, stage, old_seconds, new_seconds, ratio, regressed in rows:
+        print('{:<28}{:<16}{:>10.4f}{:>10.4f}{:>8.2f}{}'.format(
+            case, stage, old_seconds, new_seconds, ratio,
+            '  REGRESSED' if regressed else '',
+        ))
+    regressions = sum(1 for row in rows if row[-1])
+    print('{} regression(s)'.format(regressions))
+    return 1 if regressions else 0
@@ -0,0 +1,120 @@
+"""
+Seeded generators of large synthetic graphs, for benchmarks.
+
+Each generator takes a rough number of edges and a seed, and returns a
+connected Graph with integer nodes. The same arguments always give the same
+graph.
+"""
+import math
+import random
+
+from chinesepostman.network import Graph
+
+
+def grid(edges, seed=0, max_weight=10):
+    """Return a square grid of city blocks, with about `edges` streets."""
+    rng = random.Random(seed)
+    side = max(2, int(round((1 + math.sqrt(1 + 2 * edges)) / 2)))  # 2n(n - 1) edges
+    graph = Graph()
+    for row in range(side):
+        for col in range(side):
+            node = row * side + col
+            if col + 1 < side:
+                graph.add_edge(node, node + 1, rng.randint(1, max_weight))
+            if row + 1 < side:
+                graph.add_edge(node, node + side, rng.randint(1, max_weight))
+    return graph
+
+
+def geometric(edges, seed=0, degree=8):
+    """
+    Return a random geometric graph, with about `edges` edges.
+
+    Nodes are scattered over a unit square, and joined to every node within a
+    radius giving them `degree` neighbours on average. Weights are distances.
+    Only the largest connected component is kept.
+    """
+    rng = random.Random(seed)
+    count = max(2, 2 * edges // degree)
+    radius = math.sqrt(degree / (math.pi * count))
+    points = [(rng.random(), rng.random()) for _ in range(count)]
+    cells = {}  # {(col, row): [node]}, cells are one radius square
+    for node, (x, y) in enumerate(points):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(node)
+
+    graph = Graph()
+    for (col, row), nodes in sorted(cells.items()):
+        for other_col, other_row in ((col, row), (col + 1, row - 1), (col + 1, row),
+                                     (col + 1, row + 1), (col, row + 1)):
+            others = cells.get((other_col, other_row), ())
+            for i, node in enumerate(nodes):
+                x, y = points[node]
+                for other in others[i + 1:] if others is nodes else others:
+                    distance = math.hypot(x - points[other][0], y - points[other][1])
+                    if distance <= radius:
+                        graph.add_edge(node, other, 1 + int(1000 * distance))
+    if not len(graph):
+        raise ValueError('No edges within radius, ask for more edges')
+    components = graph.components()
+    if len(components) > 1:
+        graph = graph.subgraph(components[0])
+    return graph
+
+
+def tree(edges, seed=0, core=0.1, max_weight=10):
+    """
+    Return a ring with random trees hanging off it, so many dead ends.
+
+    A `core` fraction of the edges make the ring, the rest the trees. Each new
+    tree node hangs off a random earlier node.
+    """
+    rng = random.Random(seed)
+    ring = max(3, int(edges * core))
+    graph = Graph()
+    for node in range(ring):
+        graph.add_edge(node, (node + 1) % ring, rng.randint(1, max_weight))
+    for node in range(ring, ring + max(0, edges - ring)):
+        graph.add_edge(rng.randrange(node), node, rng.randint(1, max_weight))
+    return graph
+
+
+def odd_nodes(edges, seed=0, odd=None, max_weight=10):
+    """
+    Return a graph with about `edges` edges & exactly `odd` odd nodes.
+
+    An Eularian graph is built from a ring and random short cycles, then
+    `odd / 2` edges join disjoint pairs of random nodes, to make them odd.
+    By default there is one odd node for every fifty edges.
+    """
+    if odd is None:
+        odd = 2 * max(1, edges // 100)
+    if odd % 2:
+        raise ValueError('The number of odd nodes must be even: {}'.format(odd))
+    count = max(3, odd, edges // 2)
+    if count + odd // 2 > edges:
+        raise ValueError('Too many odd nodes for {} edges: {}'.format(edges, odd))
+    rng = random.Random(seed)
+    graph = Graph()
+    for node in range(count):
+        graph.add_edge(node, (node + 1) % count, rng.randint(1, max_weight))
+    remaining = edges - count - odd // 2
+    while remaining > 1:
+        length = min(rng.randint(3, 6), remaining, count)
+        if remaining - length == 1:
+            length -= 1  # A cycle of 2 is a doubled edge, cycles of 1 are loops
+        cycle = rng.sample(range(count), length)
+        for head, tail in zip(cycle, cycle[1:] + cycle[:1]):
+            graph.add_edge(head, tail, rng.randint(1, max_weight))
+        remaining -= length
+    ends = rng.sample(range(count), odd)
+    for head, tail in zip(ends[::2], ends[1::2]):
+        graph.add_edge(head, tail, rng.randint(1, max_weight))
+    return graph
+
+
+GENERATORS = {
+    'grid': grid,
+    'geometric': geometric,
+    'tree': tree,
+    'odd': odd_nodes,
+}
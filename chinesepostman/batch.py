@@ -0,0 +1,219 @@
+"""
+Solve many graphs, from many start nodes, in one process.
+
+A manifest lists jobs, one JSON object per line, e.g.
+
+    {"id": "depot-1", "graph": "pacific_spirit", "start": 1}
+    {"graph": "roads.csv", "starts": ["A", "B", "C"], "strategy": "blossom"}
+    {"graph": "city.csv", "strategy": "anytime", "time_limit": 5, "nearest": 10}
+
+Jobs sharing a graph and options are solved as one group. The edges added to
+make a graph Eularian don't depend on where its circuit starts, so the
+shortest paths and pairing are found once per group, and only a circuit is
+walked per start. Groups are spread across a pool of worker processes, each
+keeping its last few solved graphs, and results are yielded as groups finish.
+"""
+import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+from . import directed
+from . import eularian
+from . import sparse
+from .network import GraphView
+
+# Job options that change the solution
+OPTIONS = ('strategy', 'backend', 'time_limit', 'nearest')
+CACHE_SIZE = 8  # Solved graphs kept by each process
+
+_solved = OrderedDict()  # {(graph name, options): (Eularian graph, node ids)}
+
+
+def check_options(spec):
+    """
+    Return the options of a job, converted for the solvers.
+
+    Numbers may be given as strings, e.g. from a query string. Raises
+    ValueError if an option, the graph name or the start node is invalid.
+    """
+    if not isinstance(spec.get('graph'), str):
+        raise ValueError('Graph must be a name')
+    if not _is_node(spec.get('start')):
+        raise ValueError('Start must be a node name or number')
+    options = {}
+    for name in OPTIONS:
+        value = spec.get(name)
+        if value is None:
+            continue
+        if name in ('time_limit', 'nearest'):
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                raise ValueError('{} must be a number'.format(name))
+            try:
+                value = float(value) if name == 'time_limit' else int(value)
+            except ValueError:
+                raise ValueError('{} must be a number'.format(name))
+            if value < (0 if name == 'time_limit' else 1):
+                raise ValueError('{} is too small'.format(name))
+        elif value not in (
+            eularian.PAIRING_STRATEGIES if name == 'strategy' else eularian.PATH_BACKENDS
+        ):
+            raise ValueError('Unknown {}: {}'.format(name, value))
+        elif value == 'scipy' and not sparse.AVAILABLE:
+            raise ValueError('The scipy backend requires NumPy and SciPy')
+        options[name] = value
+    return options
+
+
+def _is_node(value):
+    """Return True if a value can name a node, or is None."""
+    return value is None or isinstance(value, str) or (
+        isinstance(value, int) and not isinstance(value, bool)
+    )
+
+
+def read_manifest(lines):
+    """
+    Return a list of jobs, from lines of JSON.
+
+    Each job is a dictionary with an 'id', a 'graph' name, one 'start' node
+    (None for any) and its options. A line with 'starts' is one job per start.
+    Blank lines and lines starting with # are skipped. Jobs with invalid
+    options have an 'error' instead, and are never solved.
+    """
+    jobs = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            spec = json.loads(line)
+            graph = spec['graph']
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError('Invalid job on line {}: {}'.format(number, error))
+        starts = spec['starts'] if 'starts' in spec else [spec.get('start')]
+        if not isinstance(starts, list):
+            starts = [starts]  # Reported as an invalid start
+        for i, start in enumerate(starts):
+            job_id = spec.get('id', number)
+            if 'starts' in spec:
+                job_id = '{}:{}'.format(job_id, i)
+            job = dict(id=job_id, graph=graph, start=start)
+            try:
+                job.update(check_options(dict(spec, start=start)))
+            except ValueError as error:
+                job['error'] = str(error)
+            jobs.append(job)
+    return jobs
+
+
+def group_jobs(jobs):
+    """Return {(graph name, options): [jobs]}, in the order first seen."""
+    groups = OrderedDict()
+    for job in jobs:
+        options = tuple((x, job.get(x)) for x in OPTIONS)
+        groups.setdefault((job['graph'], options), []).append(job)
+    return groups
+
+
+def solve_graph(name, options, load):
+    """
+    Return a graph made Eularian, & its node ids, reusing recent solutions.
+
+    `load` is called with the graph name, and returns the graph and its
+    edgelist.NodeIds, or None.
+    """
+    key = (name, options)
+    if key in _solved:
+        _solved.move_to_end(key)
+        return _solved[key]
+    graph, node_ids = load(name)
+    components = graph.components()
+    if len(components) > 1:
+        raise eularian.DisconnectedGraphError(components)
+    kwargs = {x: value for x, value in options if value is not None}
+    if directed.has_one_way_edges(graph):
+        graph, _ = directed.make_eularian(graph, **kwargs)
+    elif not graph.is_eularian:
+        # A view, so the loaded graph isn't changed by doubling its dead ends
+        graph, _ = eularian.make_eularian(GraphView(graph), **kwargs)
+    _solved[key] = graph, node_ids
+    if len(_solved) > CACHE_SIZE:
+        _solved.popitem(last=False)
+    return graph, node_ids
+
+
+def solve_group(name, options, jobs, load):
+    """
+    Return the results of a group of jobs on the same graph.
+
+    Any error solving the graph is the result of each job, rather than raised.
+    """
+    try:
+        graph, node_ids = solve_graph(name, options, load)
+    except (IOError, OSError, ValueError) as error:
+        return [_result(job, error=str(error)) for job in jobs]
+    except Exception as error:  # Unexpected, but only fails this group
+        message = '{}: {}'.format(type(error).__name__, error)
+        return [_result(job, error=message) for job in jobs]
+
+    cost = graph.total_cost
+    nodes = graph.nodes
+    results = []
+    for job in jobs:
+        start = job['start']
+        if start is not None and node_ids is not None:
+            start = node_ids.ids.get(str(start))
+        elif isinstance(start, str) and start.lstrip('-').isdigit():
+            start = int(start)
+        if start is not None and start not in nodes:
+            results.append(_result(job, error='Unknown start node'))
+            continue
+        route, _ = eularian.hierholzer_walk(graph, start)
+        if node_ids is not None:
+            route = [node_ids.names[x] for x in route]
+        results.append(_result(job, cost=cost, edges=len(route) - 1, route=route))
+    return results
+
+
+def _result(job, **values):
+    """Return a result for a job, with its id, graph & start first."""
+    result = OrderedDict((x, job[x]) for x in ('id', 'graph', 'start'))
+    result.update(values)
+    return result
+
+
+def solve_jobs(jobs, load, workers=None):
+    """
+    Generate the results of jobs, a group at a time, as groups finish.
+
+    `load` is called with graph names, see solve_graph. It must be picklable,
+    i.e. a module level function, if there are `workers`.
+    """
+    for job in jobs:
+        if 'error' in job:  # Invalid, see read_manifest
+            yield _result(job, error=job['error'])
+    groups = group_jobs(x for x in jobs if 'error' not in x)
+    if not workers or workers < 2 or len(groups) < 2:
+        for (name, options), group in groups.items():
+            for result in solve_group(name, options, group, load):
+                yield result
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(solve_group, name, options, group, load): group
+            for (name, options), group in groups.items()
+        }
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as error:  # e.g. a worker died
+                message = '{}: {}'.format(type(error).__name__, error)
+                results = [_result(job, error=message) for job in futures[future]]
+            for result in results:
+                yield result
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['batch'])
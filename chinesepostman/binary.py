@@ -0,0 +1,106 @@
+"""
+Compact binary graph files.
+
+A file is a 24 byte header followed by four fixed-width columns, one value per
+edge: 64 bit heads, 64 bit tails, 64 bit integer or float weights, and one byte
+directed flags. Everything is little-endian. The reader memory-maps the file,
+and the columns back the graph's EdgeStore directly, without parsing.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from .network import EdgeStore
+from .network import Graph
+
+MAGIC = b'CPGRAPH\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQ')  # Magic, version, flags & edge count
+FLOAT_WEIGHTS = 0x1  # Flag: weights are doubles, not integers
+
+
+def is_graph_file(path):
+    """Return True if a file starts like a binary graph file."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except (IOError, OSError):
+        return False
+
+
+def edge_columns(graph):
+    """Return the heads, tails, weights and directed flags of a graph as columns."""
+    store = graph.edges
+    if isinstance(store, EdgeStore) and len(store) == len(store.alive):
+        return store.heads, store.tails, store.weights, store.directed  # As they are
+    heads, tails, weights, directed = array('q'), array('q'), array('q'), bytearray()
+    for edge in store.values():
+        try:
+            weights.append(edge.weight)
+        except TypeError:  # A float weight, switch to a float column
+            weights = array('d', weights)
+            weights.append(edge.weight)
+        heads.append(edge.head)
+        tails.append(edge.tail)
+        directed.append(bool(edge.directed))
+    return heads, tails, weights, directed
+
+
+def write_graph(graph, path):
+    """Write the edges of a graph to a binary graph file."""
+    heads, tails, weights, directed = edge_columns(graph)
+    weight_type = weights.typecode if isinstance(weights, array) else weights.format
+    flags = FLOAT_WEIGHTS if weight_type == 'd' else 0
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, len(directed)))
+        for column in (heads, tails, weights):
+            if sys.byteorder != 'little':
+                column = array(weight_type if column is weights else 'q', column)
+                column.byteswap()
+            f.write(column)
+        f.write(directed)
+
+
+def read_graph(path):
+    """
+    Return a Graph of the edges in a binary graph file.
+
+    The file stays memory-mapped while the graph's edge store uses it. Only
+    the adjacency index is built in memory.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError('Not a binary graph file: {}'.format(path))
+        magic, version, flags, count = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError('Not a binary graph file: {}'.format(path))
+        if version != VERSION:
+            raise ValueError('Unsupported binary graph version: {}'.format(version))
+        size = HEADER.size + 25 * count
+        if count and f.seek(0, 2) < size:
+            raise ValueError('Truncated binary graph file: {}'.format(path))
+        if not count:
+            return Graph()
+        buffer = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+
+    weight_type = 'd' if flags & FLOAT_WEIGHTS else 'q'
+    view = memoryview(buffer)
+    columns = []
+    offset = HEADER.size
+    for typecode in ('q', 'q', weight_type):
+        column = view[offset:offset + 8 * count].cast(typecode)
+        if sys.byteorder != 'little':  # Columns are little-endian, copy & swap
+            column = array(typecode, column.tobytes())
+            column.byteswap()
+        columns.append(column)
+        offset += 8 * count
+    columns.append(view[offset:offset + count])  # Directed flags, one byte each
+    store = EdgeStore.from_columns(*columns, owner=buffer)
+    return Graph.from_edge_store(store)
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['binary'])
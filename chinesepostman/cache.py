@@ -0,0 +1,115 @@
+"""
+Persistent on-disk cache of odd node shortest path tables.
+
+Tables are stored in a local SQLite file, keyed by a fingerprint of the graph's
+edges, so re-solving an unchanged graph skips the shortest path phase. Any
+change to an edge changes the fingerprint. The least recently used tables are
+evicted once the cache grows past its size limit.
+"""
+import hashlib
+import pickle
+import sqlite3
+
+from . import dijkstra
+
+VERSION = 1  # Bump when the stored format changes, to orphan old tables
+
+
+def fingerprint(graph):
+    """
+    Return a stable hash of a graph's edges.
+
+    Edge order and keys don't matter, but every head, tail, weight and
+    direction does, including the type of the weight.
+    """
+    digest = hashlib.sha256('v{}\n'.format(VERSION).encode())
+    for contents in sorted(edge.contents for edge in graph.edges.values()):
+        digest.update('{!r} {!r} {!r} {!r}\n'.format(*contents).encode())
+    return digest.hexdigest()
+
+
+class PathCache(object):
+    """A size-bounded LRU store of dijkstra.PairSolutions, in a SQLite file."""
+
+    def __init__(self, path, max_bytes=256 * 1024 ** 2):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(path)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS tables ('
+                ' key TEXT PRIMARY KEY, data BLOB, size INTEGER, used INTEGER)'
+            )
+
+    def __repr__(self):
+        return 'PathCache({!r})'.format(self.path)
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM tables').fetchone()[0]
+
+    def _touch(self, key):
+        """Mark a table as the most recently used."""
+        self._db.execute(
+            'UPDATE tables SET used = (SELECT COALESCE(MAX(used), 0) + 1 FROM tables)'
+            ' WHERE key = ?',
+            (key,),
+        )
+
+    def get(self, key, node_pairs=()):
+        """
+        Return the cached PairSolutions for a fingerprint, or None.
+
+        Also None if any of `node_pairs` is missing from the cached table.
+        """
+        row = self._db.execute('SELECT data FROM tables WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        solutions = dijkstra.PairSolutions()
+        try:
+            solutions.costs, solutions.trees = pickle.loads(row[0])
+        except Exception:  # Corrupt or incompatible, treat as a miss
+            return None
+        if not all(pair in solutions for pair in node_pairs):
+            return None
+        with self._db:
+            self._touch(key)
+        return solutions
+
+    def put(self, key, solutions):
+        """Store the PairSolutions for a fingerprint, evicting old tables if needed."""
+        data = pickle.dumps((solutions.costs, solutions.trees), pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return  # Would evict everything, and still not fit
+        with self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO tables (key, data, size, used)'
+                ' VALUES (?, ?, ?, 0)',
+                (key, sqlite3.Binary(data), len(data)),
+            )
+            self._touch(key)
+            self._evict()
+
+    def _evict(self):
+        """Drop the least recently used tables until we fit in max_bytes."""
+        query = 'SELECT COALESCE(SUM(size), 0) FROM tables'
+        total = self._db.execute(query).fetchone()[0]
+        rows = self._db.execute('SELECT key, size FROM tables ORDER BY used').fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute('DELETE FROM tables WHERE key = ?', (key,))
+            total -= size
+
+    def clear(self):
+        """Drop every table."""
+        with self._db:
+            self._db.execute('DELETE FROM tables')
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['cache'])
@@ -0,0 +1,206 @@
+"""
+Shrink a graph before solving it, then expand the circuit back.
+
+Two reductions are made. Dead-end trees are peeled off, since every edge of a
+tree hanging off the rest of the graph must be walked twice, there and back.
+Then chains of order 2 nodes are contracted into single weighted super-edges.
+The expensive phases only see the reduced graph, and the circuit through it
+is expanded back to the original nodes afterwards.
+"""
+import logging
+
+from . import profiling
+from .eularian import DisconnectedGraphError
+from .eularian import hierholzer_walk
+from .eularian import make_eularian
+from .network import Graph
+
+log = logging.getLogger(__name__)
+
+
+class Contraction(object):
+    """A reduced graph, and how to get back to the graph it came from."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.peeled = set()  # Keys of tree edges
+        self.trees = {}  # {node: [(key, other end)]} of peeled tree edges
+        self.tree_cost = 0  # Of walking every tree edge twice
+        self.chains = []  # Inner nodes of each reduced edge, from head to tail
+        self.reduced = Graph()
+        self._peel()
+        self._contract()
+
+    def __repr__(self):
+        return 'Contraction(<{}> edges to <{}>)'.format(
+            len(self.graph), len(self.reduced)
+        )
+
+    def _peel(self):
+        """Peel dead-end trees, leaf by leaf, in O(V + E)."""
+        graph = self.graph
+        orders = graph.node_orders
+        leaves = [node for node, order in orders.items() if order == 1]
+        while leaves:
+            leaf = leaves.pop()
+            for key, edge in graph.edge_options(leaf).items():
+                if key in self.peeled:
+                    continue
+                other = edge.end(leaf)
+                if other == leaf:
+                    break  # A self-loop isn't a tree
+                self.peeled.add(key)
+                self.tree_cost += 2 * edge.weight
+                self.trees.setdefault(leaf, []).append((key, other))
+                self.trees.setdefault(other, []).append((key, leaf))
+                orders[other] -= 1
+                if orders[other] == 1:
+                    leaves.append(other)
+
+    def _core_options(self, node):
+        """Return the {key: edge} options of a node, without tree edges."""
+        options = self.graph.edge_options(node)
+        return {k: edge for k, edge in options.items() if k not in self.peeled}
+
+    def _is_inner(self, options):
+        """Return True if a node with these options sits inside a chain."""
+        return len(options) == 2 and all(x.head != x.tail for x in options.values())
+
+    def _contract(self):
+        """Contract chains of order 2 nodes into super-edges, in O(V + E)."""
+        visited = set()  # Keys of contracted edges
+        inner = {}  # {node: core options} of inner chain nodes
+        ends = []
+        for node in self.graph.node_keys:
+            options = self._core_options(node)
+            if self._is_inner(options):
+                inner[node] = options
+            elif options:
+                ends.append(node)
+        # Chains between end nodes, then cycles of inner nodes only
+        anchors = ends + sorted(inner)
+        for anchor in anchors:
+            options = inner.get(anchor) or self._core_options(anchor)
+            for key in options:
+                if key not in visited:
+                    self._follow(anchor, key, inner, visited)
+
+    def _follow(self, start, key, inner, visited):
+        """Walk a chain from start along key, and add its super-edge(s)."""
+        chain, weights = [], []
+        node = start
+        while True:
+            visited.add(key)
+            edge = self.graph.edges[key]
+            weights.append(edge.weight)
+            node = edge.end(node)
+            if node == start or node not in inner:
+                break
+            chain.append(node)
+            key = next(k for k in inner[node] if k not in visited)
+        if node == start and chain:  # Don't make a self-loop, keep one inner node
+            self._add(start, chain[0], weights[0], [])
+            self._add(chain[0], start, sum(weights[1:]), chain[1:])
+        else:
+            self._add(start, node, sum(weights), chain)
+
+    def _add(self, head, tail, weight, chain):
+        """Add a super-edge to the reduced graph."""
+        self.reduced.add_edge(head, tail, weight)
+        self.chains.append(chain)
+
+    def expand(self, route, keys):
+        """
+        Return a circuit through the original graph, from one through the reduced.
+
+        `keys` are the edges walked, as from hierholzer_walk. Keys of edges
+        added to the reduced graph, to make it Eularian, are copies of its
+        cheapest edge between their nodes.
+        """
+        edges = self.reduced.edges
+        cheapest = {}  # {(node, node): key}
+        for key in range(len(self.chains)):
+            edge = edges[key]
+            pair = tuple(sorted((edge.head, edge.tail)))
+            if pair not in cheapest or edge.weight < edges[cheapest[pair]].weight:
+                cheapest[pair] = key
+
+        expanded = route[:1]
+        for i, key in enumerate(keys):
+            node, next_node = route[i], route[i + 1]
+            if key >= len(self.chains):  # Added while making it Eularian
+                key = cheapest[tuple(sorted((node, next_node)))]
+            chain = self.chains[key]
+            if node != edges[key].head:
+                chain = chain[::-1]
+            expanded.extend(chain)
+            expanded.append(next_node)
+
+        circuit = []
+        for node in expanded:
+            circuit.append(node)
+            if node in self.trees:
+                circuit.extend(self._tour(node))
+        return circuit
+
+    def _tour(self, root):
+        """Return a walk over the trees hanging off root, back to root."""
+        walk = []
+        stack = [(root, iter(self.trees.pop(root)))]
+        while stack:
+            node, options = stack[-1]
+            for key, other in options:
+                if other in self.trees:  # Not walked down yet
+                    walk.append(other)
+                    stack.append((other, iter(self.trees.pop(other))))
+                    break
+            else:
+                stack.pop()
+                if stack:
+                    walk.append(stack[-1][0])  # Back up
+        return walk
+
+
+def solve(
+    graph, start=None, strategy='blossom', backend='auto', workers=None, cache=None,
+    time_limit=None, nearest=None
+):
+    """
+    Return an Eularian circuit & its cost, solving a contracted graph.
+
+    The circuit is the same cost as solving the graph as it is. The graph
+    must be connected. If `start` is set, the circuit starts there. The other
+    options are passed on to make_eularian.
+    """
+    components = graph.components()
+    if len(components) > 1:
+        raise DisconnectedGraphError(components)
+    with profiling.phase('contraction'):
+        contraction = Contraction(graph)
+    reduced = contraction.reduced
+    log.info('\tContracted <%s> edges to <%s>', len(graph), len(reduced))
+
+    if len(reduced):
+        if not reduced.is_eularian:
+            reduced, _ = make_eularian(
+                reduced, strategy, backend, workers, cache, time_limit, nearest
+            )
+        reduced_start = start if start in reduced.nodes else None
+        with profiling.phase('circuit'):
+            route, keys = hierholzer_walk(reduced, reduced_start)
+    else:  # Nothing but trees
+        route = [start if start in graph.nodes else min(graph.nodes)]
+        keys = []
+    with profiling.phase('expansion'):
+        circuit = contraction.expand(route, keys)
+    cost = reduced.total_cost + contraction.tree_cost
+
+    if start is not None and circuit[0] != start:  # Rotate the circuit
+        i = circuit.index(start)
+        circuit = circuit[i:] + circuit[1:i + 1]
+    return circuit, cost
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['contract'])
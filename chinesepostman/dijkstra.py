@@ -1,6 +1,12 @@
 """Minimum Cost Path solver using Dijkstra's Algorithm."""
 
 
+import heapq
+from collections.abc import Mapping
+
+from . import profiling
+
+
 def summarize_path(end, previous_nodes):
     """
     Summarize a chain of previous nodes and return path.
@@ -10,49 +16,318 @@ def summarize_path(end, previous_nodes):
     """
     route = []
     prev = end
-    while prev:
-        route.insert(0, prev)  # At beginning
-        prev = previous_nodes[prev]
+    while prev is not None:
+        route.append(prev)
+        prev = previous_nodes.get(prev)
+    route.reverse()  # Walked backwards from the end
     return route
 
 
-def find_cost(path, graph):
+def prune_tree(ends, previous_nodes):
     """
-    Return minimum cost and route from start to end nodes.
+    Return the part of a chain of previous nodes that leads to the end nodes.
 
-    Uses Dijkstra's algorithm to find shortest path.
+    All ends must have been reached. Paths to ends share their common prefix,
+    which is only walked once.
     """
-    start, end = path
+    tree = {}
+    for end in ends:
+        node = end
+        while node is not None and node not in tree:
+            prev = previous_nodes.get(node)
+            tree[node] = prev
+            node = prev
+    return tree
+
+
+def find_costs(start, graph, targets=None, max_cost=None):
+    """
+    Return minimum costs and previous nodes from start to many nodes.
+
+    Runs a single Dijkstra search using a binary heap with lazy deletion.
+    If `targets` are given, stop as soon as all of them are settled,
+    otherwise settle every reachable node. If `max_cost` is given, also stop
+    before settling a node that costs more. Returns a {node: cost} dictionary
+    of settled nodes, and the {node: previous node} chain for summarize_path.
+    """
+    return find_costs_from((start,), graph, targets, max_cost)
+
 
-    all_nodes = graph.node_keys
-    unvisited = set(all_nodes)
-    # Initialize all nodes to total graph cost (at least)
-    total_cost = graph.total_cost
-    node_costs = {node: total_cost for node in all_nodes}
-    node_costs[start] = 0  # Start has zero cost
+def find_costs_from(starts, graph, targets=None, max_cost=None):
+    """
+    Return minimum costs and previous nodes from the nearest of many starts.
 
-    previous_nodes = {node: None for node in all_nodes}
+    As find_costs, but every start is searched from at once, at a cost of 0.
+    Nodes are settled in order of cost, which is the order of the returned
+    {node: cost} dictionary. Chains of previous nodes end at a start.
+    """
+    remaining = set(targets) if targets is not None else None
+    node_costs = {}  # Settled nodes only
+    best_costs = dict.fromkeys(starts, 0)  # Cheapest cost seen so far
+    previous_nodes = dict.fromkeys(starts)
 
-    node = start
-    while unvisited:  # While we still have unvisited nodes
+    queue = [(0, start) for start in best_costs]
+    heapq.heapify(queue)
+    pushes = len(queue)
+    while queue:
+        cost, node = heapq.heappop(queue)
+        if node in node_costs:
+            continue  # Stale entry, we already settled this node more cheaply
+        if max_cost is not None and cost > max_cost:
+            break  # Every node left costs more
+        node_costs[node] = cost
+        if remaining is not None:
+            remaining.discard(node)
+            if not remaining:  # Since we're pathfinding, we can exit early
+                break
         for option in graph.edge_options(node).values():
             next_node = option.end(node)
-            if next_node not in unvisited:
+            if next_node in node_costs:
                 continue  # Don't go backwards
+            new_cost = cost + option.weight
             # If this path was cheaper than the prior cost, update it:
-            if node_costs[next_node] > node_costs[node] + option.weight:
-                node_costs[next_node] = node_costs[node] + option.weight
+            if next_node not in best_costs or new_cost < best_costs[next_node]:
+                best_costs[next_node] = new_cost
                 previous_nodes[next_node] = node
-        unvisited.remove(node)
-        # Next node must be closest unvisited node:
-        options = {k: v for k, v in node_costs.items() if k in unvisited}
+                heapq.heappush(queue, (new_cost, next_node))
+                pushes += 1
+
+    profiling.count('dijkstra runs')
+    profiling.count('heap pushes', pushes)
+    return node_costs, previous_nodes
+
+
+class SearchSpace(object):
+    """
+    A graph's adjacency as flat lists, for many searches over the same graph.
+
+    Costs and previous nodes are kept in lists allocated once, each entry
+    stamped with the generation of the search that set it. A new search only
+    bumps the generation, rather than clearing every node, so it only costs
+    work in the region it explores. Edge objects are never built while
+    searching.
+    """
+
+    def __init__(self, graph):
+        self.nodes = sorted(graph.nodes)  # Positions break cost ties as nodes would
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.options = [[] for _ in self.nodes]  # [(next position, weight)]
+        for edge in graph.edges.values():
+            head, tail = self.index[edge.head], self.index[edge.tail]
+            if head != tail:  # Self-loops never lead anywhere new
+                self.options[head].append((tail, edge.weight))
+                self.options[tail].append((head, edge.weight))
+        size = len(self.nodes)
+        self.costs = [0] * size
+        self.previous = [-1] * size
+        self.reached = [0] * size  # Generation of the last search to reach a node
+        self.settled = [0] * size  # Generation of the last search to settle it
+        self.generation = 0
+        self.found = []  # Targets settled by the last search, nearest first
+        self._targets = None, frozenset()  # Last targets & their positions
+
+    def search(self, starts, targets=None, limit=None):
+        """
+        Search from the nearest of many starts, as find_costs_from.
+
+        If `targets` are given, stop as soon as all of them are settled, or
+        the nearest `limit` of them. The results are read with cost, tree and
+        found, until the next search. Targets given as the same frozenset as
+        the last search are only looked up once.
+        """
+        self.generation += 1
+        generation = self.generation
+        costs, previous, options = self.costs, self.previous, self.options
+        reached, settled = self.reached, self.settled
+
+        queue = []
+        for i in set(self.index[x] for x in starts if x in self.index):
+            reached[i], costs[i], previous[i] = generation, 0, -1
+            queue.append((0, i))
+        heapq.heapify(queue)
+        positions = None
+        if targets is not None:
+            if not isinstance(targets, frozenset) or targets is not self._targets[0]:
+                index = self.index
+                positions = frozenset(index[x] for x in targets if x in index)
+                self._targets = targets, positions
+            positions = self._targets[1]
+            limit = len(positions) if limit is None else min(limit, len(positions))
+            if not limit:
+                queue = []  # Nothing to find
+        found = self.found = []
+
+        pushes = len(queue)
+        while queue:
+            cost, i = heapq.heappop(queue)
+            if settled[i] == generation:
+                continue  # Stale entry, we already settled this node more cheaply
+            settled[i] = generation
+            if positions is not None and i in positions:
+                found.append(self.nodes[i])
+                if len(found) >= limit:
+                    break
+            for j, weight in options[i]:
+                if settled[j] == generation:
+                    continue
+                new_cost = cost + weight
+                if reached[j] != generation or new_cost < costs[j]:
+                    reached[j], costs[j], previous[j] = generation, new_cost, i
+                    heapq.heappush(queue, (new_cost, j))
+                    pushes += 1
+
+        profiling.count('dijkstra runs')
+        profiling.count('heap pushes', pushes)
+
+    def cost(self, node):
+        """Return the cost of a node settled by the last search, else infinity."""
+        i = self.index.get(node)
+        if i is None or self.settled[i] != self.generation:
+            return float('inf')
+        return self.costs[i]
+
+    def tree(self, ends):
+        """
+        Return the {node: previous node} chain of the last search, as prune_tree.
+
+        Only ends settled by the last search are included.
+        """
+        nodes, previous, index = self.nodes, self.previous, self.index
+        tree = {}
+        for end in ends:
+            i = index.get(end)
+            if i is None or self.settled[i] != self.generation:
+                continue
+            node = end
+            while node not in tree:
+                i = previous[i]
+                prev = nodes[i] if i >= 0 else None
+                tree[node] = prev
+                if prev is None:
+                    break
+                node = prev
+        return tree
+
+
+def group_searches(node_pairs):
+    """
+    Return a {start: set of end nodes} dictionary covering all node pairs.
+
+    Pairs whose reverse is already covered are skipped, since one search from
+    each start node then solves every pair.
+    """
+    searches = {}
+    for start, end in node_pairs:
+        if start in searches.get(end, ()):
+            continue  # Reverse pair is already covered
+        searches.setdefault(start, set()).add(end)
+    return searches
+
+
+class PairSolutions(Mapping):
+    """
+    A {(start, end): (cost, path)} mapping of shortest paths between node pairs.
+
+    Only costs, and one predecessor tree per start node, are stored. Paths are
+    built from the trees on access, so that only the few pairs which end up in
+    a route are ever expanded. Every pair can also be looked up reversed.
+    """
+
+    def __init__(self):
+        self.costs = {}  # {(start, end): cost}, in the direction searched
+        self.trees = {}  # {start: {node: previous node}}
+
+    def __repr__(self):
+        return 'PairSolutions({})'.format(self.costs)
+
+    def add(self, start, end_costs, tree):
+        """
+        Store the costs from start to some end nodes, and the tree leading there.
+
+        What's already stored for the start is kept, and the trees combined, so
+        another search from a start only adds the paths it's missing.
+        """
+        for end, cost in end_costs.items():
+            self.costs.setdefault((start, end), cost)
+        self._add_tree(start, tree)
+
+    def merge(self, other):
+        """Add all of another table's solutions to this one, as add."""
+        for pair, cost in other.costs.items():
+            self.costs.setdefault(pair, cost)
+        for start, tree in other.trees.items():
+            self._add_tree(start, tree)
+
+    def _add_tree(self, start, tree):
+        """
+        Combine a tree of shortest paths from start with the one stored.
+
+        Stored nodes keep their previous nodes, so their paths stay as they
+        were, and new nodes join them at the first node they share.
+        """
+        known = self.trees.get(start)
+        if known is None:
+            self.trees[start] = tree
+        else:  # Copied, as trees may be shared with other tables
+            combined = dict(tree)
+            combined.update(known)
+            self.trees[start] = combined
+
+    def _searched(self, pair):
+        """Return a pair in the direction it was searched, and if it was reversed."""
+        if pair in self.costs:
+            return pair, False
+        start, end = pair
+        if (end, start) in self.costs:
+            return (end, start), True
+        raise KeyError(pair)
+
+    def cost(self, pair):
+        """Return the cost of the shortest path between a pair of nodes."""
+        return self.costs[self._searched(pair)[0]]
+
+    def path(self, pair):
+        """Return the shortest path between a pair of nodes, empty if unreachable."""
+        (start, end), reverse = self._searched(pair)
+        if self.costs[(start, end)] == float('inf'):
+            return []
+        path = summarize_path(end, self.trees[start])
+        return path[::-1] if reverse else path
+
+    def __getitem__(self, pair):
+        return self.cost(pair), self.path(pair)
+
+    def __contains__(self, pair):
         try:
-            # Find key of minimum value in a dictionary:
-            node = min(options, key=options.get)  # Get nearest new node # type: ignore
-        except ValueError:  # arg is empty sequence, aka dead ended
-            break
-        if node == end:  # Since we're pathfinding, we can exit early
-            break
+            self._searched(pair)
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    def __iter__(self):
+        costs = self.costs
+        for start, end in costs:
+            yield start, end
+            if (end, start) not in costs:  # Also the reverse, unless searched too
+                yield end, start
+
+    def __len__(self):
+        costs = self.costs
+        return len(costs) + sum((end, start) not in costs for start, end in costs)
+
+
+def find_cost(path, graph):
+    """
+    Return minimum cost and route from start to end nodes.
+
+    Uses Dijkstra's algorithm to find shortest path. Cost is infinite and the
+    route is empty if end cannot be reached.
+    """
+    start, end = path
+
+    node_costs, previous_nodes = find_costs(start, graph, [end])
+    if end not in node_costs:  # Dead ended
+        return float('inf'), []
 
     cost = node_costs[end]
     shortest_path = summarize_path(end, previous_nodes)
@@ -0,0 +1,147 @@
+"""
+Directed and mixed Chinese-Postman, by minimum cost flow.
+
+One-way edges may only be walked from head to tail. Wherever more of them
+lead into a node than out of it, some edges must be walked again. Which ones
+is a minimum cost flow, from the nodes short of ways out to the nodes short of
+ways in, over every edge in the directions it allows.
+
+Two-way edges the flow doesn't use are left over. They are made even by
+pairing their odd nodes, as in the undirected problem, then walked around
+their circuits, which keeps every node balanced. This is optimal for graphs
+of one-way edges only, or two-way edges only. The mixed problem is NP-hard in
+general, so mixed graphs get a good, but not always the cheapest, route.
+"""
+import logging
+
+from . import eularian
+from . import flow
+from . import profiling
+from .network import Graph
+
+log = logging.getLogger(__name__)
+
+
+def has_one_way_edges(graph):
+    """Return True if any edge of a graph is directed."""
+    return any(edge.directed for edge in graph.edges.values())
+
+
+def imbalances(graph):
+    """Return {node: one-way edges in - one-way edges out}, for unbalanced nodes."""
+    balance = {}
+    for edge in graph.edges.values():
+        if edge.directed and edge.head != edge.tail:
+            balance[edge.head] = balance.get(edge.head, 0) - 1
+            balance[edge.tail] = balance.get(edge.tail, 0) + 1
+    return {node: x for node, x in balance.items() if x}
+
+
+def find_extra_walks(graph):
+    """
+    Return the cheapest extra walks that balance the one-way edges.
+
+    Returns a {key: (walks head to tail, walks tail to head)} dictionary of
+    the edges walked. A two-way edge's required walk is among its walks.
+    Raises ValueError if the one-way edges can't be balanced, i.e. the graph
+    isn't strongly connected.
+    """
+    keys, arcs = [], []
+    for key, edge in graph.edges.items():
+        keys.append(key)
+        arcs.append((edge.head, edge.tail, edge.weight, None))
+        if not edge.directed:
+            keys.append(key)
+            arcs.append((edge.tail, edge.head, edge.weight, None))
+    try:
+        flows = flow.min_cost_flow(imbalances(graph), arcs)
+    except ValueError:
+        raise ValueError('Some one-way edges can\'t be walked back from')
+
+    walks = {}
+    for key, (head, _, _, _), amount in zip(keys, arcs, flows):
+        if amount:
+            forward, backward = walks.get(key, (0, 0))
+            if head == graph.edges[key].head:
+                walks[key] = (forward + amount, backward)
+            else:
+                walks[key] = (forward, backward + amount)
+    return walks
+
+
+def orient(graph, strategy='blossom', backend='auto', time_limit=None, nearest=None):
+    """
+    Return the one-way edges walking every edge of a graph of two-way edges.
+
+    Odd nodes are paired with eularian.make_eularian, then each component is
+    walked around its circuit, so every node is left as many ways in as out.
+    """
+    oriented = []
+    for nodes in graph.components():
+        component = graph.subgraph(nodes)
+        if not component.is_eularian:
+            component, _ = eularian.make_eularian(
+                component, strategy, backend, time_limit=time_limit, nearest=nearest
+            )
+        route, keys = eularian.hierholzer_walk(component)
+        for i, key in enumerate(keys):
+            oriented.append((route[i], route[i + 1], component.edges[key].weight, True))
+    return oriented
+
+
+def make_eularian(
+    graph, strategy='blossom', backend='auto', time_limit=None, nearest=None
+):
+    """
+    Return a graph of one-way edges with an Eularian circuit, walking every edge.
+
+    Also returns the number of edges added.
+    """
+    with profiling.phase('balancing'):
+        log.info('\tBalancing one-way edges')
+        walks = find_extra_walks(graph)
+        log.info('\t\t(%s edges walked again)', len(walks))
+
+    edges = []
+    unwalked = Graph()  # Two-way edges the balancing flow doesn't use
+    for key, edge in graph.edges.items():
+        head, tail, weight, directed = edge.contents
+        forward, backward = walks.get(key, (0, 0))
+        if directed:
+            forward += 1  # Its required walk
+        elif not forward and not backward:
+            unwalked.add_edge(head, tail, weight)
+        edges.extend([(head, tail, weight, True)] * forward)
+        edges.extend([(tail, head, weight, True)] * backward)
+
+    with profiling.phase('orienting'):
+        log.info('\tOrienting <%s> two-way edges', len(unwalked))
+        if len(unwalked):
+            edges.extend(orient(unwalked, strategy, backend, time_limit, nearest))
+
+    eularian_graph = Graph(edges)
+    return eularian_graph, len(eularian_graph) - len(graph)
+
+
+def solve(
+    graph, start=None, strategy='blossom', backend='auto', time_limit=None, nearest=None
+):
+    """
+    Return a circuit walking every edge, one-way edges head to tail, & its cost.
+
+    The graph must be connected. If `start` is set, the circuit starts there.
+    """
+    components = graph.components()
+    if len(components) > 1:
+        raise eularian.DisconnectedGraphError(components)
+    eularian_graph, _ = make_eularian(graph, strategy, backend, time_limit, nearest)
+    with profiling.phase('circuit'):
+        route, _ = eularian.hierholzer_walk(eularian_graph, start)
+    if len(route) != len(eularian_graph) + 1:
+        raise ValueError('Some one-way edges can\'t be walked back from')
+    return route, eularian_graph.total_cost
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['directed'])
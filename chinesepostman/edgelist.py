@@ -0,0 +1,207 @@
+"""
+Streaming ingestion of CSV and TSV edge lists.
+
+Rows are read one line at a time and flow through a pipeline of generators:
+parsing and validation, node ID interning and optional de-duplication, then
+chunks of edges are added to a Graph. The text is never held in memory as a whole.
+Files ending in .gz are decompressed on the fly.
+"""
+import csv
+import gzip
+import itertools
+import math
+import time
+
+from .network import Graph
+
+TRUE = ('1', 'true', 't', 'yes', 'y')
+FALSE = ('0', 'false', 'f', 'no', 'n', '')
+
+
+class NodeIds(object):
+    """Interns node IDs of any kind as dense integers, counting from 0."""
+
+    def __init__(self):
+        self.ids = {}  # {name: id}
+        self.names = []  # Name of each id
+
+    def __len__(self):
+        return len(self.names)
+
+    def __call__(self, name):
+        """Return the id of a node name, giving it the next id if it's new."""
+        node = self.ids.get(name)
+        if node is None:
+            node = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return node
+
+
+class LoadStats(object):
+    """Counts of what a load has read, and how fast."""
+
+    def __init__(self):
+        self.rows = 0
+        self.edges = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.started = time.time()
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return (
+            '<{} rows, {} edges, {} duplicates, {} invalid in {:.2f}s ({:.0f} rows/s)>'
+        ).format(
+            self.rows, self.edges, self.duplicates, self.invalid, self.seconds, self.rate
+        )
+
+    @property
+    def rate(self):
+        """Return the number of rows read per second."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def tick(self):
+        """Update the time taken so far."""
+        self.seconds = time.time() - self.started
+
+
+def open_text(path):
+    """Open a text file for reading, decompressing it if it's gzipped."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', newline='')
+    return open(path, newline='')
+
+
+def parse_number(text):
+    """Return a string as an int if possible, else a float."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def is_header(row):
+    """Return True if none of a row's fields are numbers, e.g. column names."""
+    for field in row:
+        try:
+            parse_number(field.strip())
+        except ValueError:
+            continue
+        return False
+    return True
+
+
+def parse_edges(rows, node_ids, stats, columns=(0, 1, 2, None), strict=True):
+    """
+    Generate (head, tail, weight, directed) edges from rows of text.
+
+    `columns` are the positions of the head, tail, weight and directed fields,
+    directed may be None. Node names are mapped through `node_ids`, e.g. a
+    NodeIds, or int. Invalid rows raise ValueError if `strict`, else they are
+    counted and skipped. A first row with no numbers in it is a header.
+    """
+    head_col, tail_col, weight_col, directed_col = columns
+    for line, row in enumerate(rows, 1):
+        if line == 1 and is_header(row):
+            continue
+        stats.rows += 1
+        try:
+            head, tail = row[head_col].strip(), row[tail_col].strip()
+            if not head or not tail:
+                raise ValueError('Missing node')
+            weight = parse_number(row[weight_col].strip())
+            if math.isnan(weight) or math.isinf(weight) or weight < 0:
+                raise ValueError('Weight must be finite and not negative')
+            directed = False
+            if directed_col is not None and directed_col < len(row):
+                flag = row[directed_col].strip().lower()
+                if flag not in TRUE + FALSE:
+                    raise ValueError('Unknown directed flag: {}'.format(flag))
+                directed = flag in TRUE
+            yield node_ids(head), node_ids(tail), weight, directed
+        except (IndexError, ValueError) as error:
+            if strict:
+                raise ValueError(
+                    'Invalid edge on row {}: {} ({})'.format(line, row, error)
+                )
+            stats.invalid += 1
+
+
+def unique_edges(edges, stats):
+    """
+    Generate edges, skipping exact repeats of earlier ones.
+
+    Every distinct edge is kept in a set, so memory grows with the edges read.
+    """
+    seen = set()
+    for edge in edges:
+        head, tail, weight, directed = edge
+        if not directed and tail < head:  # Either way round is the same edge
+            head, tail = tail, head
+        key = (head, tail, weight, directed)
+        if key in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(key)
+        yield edge
+
+
+def chunked(items, size):
+    """Generate lists of up to `size` items."""
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_edge_list(
+    path,
+    delimiter=None,
+    columns=(0, 1, 2, None),
+    intern=True,
+    dedupe=False,
+    strict=True,
+    chunk_size=100000,
+    progress=None,
+):
+    """
+    Return a Graph of the edges in a CSV or TSV file, its NodeIds & LoadStats.
+
+    The delimiter is a tab for .tsv files and a comma otherwise, unless given.
+    With `intern`, node names of any kind become dense integers, and NodeIds
+    maps them back; otherwise names must be integers, and NodeIds is None.
+    `progress` is called with the LoadStats after every chunk of edges.
+
+    With `dedupe`, rows repeating an earlier edge exactly, either way round,
+    are skipped. That holds every distinct edge in memory while loading, and
+    parallel edges of the same weight are real, e.g. two streets of the same
+    length, so it's off by default.
+    """
+    if delimiter is None:
+        name = path[:-len('.gz')] if path.endswith('.gz') else path
+        delimiter = '\t' if name.endswith('.tsv') else ','
+    node_ids = NodeIds() if intern else None
+    stats = LoadStats()
+    graph = Graph()
+    with open_text(path) as f:
+        rows = csv.reader(f, delimiter=delimiter)
+        rows = (row for row in rows if row and not row[0].startswith('#'))
+        names = int if node_ids is None else node_ids
+        edges = parse_edges(rows, names, stats, columns, strict)
+        if dedupe:
+            edges = unique_edges(edges, stats)
+        for chunk in chunked(edges, chunk_size):
+            graph.add_edges(chunk)
+            stats.edges += len(chunk)
+            stats.tick()
+            if progress is not None:
+                progress(stats)
+    stats.tick()
+    return graph, node_ids, stats
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['edgelist'])
@@ -4,12 +4,37 @@ Functions relating to Eularian graphs.
 This module contains functions relating to the identification and solution of Eularian
 trails and Circuits.
 """
-import copy
 import itertools
+import logging
 import random
+from concurrent.futures import ProcessPoolExecutor
 
 from . import dijkstra
+from . import matching
+from . import pairing
+from . import profiling
+from . import sparse
+from .cache import fingerprint
 from .my_iter import all_unique
+from .network import GraphView
+
+log = logging.getLogger(__name__)
+
+PAIRING_STRATEGIES = ('blossom', 'brute', 'anytime')
+CIRCUIT_METHODS = ('hierholzer', 'fleury')
+PATH_BACKENDS = ('auto', 'python', 'scipy')
+
+
+class DisconnectedGraphError(ValueError):
+    """No single route can cover a graph made of several separate pieces."""
+
+    def __init__(self, components):
+        self.components = components  # Node sets, largest first
+        super(DisconnectedGraphError, self).__init__(
+            'Graph is disconnected: {} components of {} nodes'.format(
+                len(components), ', '.join(str(len(x)) for x in components)
+            )
+        )
 
 
 def fleury_walk(graph, start=None, circuit=False):
@@ -18,30 +43,40 @@ def fleury_walk(graph, start=None, circuit=False):
     Tries to walk a Circuit by making random edge choices. If the route
     dead-ends, returns the route up to that point. Does not revisit
     edges.
+
+    Bridges are labelled once up front using Tarjan's algorithm. Crossing a
+    bridge leaves all other labels intact, so they are only refreshed after
+    crossing a non-bridge, and then only within the current 2-edge-connected
+    component, when the next choice is made.
     # TODO: If circuit is True, route must start & end at the same node.
     """
-    visited = set()  # Edges
+    reduced_graph = GraphView(graph)  # Visited edges are hidden as we go
+    bridges = reduced_graph.find_bridges()
+    stale = False  # True once bridges may be missing from our labels
 
     # Begin at a random node unless start is specified:
-    node = start if start else random.choice(graph.node_keys)
+    node = start if start is not None else random.choice(graph.node_keys)
 
     route = [node]
-    while len(visited) < len(graph):
-        # Fleury's algorithm tells us to preferentially select non-bridges
-        reduced_graph = copy.deepcopy(graph)
-        reduced_graph.remove_edges(visited)
+    while len(reduced_graph):
         options = reduced_graph.edge_options(node)
-        bridges = [k for k in options.keys() if reduced_graph.is_bridge(k)]
+        if stale and len(options) > 1:
+            # Bridges between components can't change, only look inside ours
+            bridges |= reduced_graph.find_bridges(node, skip=bridges)
+            stale = False
+        # Fleury's algorithm tells us to preferentially select non-bridges
         non_bridges = [k for k in options.keys() if k not in bridges]
         if non_bridges:
             chosen_path = random.choice(non_bridges)
-        elif bridges:
-            chosen_path = random.choice(bridges)
+        elif options:
+            chosen_path = random.choice(list(options.keys()))
         else:
             break  # Reached a dead-end, no path options
-        next_node = reduced_graph.edges[chosen_path].end(node)  # Other end
+        next_node = options[chosen_path].end(node)  # Other end
+        if chosen_path not in bridges and next_node != node:
+            stale = True  # Removing a cycle edge may turn others into bridges
 
-        visited.add(chosen_path)  # Never revisit this edge
+        reduced_graph.remove_edge(chosen_path)  # Never revisit this edge
 
         route.append(next_node)
         node = next_node
@@ -49,16 +84,81 @@ def fleury_walk(graph, start=None, circuit=False):
     return route
 
 
-def eularian_path(graph, start=None, circuit=False):
+def hierholzer_walk(graph, start=None):
+    """
+    Return a walk over the edges of a graph, as lists of nodes and edge keys.
+
+    Uses Hierholzer's algorithm: follow unused edges until stuck, then back up
+    and splice in sub-circuits from the nodes passed on the way. Each edge is
+    looked at once per end, so this is O(E). keys[i] is the edge between
+    route[i] and route[i + 1]. Directed edges are only walked head to tail.
+    The walk is only a valid trail if the graph is connected, and Eularian or
+    semi-Eularian with `start` on an odd node, or for directed edges, has as
+    many ways into each node as out.
+    """
+    if start is None:  # Begin at an odd node if there is one
+        odd_nodes = graph.odd_nodes
+        start = odd_nodes[0] if odd_nodes else min(graph.nodes)
+
+    options = {}  # {node: iterator of (key, edge)}, consumed as we go
+    used = set()  # Edge keys
+    stack = [(start, None)]  # (node, key of the edge used to get there)
+    route, keys = [], []
+    while stack:
+        node = stack[-1][0]
+        if node not in options:
+            options[node] = iter(graph.edge_options(node).items())
+        for key, edge in options[node]:
+            if key not in used and (not edge.directed or edge.head == node):
+                used.add(key)  # Never revisit this edge
+                stack.append((edge.end(node), key))
+                break
+        else:  # Stuck: this node is finished
+            node, key = stack.pop()
+            route.append(node)
+            keys.append(key)
+
+    route.reverse()
+    keys.reverse()
+    return route, keys[1:]  # Start node was reached without an edge
+
+
+def eularian_path(graph, start=None, circuit=False, method='hierholzer'):
     """
     Return an Eularian Trail or Eularian Circuit through a graph, if found.
-    Return the route if it visits every edge, else give up after 1000 tries.
-    If `start` is set, force start at that Node.
+
+    By default, walks the graph once with Hierholzer's algorithm. With
+    `method='fleury'` walks randomly, returning the route if it visits every
+    edge, else gives up after 1000 tries. If `start` is set, force start at
+    that Node. Returns the route & number of attempts. Raises
+    DisconnectedGraphError straight away if no single route can exist.
     """
-    for i in range(1, 1001):
-        route = fleury_walk(graph, start, circuit)
-        if len(route) == len(graph) + 1:  # We visited every edge
-            return route, i
+    if method not in CIRCUIT_METHODS:
+        raise ValueError('Unknown circuit method: {}'.format(method))
+    components = graph.components()
+    if len(components) > 1:
+        raise DisconnectedGraphError(components)
+    if start is not None and start not in graph.nodes:
+        return [], None  # No route can start off the graph
+
+    if method == 'hierholzer':
+        odd_nodes = graph.odd_nodes
+        if len(odd_nodes) > 2:
+            return [], None  # No trail can exist
+        if odd_nodes and start is not None and start not in odd_nodes:
+            return [], None  # Trails must start at an odd node
+        with profiling.phase('circuit'):
+            route, _ = hierholzer_walk(graph, start)
+        if len(route) != len(graph) + 1:
+            return [], None  # Some edges were never walked
+        return route, 1
+
+    with profiling.phase('circuit'):
+        for i in range(1, 1001):
+            profiling.count('fleury attempts')
+            route = fleury_walk(graph, start, circuit)
+            if len(route) == len(graph) + 1:  # We visited every edge
+                return route, i
     return [], None  # Never found a solution
 
 
@@ -71,9 +171,7 @@ def find_dead_ends(graph):
     odd pair set finding
     """
     single_nodes = [k for k, order in graph.node_orders.items() if order == 1]
-    return set(
-        [x for k in single_nodes for x in graph.edges.values() if k in (x.head, x.tail)]
-    )
+    return set(x for k in single_nodes for x in graph.edge_options(k).values())
 
 
 def build_node_pairs(graph):
@@ -104,38 +202,159 @@ def unique_pairs(items):
             yield [pair]
 
 
-def find_node_pair_solutions(node_pairs, graph):
-    """Return path and cost for all node pairs in the path sets."""
-    node_pair_solutions = {}
-    for node_pair in node_pairs:
-        if node_pair not in node_pair_solutions:
-            cost, path = dijkstra.find_cost(node_pair, graph)
-            node_pair_solutions[node_pair] = (cost, path)
-            # Also store the reverse pair
-            node_pair_solutions[node_pair[::-1]] = (cost, path[::-1])
-    return node_pair_solutions
-
-
-def build_min_set(node_solutions):
-    """
-    Order pairs by cheapest first and build a set by pulling pairs until every node is
-    covered.
-    """
-    # Doesn't actually work... bad algorithm. What if last node
-    # has insane path cost?
-    odd_nodes = set([x for pair in node_solutions.keys() for x in pair])
-    # Sort by node_pair cost
-    sorted_solutions = sorted(node_solutions.items(), key=lambda x: x[1][0])
-    path_set = []
-    for node_pair, solution in sorted_solutions:
-        if not all(x in odd_nodes for x in node_pair):
-            continue
-        path_set.append((node_pair, solution))
-        for node in node_pair:
-            odd_nodes.remove(node)
-        if not odd_nodes:  # We've got a pair for every node
-            break
-    return path_set
+def solve_searches(searches, space):
+    """Return the PairSolutions of {start: set of end nodes} searches."""
+    solutions = dijkstra.PairSolutions()
+    for start, ends in searches.items():
+        space.search((start,), ends)  # Stops once every end is settled
+        end_costs = {end: space.cost(end) for end in ends}
+        solutions.add(start, end_costs, space.tree(ends))
+    return solutions
+
+
+_worker_space = None  # Search space of the graph shipped to each worker, at start up
+
+
+def _init_worker(graph):
+    """Keep the graph's search space in the worker, so tasks don't have to carry it."""
+    global _worker_space
+    _worker_space = dijkstra.SearchSpace(graph)
+
+
+def _solve_shard(searches):
+    """Solve a shard of searches against the worker's graph."""
+    return solve_searches(searches, _worker_space)
+
+
+def find_node_pair_solutions(node_pairs, graph, workers=None):
+    """
+    Return path and cost for all node pairs in the path sets.
+
+    Pairs are grouped by their first node so that a single Dijkstra search
+    solves every pair starting from that node. With `workers` > 1, searches
+    are sharded across a pool of processes. Paths are only built when looked
+    up, see dijkstra.PairSolutions.
+    """
+    searches = dijkstra.group_searches(node_pairs)
+
+    if workers and workers > 1 and len(searches) > 1:
+        items = list(searches.items())
+        num_shards = min(len(items), workers * 4)  # Several per worker, to balance load
+        shards = [dict(items[i::num_shards]) for i in range(num_shards)]
+        solutions = dijkstra.PairSolutions()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(graph,)
+        ) as executor:
+            for shard_solutions in executor.map(_solve_shard, shards):
+                solutions.merge(shard_solutions)
+        return solutions
+    return solve_searches(searches, dijkstra.SearchSpace(graph))
+
+
+def solve_nearest(starts, odd_nodes, size, space):
+    """
+    Return the PairSolutions of start nodes & their `size` nearest odd nodes.
+
+    Also returns the pairs found, each once.
+    """
+    solutions = dijkstra.PairSolutions()
+    pairs = []
+    odd_nodes = frozenset(odd_nodes)  # Looked up once, for every search
+    for start in starts:
+        space.search((start,), odd_nodes, size + 1)  # The start is settled first
+        ends = [end for end in space.found if end != start]
+        solutions.add(start, {end: space.cost(end) for end in ends}, space.tree(ends))
+        pairs.extend((start, end) for end in ends)
+    return solutions, pairs
+
+
+def _solve_nearest_shard(args):
+    """Solve a shard of nearest odd node searches against the worker's graph."""
+    starts, odd_nodes, size = args
+    return solve_nearest(starts, odd_nodes, size, _worker_space)
+
+
+def find_nearest_pair_solutions(odd_nodes, graph, size, workers=None, space=None):
+    """
+    Return the PairSolutions of each odd node & its `size` nearest odd nodes.
+
+    Each search stops as soon as that many other odd nodes are settled, so it
+    only explores the neighbourhood of its start, and the pairs grow linearly
+    with the odd nodes, rather than as their square. Also returns the pairs,
+    each once, which are candidates for pairing. Searches run in the graph's
+    dijkstra.SearchSpace, if given.
+    """
+    odd_nodes = list(odd_nodes)
+    if workers and workers > 1 and len(odd_nodes) > 1:
+        num_shards = min(len(odd_nodes), workers * 4)
+        shards = [(odd_nodes[i::num_shards], odd_nodes, size) for i in range(num_shards)]
+        solutions = dijkstra.PairSolutions()
+        found = []
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(graph,)
+        ) as executor:
+            for shard in executor.map(_solve_nearest_shard, shards):
+                solutions.merge(shard[0])
+                found.extend(shard[1])
+    else:
+        space = dijkstra.SearchSpace(graph) if space is None else space
+        solutions, found = solve_nearest(odd_nodes, odd_nodes, size, space)
+    pairs = []
+    seen = set()
+    for start, end in sorted(found):  # The same pairs, however searches were split
+        if (end, start) not in seen:  # Often found from both ends
+            seen.add((start, end))
+            pairs.append((start, end))
+    return solutions, pairs
+
+
+def find_nearest_pairing(
+    odd_nodes, graph, nearest, strategy='blossom', time_limit=None, workers=None
+):
+    """
+    Return the chosen set & route pairing up odd nodes, among near candidates.
+
+    Each odd node is only paired with its `nearest` odd nodes, by shortest
+    path. If no perfect pairing exists among those candidates, twice as many
+    are tried, until every pair is. Anytime pairing instead pairs the few
+    nodes its greedy start leaves unmatched among their own nearest.
+    """
+    space = dijkstra.SearchSpace(graph)
+
+    def solve(nodes):
+        return find_nearest_pair_solutions(nodes, graph, nearest, space=space)
+
+    size = nearest
+    while True:
+        with profiling.phase('pair solutions'):
+            log.info('\tFinding pair solutions, <%s> nearest each', size)
+            pair_solutions, node_pairs = find_nearest_pair_solutions(
+                odd_nodes, graph, size, workers, space
+            )
+            log.info('\t\t(%s pairs)', len(node_pairs))
+        with profiling.phase('pairing'):
+            try:
+                return find_pairing(
+                    odd_nodes, node_pairs, pair_solutions, strategy, time_limit, solve
+                )
+            except ValueError:  # No perfect pairing among the candidates
+                if size >= len(odd_nodes) - 1:
+                    raise
+                profiling.count('candidate widenings')
+                size *= 2
+
+
+def solve_node_pairs(node_pairs, graph, backend='auto', workers=None):
+    """
+    Return the PairSolutions of node pairs, from the chosen shortest path backend.
+
+    'auto' uses SciPy if it is installed, unless workers are requested.
+    """
+    if backend == 'auto':
+        backend = 'scipy' if sparse.AVAILABLE and not workers else 'python'
+    if backend == 'scipy':
+        return sparse.find_node_pair_solutions(node_pairs, graph)
+    return find_node_pair_solutions(node_pairs, graph, workers)
 
 
 def find_minimum_path_set(pair_sets, pair_solutions):
@@ -143,48 +362,235 @@ def find_minimum_path_set(pair_sets, pair_solutions):
     cheapest_set = None
     min_cost = float('inf')
     min_route = []
+    evaluated = 0
     for pair_set in pair_sets:
-        set_cost = sum(pair_solutions[pair][0] for pair in pair_set)
+        evaluated += 1
+        set_cost = sum(pair_solutions.cost(pair) for pair in pair_set)
         if set_cost < min_cost:
             cheapest_set = pair_set
             min_cost = set_cost
-            min_route = [pair_solutions[pair][1] for pair in pair_set]
+    profiling.count('pair sets', evaluated)
+
+    if cheapest_set is not None:  # Only expand the winning paths
+        min_route = [pair_solutions.path(pair) for pair in cheapest_set]
+    return cheapest_set, min_route
 
+
+def find_minimum_matching(node_pairs, pair_solutions):
+    """
+    Return cheapest set & route, via minimum weight perfect matching.
+
+    Same result as find_minimum_path_set over all unique pairs, in
+    polynomial time.
+    """
+    pair_costs = find_pair_costs(node_pairs, pair_solutions)
+    cheapest_set = matching.min_weight_matching(pair_costs)
+    profiling.count('matchings')
+    min_route = [pair_solutions.path(pair) for pair in cheapest_set]
     return cheapest_set, min_route
 
 
-def add_new_edges(graph, min_route):
-    """Return new graph w/ new edges extracted from minimum route."""
-    new_graph = copy.deepcopy(graph)
+def find_anytime_matching(node_pairs, pair_solutions, time_limit=None, solve=None):
+    """
+    Return a cheap set & route, via pairing.anytime_matching.
+
+    Not always the cheapest, but quick, and improved for up to `time_limit`
+    seconds. How far from the cheapest it could be is logged. If the node
+    pairs are only some of them, `solve` is called with nodes left unmatched,
+    and returns PairSolutions & node pairs between some of them.
+    """
+    def more_costs(nodes):
+        solutions, more_pairs = solve(nodes)
+        pair_solutions.merge(solutions)
+        return find_pair_costs(more_pairs, pair_solutions)
+
+    pair_costs = find_pair_costs(node_pairs, pair_solutions)
+    result = pairing.anytime_matching(
+        pair_costs, time_limit, more_costs if solve is not None else None
+    )
+    log.info(
+        '\t\t(cost %s, lower bound %s, gap %.1f%%, %s swaps)',
+        result.cost, result.lower_bound, 100 * result.gap, result.swaps
+    )
+    min_route = [pair_solutions.path(pair) for pair in result.pairs]
+    return result.pairs, min_route
+
+
+def find_pair_costs(node_pairs, pair_solutions):
+    """Return {pair: cost} of the node pairs with a path between them."""
+    pair_costs = {}
+    for pair in node_pairs:
+        cost = pair_solutions.cost(pair)
+        if cost != float('inf'):  # Unreachable pairs can never be matched
+            pair_costs[pair] = cost
+    return pair_costs
+
+
+def find_pairing(
+    odd_nodes, node_pairs, pair_solutions, strategy='blossom', time_limit=None,
+    solve=None
+):
+    """
+    Return the chosen set & route pairing up odd nodes, by pairing strategy.
+
+    `solve` finds missing pair solutions, see find_anytime_matching.
+    """
+    log.info('\tFinding cheapest route')
+    if strategy == 'brute':
+        return find_minimum_path_set(unique_pairs(odd_nodes), pair_solutions)
+    if strategy == 'anytime':
+        return find_anytime_matching(node_pairs, pair_solutions, time_limit, solve)
+    return find_minimum_matching(node_pairs, pair_solutions)
+
+
+def add_new_edges(graph, min_route, source=None):
+    """
+    Return new graph w/ new edges extracted from minimum route.
+
+    Edge costs are looked up in `source` if given, e.g. when the route leaves
+    the graph for a larger one it's part of.
+    """
+    source = graph if source is None else source
+    new_graph = GraphView(graph)  # New edges on top, without copying the old ones
     for node in min_route:
         for i in range(len(node) - 1):
             start, end = node[i], node[i + 1]
-            cost = graph.edge_cost(start, end)  # Look up existing edge cost
+            cost = source.edge_cost(start, end)  # Look up existing edge cost
             new_graph.add_edge(start, end, cost, False)  # Append new edges
     return new_graph
 
 
-def make_eularian(graph):
-    """Add necessary paths to the graph such that it becomes Eularian."""
-    print('\tDoubling dead_ends')
-    dead_ends = [x.contents for x in find_dead_ends(graph)]
-    graph.add_edges(dead_ends)  # Double our dead-ends
-
-    print('\tBuilding possible odd node pairs')
-    node_pairs = list(build_node_pairs(graph))
-    print('\t\t({} pairs)'.format(len(node_pairs)))
-
-    print('\tFinding pair solutions')
-    pair_solutions = find_node_pair_solutions(node_pairs, graph)
-    print('\t\t({} solutions)'.format(len(pair_solutions)))
+def make_eularian(
+    graph, strategy='blossom', backend='auto', workers=None, cache=None, time_limit=None,
+    nearest=None
+):
+    """
+    Add necessary paths to the graph such that it becomes Eularian.
+
+    Odd nodes are paired by minimum weight matching (`strategy='blossom'`) or
+    by trying every possible pair set (`strategy='brute'`), which is only
+    feasible for a handful of odd nodes. `strategy='anytime'` pairs them
+    greedily, then swaps partners until no swap helps or `time_limit`
+    seconds are up, for when matching would take too long.
+
+    Shortest paths between odd nodes are found in one vectorised call with
+    `backend='scipy'`, or one search at a time with `backend='python'`, spread
+    across a pool of `workers` processes if requested. The default, 'auto',
+    uses SciPy if it is installed, unless workers are requested. If a
+    cache.PathCache is given, the shortest paths of a graph seen before are
+    loaded from it instead.
+
+    With `nearest`, each odd node is only paired with that many of its
+    nearest odd nodes, see find_nearest_pairing, which is much quicker on
+    large road networks. These searches are always in Python, and uncached.
+    Trying every pair set ignores it.
+    """
+    check_options(strategy, backend, nearest)
+
+    with profiling.phase('dead ends'):
+        log.info('\tDoubling dead_ends')
+        dead_ends = [x.contents for x in find_dead_ends(graph)]
+        graph.add_edges(dead_ends)  # Double our dead-ends
+
+    if nearest and strategy != 'brute':
+        _, min_route = find_nearest_pairing(
+            graph.odd_nodes, graph, nearest, strategy, time_limit, workers
+        )
+    else:
+        with profiling.phase('node pairs'):
+            log.info('\tBuilding possible odd node pairs')
+            node_pairs = list(build_node_pairs(graph))
+            log.info('\t\t(%s pairs)', len(node_pairs))
+
+        with profiling.phase('pair solutions'):
+            log.info('\tFinding pair solutions')
+            pair_solutions = None
+            if cache is not None:
+                key = fingerprint(graph)
+                pair_solutions = cache.get(key, node_pairs)
+                if pair_solutions is not None:
+                    log.info('\t\t(cached)')
+            if pair_solutions is None:
+                pair_solutions = solve_node_pairs(node_pairs, graph, backend, workers)
+                if cache is not None:
+                    cache.put(key, pair_solutions)
+            log.info('\t\t(%s solutions)', len(pair_solutions))
+
+        with profiling.phase('pairing'):
+            _, min_route = find_pairing(
+                graph.odd_nodes, node_pairs, pair_solutions, strategy, time_limit
+            )
+
+    with profiling.phase('new edges'):
+        log.info('\tAdding new edges')
+        return add_new_edges(graph, min_route), len(dead_ends)  # Add our new edges
+
+
+def check_options(strategy='blossom', backend='auto', nearest=None):
+    """Raise ValueError, or ImportError for a missing backend, if an option is bad."""
+    if strategy not in PAIRING_STRATEGIES:
+        raise ValueError('Unknown pairing strategy: {}'.format(strategy))
+    if backend not in PATH_BACKENDS:
+        raise ValueError('Unknown shortest path backend: {}'.format(backend))
+    if backend == 'scipy' and not sparse.AVAILABLE:
+        raise ImportError('The scipy backend requires NumPy and SciPy')
+    if nearest is not None and nearest < 1:
+        raise ValueError('Nearest candidates must be at least 1')
+
+
+def solve_component(
+    graph, start=None, strategy='blossom', method='hierholzer', backend='auto',
+    cache=None, time_limit=None, nearest=None, contract=False
+):
+    """
+    Return the circuit & total cost of a connected graph.
 
-    print('\tBuilding path sets')
-    pair_sets = (x for x in unique_pairs(graph.odd_nodes))
+    The options are passed on to make_eularian. With `contract`, the graph is
+    solved by contract.solve instead, which always walks a Hierholzer circuit.
+    """
+    if contract:
+        from .contract import solve  # Here, as contract imports this module
+        return solve(graph, start, strategy, backend, None, cache, time_limit, nearest)
+    if not graph.is_eularian:
+        graph, _ = make_eularian(
+            graph, strategy, backend, None, cache, time_limit, nearest
+        )
+    route, _ = eularian_path(graph, start, method=method)
+    return route, graph.total_cost
+
+
+def solve_components(
+    graph, start=None, strategy='blossom', method='hierholzer', backend='auto',
+    workers=None, cache=None, time_limit=None, nearest=None, contract=False
+):
+    """
+    Return a circuit & its total cost for each connected component of a graph.
 
-    print('\tFinding cheapest route')
-    cheapest_set, min_route = find_minimum_path_set(pair_sets, pair_solutions)
-    print('\tAdding new edges')
-    return add_new_edges(graph, min_route), len(dead_ends)  # Add our new edges
+    Components are split off in linear time and solved independently, largest
+    first, spread across a pool of `workers` processes if requested. `start`
+    is only used by the component it belongs to, the other options are used
+    by each, see solve_component. With a `cache`, components are solved in
+    this process, as its connection can't be shared.
+    """
+    check_options(strategy, backend, nearest)
+    components = graph.components()
+    subgraphs = [graph.subgraph(nodes) for nodes in components]
+    starts = [start if start in nodes else None for nodes in components]
+    args = (
+        subgraphs,
+        starts,
+        itertools.repeat(strategy),
+        itertools.repeat(method),
+        itertools.repeat(backend),
+        itertools.repeat(cache),
+        itertools.repeat(time_limit),
+        itertools.repeat(nearest),
+        itertools.repeat(contract),
+    )
+    if workers and workers > 1 and len(subgraphs) > 1 and cache is None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(solve_component, *args))
+    return list(map(solve_component, *args))
 
 
 if __name__ == '__main__':
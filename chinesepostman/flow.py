@@ -0,0 +1,174 @@
+"""
+Minimum cost flow, by successive shortest paths with node potentials.
+
+Supplies are pushed from a super source to a super sink along the cheapest
+residual path, one Dijkstra search per augmenting path. Node potentials keep
+reduced costs non-negative, so Dijkstra stays valid once reverse arcs appear.
+The residual network is kept in flat arrays, arc i paired with its reverse
+i ^ 1, so tens of thousands of arcs stay cheap.
+"""
+import heapq
+from array import array
+
+from . import profiling
+
+
+def min_cost_flow(supplies, arcs):
+    """
+    Return the flow along each arc of a cheapest flow meeting all supplies.
+
+    `supplies` is a {node: supply} dictionary, negative for demand, which must
+    sum to 0. `arcs` is a list of (tail, head, cost, capacity) tuples, where
+    costs are not negative and a capacity of None is unlimited. Raises
+    ValueError if the demand can't be met.
+    """
+    if sum(supplies.values()):
+        raise ValueError('Supplies and demands must balance')
+    total = sum(x for x in supplies.values() if x > 0)
+    nodes = {}  # {node: index}, after the super source 0 & super sink 1
+    for tail, head, _, _ in arcs:
+        for node in (tail, head):
+            if node not in nodes:
+                nodes[node] = len(nodes) + 2
+    for node in supplies:
+        if node not in nodes:
+            nodes[node] = len(nodes) + 2
+
+    size = len(nodes) + 2
+    ends = array('q')  # Head of each residual arc
+    capacities = array('q')  # Residual capacity
+    costs = []
+    adjacency = [[] for _ in range(size)]
+
+    def add_arc(tail, head, cost, capacity):
+        adjacency[tail].append(len(ends))
+        ends.append(head)
+        capacities.append(capacity)
+        costs.append(cost)
+        adjacency[head].append(len(ends))
+        ends.append(tail)
+        capacities.append(0)
+        costs.append(-cost)
+
+    for tail, head, cost, capacity in arcs:
+        if cost < 0:
+            raise ValueError('Arc costs must not be negative: {}'.format(cost))
+        capacity = total if capacity is None else min(capacity, total)
+        add_arc(nodes[tail], nodes[head], cost, capacity)
+    for node, supply in supplies.items():
+        if supply > 0:
+            add_arc(0, nodes[node], 0, supply)
+        elif supply < 0:
+            add_arc(nodes[node], 1, 0, -supply)
+
+    potentials = [0] * size
+    sent = 0
+    while sent < total:
+        distances, previous = _shortest_paths(
+            adjacency, ends, capacities, costs, potentials
+        )
+        if 1 not in distances:
+            raise ValueError('Demand can\'t be met: {} of {} sent'.format(sent, total))
+        sink_distance = distances[1]
+        for node in range(size):  # Nodes not settled before the sink count as far
+            potentials[node] += min(distances.get(node, sink_distance), sink_distance)
+
+        path = []
+        node = 1
+        while node:  # Walk back from the sink
+            path.append(previous[node])
+            node = ends[previous[node] ^ 1]
+        sent += _augment(path, capacities, total - sent)
+        # Other paths just as cheap don't need a search of their own
+        sent += _push_admissible(adjacency, ends, capacities, costs, potentials,
+                                 total - sent)
+
+    return [capacities[2 * i + 1] for i in range(len(arcs))]  # Reverse = flow
+
+
+def _augment(path, capacities, limit):
+    """Push as much flow as fits, up to limit, along a path of arcs."""
+    amount = min(limit, min(capacities[arc] for arc in path))
+    for arc in path:
+        capacities[arc] -= amount
+        capacities[arc ^ 1] += amount
+    profiling.count('augmenting paths')
+    return amount
+
+
+def _push_admissible(adjacency, ends, capacities, costs, potentials, limit):
+    """
+    Push flow along residual paths of zero reduced cost, up to limit.
+
+    These are all shortest paths, found by depth-first search as in Dinic's
+    algorithm: each node keeps a pointer to its next arc to try, and nodes
+    that can't reach the sink are never tried again.
+    """
+    sent = 0
+    pointers = [0] * len(adjacency)
+    dead = set()
+    while sent < limit:
+        stack, path = [0], []
+        on_path = {0}
+        while stack and stack[-1] != 1:
+            node = stack[-1]
+            options = adjacency[node]
+            potential = potentials[node]
+            while pointers[node] < len(options):
+                arc = options[pointers[node]]
+                head = ends[arc]
+                if (capacities[arc] and head not in dead and head not in on_path
+                        and costs[arc] + potential - potentials[head] == 0):
+                    break
+                pointers[node] += 1
+            else:  # No way on from here
+                dead.add(node)
+                on_path.discard(stack.pop())
+                if path:
+                    path.pop()
+                continue
+            stack.append(head)
+            path.append(arc)
+            on_path.add(head)
+        if not stack:
+            break
+        sent += _augment(path, capacities, limit - sent)
+    return sent
+
+
+def _shortest_paths(adjacency, ends, capacities, costs, potentials):
+    """
+    Return reduced cost distances from the super source, & the arc into each node.
+
+    Stops once the super sink is settled.
+    """
+    distances = {}  # Settled nodes only
+    best = {0: 0}
+    previous = {}
+    queue = [(0, 0)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if node in distances:
+            continue
+        distances[node] = distance
+        if node == 1:
+            break
+        potential = potentials[node]
+        for arc in adjacency[node]:
+            if not capacities[arc]:
+                continue
+            head = ends[arc]
+            if head in distances:
+                continue
+            new_distance = distance + costs[arc] + potential - potentials[head]
+            if head not in best or new_distance < best[head]:
+                best[head] = new_distance
+                previous[head] = arc
+                heapq.heappush(queue, (new_distance, head))
+    profiling.count('dijkstra runs')
+    return distances, previous
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['flow'])
@@ -0,0 +1,190 @@
+"""
+Incremental re-solving of the Chinese Postman problem.
+
+A Solution keeps the intermediate results of a solve: the doubled dead-ends,
+the odd node shortest paths and the matching. When edges are added, removed or
+re-weighted, update() only re-runs the shortest path searches whose trees the
+change can affect, and only re-matches odd nodes if their set or costs changed.
+"""
+import itertools
+
+from . import dijkstra
+from . import eularian
+from .network import GraphView
+
+
+class Solution(object):
+    """
+    The Eularian circuit of a graph, and what it took to find it.
+
+    The graph views are only valid until the graph changes, e.g. by update().
+    """
+
+    def __init__(self, graph, start, dead_ends, pair_solutions, cheapest_set):
+        self.graph = graph
+        self.start = start
+        self.dead_ends = dead_ends  # {key: edge} of the graph's dead-ended edges
+        self.pair_solutions = pair_solutions  # dijkstra.PairSolutions of odd nodes
+        self.cheapest_set = cheapest_set  # Matched odd node pairs
+        self.working_graph = working_graph(graph, dead_ends)
+        self.odd_nodes = self.working_graph.odd_nodes  # Nodes that had to be matched
+        min_route = [pair_solutions.path(pair) for pair in cheapest_set]
+        self.eularian_graph = eularian.add_new_edges(self.working_graph, min_route)
+        self.total_cost = self.eularian_graph.total_cost
+        self.route, _ = eularian.eularian_path(self.eularian_graph, start)
+
+    def __repr__(self):
+        return 'Solution({})'.format(self.route)
+
+
+def find_dead_ends(graph, nodes=None):
+    """
+    Return a {key: edge} dictionary of dead-ended edges.
+
+    Like eularian.find_dead_ends, but only looks at the edges of `nodes`, if
+    given, instead of scanning the whole graph.
+    """
+    if nodes is None:
+        nodes = graph.nodes
+    dead_ends = {}
+    for node in nodes:
+        if graph.node_order(node) == 1:
+            dead_ends.update(graph.edge_options(node))
+    return dead_ends
+
+
+def working_graph(graph, dead_ends):
+    """Return a view of a graph with its dead-ends doubled."""
+    view = GraphView(graph)
+    for edge in dead_ends.values():
+        view.add_edge(*edge.contents)
+    return view
+
+
+def solve(graph, start=None):
+    """Return the Solution of a graph, from scratch."""
+    dead_ends = find_dead_ends(graph)
+    working = working_graph(graph, dead_ends)
+    node_pairs = eularian.build_node_pairs(working)
+    pair_solutions = eularian.find_node_pair_solutions(node_pairs, working)
+    cheapest_set, _ = eularian.find_minimum_matching(node_pairs, pair_solutions)
+    return Solution(graph, start, dead_ends, pair_solutions, cheapest_set)
+
+
+def apply_delta(graph, added=(), removed=(), reweighted=()):
+    """
+    Change a graph in place, and return the removed & added edges.
+
+    `added` and `removed` are edge tuples, `reweighted` are (head, tail, weight)
+    tuples that change the weight of the first matching edge.
+    """
+    old_edges, new_edges = [], []
+    for args in removed:
+        key, edge = graph.find_edge(*args).popitem()
+        graph.remove_edge(key)
+        old_edges.append(edge)
+    for head, tail, weight in reweighted:
+        key, edge = graph.find_edge(head, tail).popitem()
+        graph.remove_edge(key)
+        old_edges.append(edge)
+        added = list(added) + [(edge.head, edge.tail, weight, edge.directed)]
+    for args in added:
+        key = graph.add_edge(*args)
+        new_edges.append(graph.edges[key])
+    return old_edges, new_edges
+
+
+def uses_edge(tree, edge):
+    """Return True if a tree of previous nodes steps along an edge."""
+    head, tail = edge.head, edge.tail
+    return tree.get(tail) == head or tree.get(head) == tail
+
+
+def update(solution, added=(), removed=(), reweighted=()):
+    """
+    Return the Solution of a graph after some edges change.
+
+    The solution's graph is changed in place. Searches are kept unless their
+    tree used a removed edge, or an added edge gives a cheaper way between
+    their odd nodes. That's checked with two searches per added edge, which
+    stop at the cost of the dearest pair, so only explore around the change.
+
+    The kept costs are copied, and the circuit is walked again, in full: both
+    take linear time, unlike the searches & matching, and a change can split
+    the old circuit anywhere, so there's no one part of it to splice.
+    """
+    graph = solution.graph
+    old_edges, new_edges = apply_delta(graph, added, removed, reweighted)
+    touched = {node for edge in old_edges + new_edges for node in (edge.head, edge.tail)}
+
+    dead_ends, recheck = {}, set(touched)
+    for key, edge in solution.dead_ends.items():
+        if touched.intersection((edge.head, edge.tail)):
+            recheck.update((edge.head, edge.tail))  # Either end may be the leaf
+        elif key in graph.edges:
+            dead_ends[key] = edge
+    dead_ends.update(find_dead_ends(graph, recheck.intersection(graph.nodes)))
+    working = working_graph(graph, dead_ends)
+    odd_nodes = working.odd_nodes
+    odd = set(odd_nodes)
+
+    old = solution.pair_solutions
+    stale = set()  # Start nodes whose searches must be run again
+    for start, tree in old.trees.items():
+        if any(uses_edge(tree, edge) for edge in old_edges):
+            stale.add(start)
+    dearest = max((x for x in old.costs.values() if x != float('inf')), default=0)
+    for edge in new_edges:  # Shortcuts through new edges
+        limit = dearest - edge.weight  # No shortcut is any longer
+        if limit < 0:
+            continue
+        head_costs, _ = dijkstra.find_costs(edge.head, working, odd, limit)
+        tail_costs, _ = dijkstra.find_costs(edge.tail, working, odd, limit)
+        for start, to_head in head_costs.items():  # Pairs near the edge, both ways
+            if start not in odd:
+                continue
+            for end, to_tail in tail_costs.items():
+                if end == start or end not in odd:
+                    continue
+                pair = (start, end) if (start, end) in old.costs else (end, start)
+                cost = old.costs.get(pair)  # None for new odd nodes, searched below
+                if cost is not None and to_head + edge.weight + to_tail < cost:
+                    stale.add(pair[0])
+
+    end_costs = {}  # {start: {end: cost}} of searches we can keep
+    for (start, end), cost in old.costs.items():
+        if start in odd and end in odd and start not in stale:
+            end_costs.setdefault(start, {})[end] = cost
+    pair_solutions = dijkstra.PairSolutions()
+    for start, costs in end_costs.items():
+        pair_solutions.add(start, costs, old.trees[start])
+    node_pairs = list(itertools.combinations(odd_nodes, 2))
+    missing = [
+        (end, start) if start in end_costs else (start, end)  # Keep kept trees whole
+        for start, end in node_pairs
+        if (start, end) not in pair_solutions
+    ]
+    for start, ends in dijkstra.group_searches(missing).items():
+        # Few searches, so not worth building a dijkstra.SearchSpace of the graph
+        costs, previous = dijkstra.find_costs(start, working, ends)
+        reached = [end for end in ends if end in costs]
+        pair_solutions.add(
+            start,
+            {end: costs.get(end, float('inf')) for end in ends},
+            dijkstra.prune_tree(reached, previous),
+        )
+
+    if set(solution.odd_nodes) == odd and all(
+        pair_solutions.cost(pair) >= old.cost(pair) for pair in node_pairs
+    ) and all(
+        pair_solutions.cost(pair) == old.cost(pair) for pair in solution.cheapest_set
+    ):  # Matched pairs cost the same, others no less: still the cheapest
+        cheapest_set = solution.cheapest_set
+    else:
+        cheapest_set, _ = eularian.find_minimum_matching(node_pairs, pair_solutions)
+    return Solution(graph, solution.start, dead_ends, pair_solutions, cheapest_set)
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['incremental'])
@@ -0,0 +1,446 @@
+"""
+Minimum weight perfect matching of odd nodes.
+
+Pairs odd nodes such that the total cost of the paths joining them is minimal.
+Uses Edmonds' blossom algorithm with dual variables, after Joris van Rantwijk's
+well known implementation, which runs in O(n^3) instead of enumerating all
+(n - 1)!! possible pair sets.
+"""
+
+
+def min_weight_matching(pair_costs):
+    """
+    Return a minimum cost perfect matching, as a list of node pairs.
+
+    `pair_costs` is a {(node, node): cost} dictionary of candidate pairs. It may
+    be sparse, but must admit a perfect matching, otherwise ValueError is raised.
+    """
+    if not pair_costs:
+        return []
+    nodes = sorted(set(node for pair in pair_costs for node in pair))
+    index = {node: i for i, node in enumerate(nodes)}
+
+    # Maximising (top - cost) over maximum cardinality matchings minimises cost
+    top = max(pair_costs.values()) + 1
+    edges = [(index[u], index[v], top - cost) for (u, v), cost in pair_costs.items()]
+    mate = max_weight_matching(edges, max_cardinality=True)
+
+    if len(mate) < len(nodes) or -1 in mate:
+        raise ValueError('No perfect matching exists for these pairs')
+    pairs = {}
+    for (u, v) in pair_costs:
+        i, j = index[u], index[v]
+        if mate[i] == j and (i, j) not in pairs and (j, i) not in pairs:
+            pairs[(i, j)] = (u, v)
+    return list(pairs.values())
+
+
+def max_weight_matching(edges, max_cardinality=False):
+    """
+    Return a maximum weight matching of a general graph.
+
+    `edges` is a list of (i, j, weight) tuples, with vertices numbered from 0.
+    Returns a list `mate` such that mate[i] == j if vertex i is matched to j,
+    or -1 if it is single. If `max_cardinality` is True, only maximum
+    cardinality matchings are considered. Integer weights are exact, float
+    weights are subject to rounding.
+    """
+    if not edges:
+        return []
+
+    # Vertices are numbered 0 .. (nvertex-1), non-trivial blossoms are numbered
+    # nvertex .. (2*nvertex-1). Edge endpoints are numbered 0 .. (2*nedge-1),
+    # such that endpoint[2*k] == edges[k][0] and endpoint[2*k+1] == edges[k][1].
+    nedge = len(edges)
+    nvertex = 1 + max(max(i, j) for (i, j, _) in edges)
+    max_weight = max(0, max(weight for (_, _, weight) in edges))
+    integer = all(isinstance(weight, int) for (_, _, weight) in edges)
+
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * nedge)]
+    # neighbend[v] is the list of remote endpoints of the edges attached to v
+    neighbend = [[] for _ in range(nvertex)]
+    for k, (i, j, _) in enumerate(edges):
+        neighbend[i].append(2 * k + 1)
+        neighbend[j].append(2 * k)
+
+    # mate[v] is the remote endpoint of v's matched edge, or -1 if single
+    mate = nvertex * [-1]
+    # label[b] is 0 (free), 1 (S-vertex/blossom) or 2 (T-vertex/blossom)
+    label = (2 * nvertex) * [0]
+    # labelend[b] is the endpoint through which b obtained its label
+    labelend = (2 * nvertex) * [-1]
+    # inblossom[v] is the top-level blossom containing vertex v
+    inblossom = list(range(nvertex))
+    blossomparent = (2 * nvertex) * [-1]
+    # blossomchilds[b] is the ordered list of sub-blossoms, starting at the base
+    blossomchilds = (2 * nvertex) * [None]
+    blossombase = list(range(nvertex)) + nvertex * [-1]
+    # blossomendps[b] lists the endpoints connecting consecutive sub-blossoms
+    blossomendps = (2 * nvertex) * [None]
+    # bestedge[b] is the least-slack edge to a different S-blossom, or -1
+    bestedge = (2 * nvertex) * [-1]
+    blossombestedges = (2 * nvertex) * [None]
+    unusedblossoms = list(range(nvertex, 2 * nvertex))
+    # Vertex duals start at max_weight, blossom duals at zero
+    dualvar = nvertex * [max_weight] + nvertex * [0]
+    # allowedge[k] is True if edge k has zero slack
+    allowedge = nedge * [False]
+    queue = []  # S-vertices still to be scanned
+
+    def slack(k):
+        """Return 2 * slack of edge k (does not work inside blossoms)."""
+        (i, j, weight) = edges[k]
+        return dualvar[i] + dualvar[j] - 2 * weight
+
+    def blossom_leaves(b):
+        """Generate the leaf vertices of a blossom."""
+        if b < nvertex:
+            yield b
+        else:
+            for t in blossomchilds[b]:
+                if t < nvertex:
+                    yield t
+                else:
+                    for v in blossom_leaves(t):
+                        yield v
+
+    def assign_label(w, t, p):
+        """Label w and its top-level blossom, reached through endpoint p."""
+        b = inblossom[w]
+        label[w] = label[b] = t
+        labelend[w] = labelend[b] = p
+        bestedge[w] = bestedge[b] = -1
+        if t == 1:  # b became an S-blossom, add its vertices to the queue
+            queue.extend(blossom_leaves(b))
+        elif t == 2:  # b became a T-blossom, assign label S to its mate
+            base = blossombase[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scan_blossom(v, w):
+        """Trace back from v and w to find a new blossom base, or -1 if none."""
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = inblossom[v]
+            if label[b] & 4:  # Already visited from the other side
+                base = blossombase[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if labelend[b] == -1:  # The base of blossom b is single, stop
+                v = -1
+            else:
+                v = endpoint[labelend[b]]
+                b = inblossom[v]
+                v = endpoint[labelend[b]]  # b is a T-blossom, trace one more step
+            if w != -1:  # Swap v and w, alternating between both paths
+                v, w = w, v
+        for b in path:  # Remove breadcrumbs
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        """Construct a new blossom with the given base, closed by edge k."""
+        (v, w, _) = edges[k]
+        bb = inblossom[base]
+        bv = inblossom[v]
+        bw = inblossom[w]
+        b = unusedblossoms.pop()
+        blossombase[b] = base
+        blossomparent[b] = -1
+        blossomparent[bb] = b
+        blossomchilds[b] = path = []
+        blossomendps[b] = endps = []
+        while bv != bb:  # Trace back from v to base
+            blossomparent[bv] = b
+            path.append(bv)
+            endps.append(labelend[bv])
+            v = endpoint[labelend[bv]]
+            bv = inblossom[v]
+        path.append(bb)
+        path.reverse()
+        endps.reverse()
+        endps.append(2 * k)
+        while bw != bb:  # Trace back from w to base
+            blossomparent[bw] = b
+            path.append(bw)
+            endps.append(labelend[bw] ^ 1)
+            w = endpoint[labelend[bw]]
+            bw = inblossom[w]
+        label[b] = 1
+        labelend[b] = labelend[bb]
+        dualvar[b] = 0
+        for v in blossom_leaves(b):
+            if label[inblossom[v]] == 2:  # Former T-vertices become S-vertices
+                queue.append(v)
+            inblossom[v] = b
+        # Compute the least-slack edges from b to every other S-blossom
+        bestedgeto = (2 * nvertex) * [-1]
+        for bv in path:
+            if blossombestedges[bv] is None:
+                nblists = [[p // 2 for p in neighbend[v]] for v in blossom_leaves(bv)]
+            else:
+                nblists = [blossombestedges[bv]]
+            for nblist in nblists:
+                for k in nblist:
+                    (i, j, _) = edges[k]
+                    if inblossom[j] == b:
+                        i, j = j, i
+                    bj = inblossom[j]
+                    if bj != b and label[bj] == 1 and (
+                        bestedgeto[bj] == -1 or slack(k) < slack(bestedgeto[bj])
+                    ):
+                        bestedgeto[bj] = k
+            blossombestedges[bv] = None
+            bestedge[bv] = -1
+        blossombestedges[b] = [k for k in bestedgeto if k != -1]
+        bestedge[b] = -1
+        for k in blossombestedges[b]:
+            if bestedge[b] == -1 or slack(k) < slack(bestedge[b]):
+                bestedge[b] = k
+
+    def expand_blossom(b, endstage):
+        """Expand blossom b into its sub-blossoms."""
+        for s in blossomchilds[b]:
+            blossomparent[s] = -1
+            if s < nvertex:
+                inblossom[s] = s
+            elif endstage and dualvar[s] == 0:
+                expand_blossom(s, endstage)  # Recursively expand this sub-blossom
+            else:
+                for v in blossom_leaves(s):
+                    inblossom[v] = s
+        if not endstage and label[b] == 2:
+            # Relabel the sub-blossoms on the even path from entry to base
+            entrychild = inblossom[endpoint[labelend[b] ^ 1]]
+            j = blossomchilds[b].index(entrychild)
+            if j & 1:  # Start index is odd, go forward and wrap
+                j -= len(blossomchilds[b])
+                jstep = 1
+                endptrick = 0
+            else:  # Start index is even, go backward
+                jstep = -1
+                endptrick = 1
+            p = labelend[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[blossomendps[b][j - endptrick] ^ endptrick ^ 1]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowedge[blossomendps[b][j - endptrick] // 2] = True
+                j += jstep
+                p = blossomendps[b][j - endptrick] ^ endptrick
+                allowedge[p // 2] = True
+                j += jstep
+            # Relabel the base T-sub-blossom without stepping through to its mate
+            bv = blossomchilds[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            labelend[endpoint[p ^ 1]] = labelend[bv] = p
+            bestedge[bv] = -1
+            # Continue along the odd path, labelling sub-blossoms reachable from outside
+            j += jstep
+            while blossomchilds[b][j] != entrychild:
+                bv = blossomchilds[b][j]
+                if label[bv] == 1:  # Already labelled S through another edge
+                    j += jstep
+                    continue
+                for v in blossom_leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:  # Reachable vertex found, label the sub-blossom T
+                    label[v] = 0
+                    label[endpoint[mate[blossombase[bv]]]] = 0
+                    assign_label(v, 2, labelend[v])
+                j += jstep
+        # Recycle the blossom number
+        label[b] = labelend[b] = -1
+        blossomchilds[b] = blossomendps[b] = None
+        blossombase[b] = -1
+        blossombestedges[b] = None
+        bestedge[b] = -1
+        unusedblossoms.append(b)
+
+    def augment_blossom(b, v):
+        """Swap matched and unmatched edges inside b, so that v becomes its base."""
+        t = v
+        while blossomparent[t] != b:  # Find the immediate sub-blossom containing v
+            t = blossomparent[t]
+        if t >= nvertex:
+            augment_blossom(t, v)
+        i = j = blossomchilds[b].index(t)
+        if i & 1:
+            j -= len(blossomchilds[b])
+            jstep = 1
+            endptrick = 0
+        else:
+            jstep = -1
+            endptrick = 1
+        while j != 0:  # Move along the blossom until we reach the base
+            j += jstep
+            t = blossomchilds[b][j]
+            p = blossomendps[b][j - endptrick] ^ endptrick
+            if t >= nvertex:
+                augment_blossom(t, endpoint[p])
+            j += jstep
+            t = blossomchilds[b][j]
+            if t >= nvertex:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1  # Match the edge connecting these sub-blossoms
+            mate[endpoint[p ^ 1]] = p
+        # Rotate the sub-blossom list to put the new base at the front
+        blossomchilds[b] = blossomchilds[b][i:] + blossomchilds[b][:i]
+        blossomendps[b] = blossomendps[b][i:] + blossomendps[b][:i]
+        blossombase[b] = blossombase[blossomchilds[b][0]]
+
+    def augment_matching(k):
+        """Swap matched and unmatched edges along the augmenting path through k."""
+        (v, w, _) = edges[k]
+        for (s, p) in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:  # Match s to p, then trace back to the single vertex
+                bs = inblossom[s]
+                if bs >= nvertex:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if labelend[bs] == -1:  # Reached a single vertex, stop
+                    break
+                t = endpoint[labelend[bs]]
+                bt = inblossom[t]
+                s = endpoint[labelend[bt]]
+                j = endpoint[labelend[bt] ^ 1]
+                if bt >= nvertex:
+                    augment_blossom(bt, j)
+                mate[j] = labelend[bt]
+                p = labelend[bt] ^ 1
+
+    for _ in range(nvertex):  # Each stage finds an augmenting path, or stops
+        label[:] = (2 * nvertex) * [0]
+        bestedge[:] = (2 * nvertex) * [-1]
+        blossombestedges[nvertex:] = nvertex * [None]
+        allowedge[:] = nedge * [False]
+        queue[:] = []
+
+        for v in range(nvertex):  # Label single vertices S
+            if mate[v] == -1 and label[inblossom[v]] == 0:
+                assign_label(v, 1, -1)
+
+        augmented = False
+        while True:
+            while queue and not augmented:  # Grow the alternating forest
+                v = queue.pop()
+                for p in neighbend[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if inblossom[v] == inblossom[w]:
+                        continue  # Edge internal to a blossom
+                    if not allowedge[k]:
+                        kslack = slack(k)
+                        if kslack <= 0:
+                            allowedge[k] = True
+                    if allowedge[k]:
+                        if label[inblossom[w]] == 0:  # w is free, label it T
+                            assign_label(w, 2, p ^ 1)
+                        elif label[inblossom[w]] == 1:  # S to S: blossom or path
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:  # w is inside a T-blossom
+                            label[w] = 2
+                            labelend[w] = p ^ 1
+                    elif label[inblossom[w]] == 1:
+                        b = inblossom[v]
+                        if bestedge[b] == -1 or kslack < slack(bestedge[b]):
+                            bestedge[b] = k
+                    elif label[w] == 0:
+                        if bestedge[w] == -1 or kslack < slack(bestedge[w]):
+                            bestedge[w] = k
+
+            if augmented:
+                break
+
+            # No augmenting path yet: update the duals by the smallest delta
+            deltatype = -1
+            delta = deltaedge = deltablossom = None
+            if not max_cardinality:  # Delta 1: minimum vertex dual
+                deltatype = 1
+                delta = min(dualvar[:nvertex])
+            for v in range(nvertex):  # Delta 2: S-vertex to free vertex edge
+                if label[inblossom[v]] == 0 and bestedge[v] != -1:
+                    d = slack(bestedge[v])
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 2
+                        deltaedge = bestedge[v]
+            for b in range(2 * nvertex):  # Delta 3: half of S to S-blossom edge
+                if blossomparent[b] == -1 and label[b] == 1 and bestedge[b] != -1:
+                    kslack = slack(bestedge[b])
+                    d = kslack // 2 if integer else kslack / 2.0
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 3
+                        deltaedge = bestedge[b]
+            for b in range(nvertex, 2 * nvertex):  # Delta 4: minimum T-blossom dual
+                if (
+                    blossombase[b] >= 0
+                    and blossomparent[b] == -1
+                    and label[b] == 2
+                    and (deltatype == -1 or dualvar[b] < delta)
+                ):
+                    delta = dualvar[b]
+                    deltatype = 4
+                    deltablossom = b
+            if deltatype == -1:  # No further improvement possible
+                deltatype = 1
+                delta = max(0, min(dualvar[:nvertex]))
+
+            for v in range(nvertex):
+                if label[inblossom[v]] == 1:
+                    dualvar[v] -= delta
+                elif label[inblossom[v]] == 2:
+                    dualvar[v] += delta
+            for b in range(nvertex, 2 * nvertex):
+                if blossombase[b] >= 0 and blossomparent[b] == -1:
+                    if label[b] == 1:
+                        dualvar[b] += delta
+                    elif label[b] == 2:
+                        dualvar[b] -= delta
+
+            if deltatype == 1:  # Optimum reached
+                break
+            elif deltatype == 2:
+                allowedge[deltaedge] = True
+                (i, j, _) = edges[deltaedge]
+                if label[inblossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif deltatype == 3:
+                allowedge[deltaedge] = True
+                (i, j, _) = edges[deltaedge]
+                queue.append(i)
+            elif deltatype == 4:
+                expand_blossom(deltablossom, False)
+
+        if not augmented:  # No more augmenting paths, we're done
+            break
+
+        # End of stage: expand S-blossoms whose dual dropped to zero
+        for b in range(nvertex, 2 * nvertex):
+            if (
+                blossomparent[b] == -1
+                and blossombase[b] >= 0
+                and label[b] == 1
+                and dualvar[b] == 0
+            ):
+                expand_blossom(b, True)
+
+    for v in range(nvertex):  # Convert endpoints to vertices
+        if mate[v] >= 0:
+            mate[v] = endpoint[mate[v]]
+    return mate
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['matching'])
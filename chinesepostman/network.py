@@ -1,4 +1,5 @@
-import copy
+from array import array
+from collections.abc import Mapping
 
 from . import my_math
 
@@ -7,7 +8,9 @@ class Graph(object):
     """Abstract representation of a graph."""
 
     def __init__(self, data=None):
-        self.edges = {}
+        self.edges = EdgeStore()
+        self._adjacency = {}  # {node: array of incident edge keys}
+        self._odd = set()  # Nodes of odd order
         if data:  # data is simply a list of edges
             self.add_edges(data)
 
@@ -20,8 +23,46 @@ class Graph(object):
             self.add_edge(*edge)  # edge is a tuple of data
 
     def add_edge(self, *args):
-        """Adds an Edge to our graph."""
-        self.edges[len(self.edges)] = Edge(*args)
+        """Adds an Edge to our graph, and returns its key."""
+        edge = Edge(*args)
+        key = self.edges.append(edge)
+        self._index(key, edge.head, edge.tail)
+        return key
+
+    @classmethod
+    def from_edge_store(cls, store):
+        """Return a graph of the edges in an EdgeStore, without copying them."""
+        graph = cls()
+        graph.edges = store
+        heads, tails = store.heads, store.tails
+        for key in store:
+            graph._index(key, heads[key], tails[key])
+        return graph
+
+    def _index(self, key, head, tail):
+        """Add an edge to the adjacency index."""
+        for node in set((head, tail)):
+            options = self._adjacency.get(node)
+            if options is None:
+                options = self._adjacency[node] = array('q')
+            options.append(key)
+            self._update_parity(node, len(options))
+
+    def _unindex(self, key, head, tail):
+        """Remove an edge from the adjacency index, dropping disconnected nodes."""
+        for node in set((head, tail)):
+            options = self._adjacency[node]
+            options.remove(key)
+            if not options:
+                del self._adjacency[node]
+            self._update_parity(node, len(options))
+
+    def _update_parity(self, node, order):
+        """Keep the set of odd nodes in step with a node's new order."""
+        if my_math.is_even(order):
+            self._odd.discard(node)
+        else:
+            self._odd.add(node)
 
     def remove_edges(self, edges):
         """Removes a list of edges."""
@@ -34,17 +75,21 @@ class Graph(object):
     def remove_edge(self, *args):
         """Remove an edge, plus node if it's disconnected."""
         if len(args) == 1 and isinstance(args[0], int):
-            del self.edges[args[0]]  # Remove by key
+            key = args[0]  # Remove by key
         else:
             match = self.find_edge(*args)  # Returns all matches
-            del self.edges[list(match.keys())[0]]  # Delete first match only
+            key = list(match.keys())[0]  # Delete first match only
+        self._remove_key(key)
+
+    def _remove_key(self, key):
+        """Remove an edge by key."""
+        edge = self.edges.pop(key)
+        self._unindex(key, edge.head, edge.tail)
 
     @property
     def nodes(self):
         """Return a set of all node indices in this graph."""
-        return set(
-            [node for edge in self.edges.values() for node in (edge.head, edge.tail)]
-        )
+        return set(self._adjacency)
 
     @property
     def node_keys(self):
@@ -54,22 +99,20 @@ class Graph(object):
     @property
     def node_orders(self):
         """Return how many connections a node has."""
-        return {x: len(self.edge_options(x)) for x in self.nodes}
+        return {x: self.node_order(x) for x in self.nodes}
+
+    def node_order(self, node):
+        """Return how many connections a single node has."""
+        return len(self._adjacency.get(node, ()))
 
     @property
     def odd_nodes(self):
-        """Return a list of odd nodes only."""
-        return [k for k in self.nodes if not my_math.is_even(self.node_orders[k])]
+        """Return an ascending list of odd nodes only."""
+        return sorted(self._odd)
 
     def node_options(self, node):
-        """Returns an ascending list of (node, cost) tuples connected to this node."""
-        options = []
-        for edge in self.edges.values():
-            if edge.head == node:
-                options.append(edge.tail)
-            elif edge.tail == node:
-                options.append(edge.head)
-        return sorted(options)
+        """Returns an ascending list of nodes connected to this node."""
+        return sorted(edge.end(node) for edge in self.edge_options(node).values())
 
     @property
     def is_eularian(self):
@@ -89,7 +132,7 @@ class Graph(object):
     def find_edges(self, head, tail, cost=None, directed=None):
         """Returns a {key: edge} dictionary of all matching edges."""
         results = {}
-        for key, edge in self.edges.items():
+        for key, edge in self.edge_options(head).items():
             if not cost and not directed:
                 if (head, tail) == (edge.head, edge.tail) or \
                    (tail, head) == (edge.head, edge.tail):
@@ -111,7 +154,8 @@ class Graph(object):
 
     def edge_options(self, node):
         """Return dictionary of available edges for a given node."""
-        return {k: v for k, v in self.edges.items() if node in (v.head, v.tail)}
+        edges = self.edges
+        return {key: edges[key] for key in self._adjacency.get(node, ())}
 
     def edge_cost(self, *args):
         """Search for this edge."""
@@ -133,11 +177,9 @@ class Graph(object):
         connected nodes. If DFS reaches all unvisited nodes, then the given
         edge must not be a bridge.
         """
-        graph = copy.deepcopy(self)
+        start = self.edges[key].tail  # Could start at either end.
 
-        start = graph.edges[key].tail  # Could start at either end.
-
-        graph.remove_edge(key)  # Don't include the given edge
+        graph = GraphView(self, hidden=[key])  # Don't include the given edge
 
         stack = []
         visited = set()  # Visited nodes
@@ -160,13 +202,336 @@ class Graph(object):
         else:
             return True  # The edge is a bridge
 
+    def find_bridges(self, start=None, skip=()):
+        """
+        Return the set of keys of all bridge edges.
+
+        Uses Tarjan's low-link depth-first search, in O(V + E). A bridge is an
+        edge whose child end, and everything below it, can't reach back above
+        it. If `start` is set, only search the component containing that node.
+        Edges in `skip` are treated as if they were already removed.
+        """
+        order = {}  # {node: discovery index}
+        low = {}  # {node: lowest discovery index reachable from its subtree}
+        bridges = set()
+        roots = [start] if start is not None else self.nodes
+        for root in roots:
+            if root in order:
+                continue
+            order[root] = low[root] = len(order)
+            # Iterative DFS: (node, key of the edge used to get there, options)
+            stack = [(root, None, iter(self.edge_options(root).items()))]
+            while stack:
+                node, parent_key, options = stack[-1]
+                for key, edge in options:
+                    if key == parent_key or key in skip:
+                        continue  # Don't go straight back down the same edge
+                    next_node = edge.end(node)
+                    if next_node in order:  # Back edge
+                        low[node] = min(low[node], order[next_node])
+                    else:
+                        order[next_node] = low[next_node] = len(order)
+                        stack.append(
+                            (next_node, key, iter(self.edge_options(next_node).items()))
+                        )
+                        break
+                else:  # Subtree finished, report back to the parent
+                    stack.pop()
+                    if stack:
+                        parent = stack[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                        if low[node] > order[parent]:
+                            bridges.add(parent_key)
+        return bridges
+
+    def components(self):
+        """
+        Return the node sets of each connected component, largest first.
+
+        Walks every edge once from each end, so this is O(V + E).
+        """
+        components = []
+        seen = set()
+        for root in self.node_keys:
+            if root in seen:
+                continue
+            component = {root}
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for edge in self.edge_options(node).values():
+                    next_node = edge.end(node)
+                    if next_node not in component:
+                        component.add(next_node)
+                        stack.append(next_node)
+            seen |= component
+            components.append(component)
+        components.sort(key=len, reverse=True)  # Stable, so ties stay in node order
+        return components
+
+    @property
+    def is_connected(self):
+        """Return True if every edge can be reached from every other."""
+        return len(self.components()) <= 1
+
+    def subgraph(self, nodes):
+        """Return a new graph of the edges between some nodes."""
+        nodes = set(nodes)
+        keys = set()
+        for node in nodes:
+            for key, edge in self.edge_options(node).items():
+                if edge.head in nodes and edge.tail in nodes:
+                    keys.add(key)
+        return Graph([self.edges[key].contents for key in sorted(keys)])
+
     def __len__(self):
         return len(self.edges)
 
 
+class GraphView(Graph):
+    """
+    A graph seen through a mask, without copying it.
+
+    Edges of the underlying graph can be hidden, and new edges can be added on
+    top, e.g. to walk a graph while removing visited edges, or to add the
+    augmenting edges of an Eularian graph. The underlying graph must not be
+    modified while the view is in use.
+    """
+
+    def __init__(self, graph, hidden=None):
+        self._graph = graph
+        self._hidden = set()  # Keys of hidden edges of the underlying graph
+        self._added = {}  # {key: edge} of edges added to the view
+        self._added_adjacency = {}  # {node: {key: edge}} of added edges
+        self._order_changes = {}  # {node: change in order}
+        self._next_key = None  # Added keys follow the underlying graph's keys
+        self.edges = _EdgesView(self)
+        if hidden:
+            for key in hidden:
+                self._remove_key(key)
+
+    def __repr__(self):
+        return 'GraphView({})'.format(dict(self.edges))
+
+    def add_edge(self, *args):
+        """Adds an Edge on top of the underlying graph."""
+        if self._next_key is None:
+            self._next_key = max(self._graph.edges, default=-1) + 1
+        key = self._next_key
+        self._next_key += 1
+        edge = Edge(*args)
+        self._added[key] = edge
+        for node in set((edge.head, edge.tail)):
+            self._added_adjacency.setdefault(node, {})[key] = edge
+            self._change_order(node, 1)
+
+    def _remove_key(self, key):
+        """Hide an edge of the underlying graph, or drop an added edge."""
+        edge = self.edges[key]  # KeyError if already gone
+        if key in self._added:
+            del self._added[key]
+            for node in set((edge.head, edge.tail)):
+                options = self._added_adjacency[node]
+                del options[key]
+                if not options:
+                    del self._added_adjacency[node]
+        else:
+            self._hidden.add(key)
+        for node in set((edge.head, edge.tail)):
+            self._change_order(node, -1)
+
+    def _change_order(self, node, change):
+        """Track how much a node's order differs from the underlying graph."""
+        change += self._order_changes.get(node, 0)
+        if change:
+            self._order_changes[node] = change
+        else:
+            self._order_changes.pop(node, None)
+
+    @property
+    def nodes(self):
+        """Return a set of all node indices in this view."""
+        nodes = set(self._graph.nodes) | set(self._added_adjacency)
+        return {x for x in nodes if self.node_order(x)}
+
+    def node_order(self, node):
+        """Return how many connections a single node has."""
+        return self._graph.node_order(node) + self._order_changes.get(node, 0)
+
+    @property
+    def odd_nodes(self):
+        """Return an ascending list of odd nodes only."""
+        odd = set(self._graph.odd_nodes)
+        for node, change in self._order_changes.items():
+            if not my_math.is_even(change):
+                odd ^= {node}  # Parity flipped
+        return sorted(odd)
+
+    def edge_options(self, node):
+        """Return dictionary of available edges for a given node."""
+        options = self._graph.edge_options(node)
+        for key in self._hidden.intersection(options):
+            del options[key]
+        options.update(self._added_adjacency.get(node, {}))
+        return options
+
+
+class EdgeStore(Mapping):
+    """
+    Compact {key: edge} storage, with one array per edge attribute.
+
+    Edges are kept as parallel head, tail, weight and directed columns, costing
+    tens of bytes per edge rather than a full object each. Edge objects are
+    only built on access. Keys are stable integer ids, never reused after a
+    removal. Nodes must be integers.
+    """
+
+    COLUMNS = ('heads', 'tails', 'weights', 'directed')
+
+    def __init__(self):
+        self.heads = array('q')
+        self.tails = array('q')
+        self.weights = array('q')  # Becomes 'd' on the first non-integer weight
+        self.directed = bytearray()
+        self.alive = bytearray()  # 0 once an edge is removed
+        self._count = 0
+        self._owner = None  # Whatever holds the columns' memory, if not us
+
+    @classmethod
+    def from_columns(cls, heads, tails, weights, directed, owner=None):
+        """
+        Return a store backed by existing columns, e.g. of a memory-mapped file.
+
+        Columns are buffers of 'q' heads & tails, 'q' or 'd' weights and 'B'
+        directed flags. They are only copied once an edge is added.
+        """
+        store = cls()
+        store.heads, store.tails, store.weights, store.directed = (
+            heads, tails, weights, directed
+        )
+        store.alive = bytearray(b'\x01') * len(heads)
+        store._count = len(heads)
+        store._owner = owner
+        return store
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in self.COLUMNS:  # Buffers can't be pickled, arrays can
+            state[name] = _own_column(state[name])
+        state['_owner'] = None
+        return state
+
+    @property
+    def weight_typecode(self):
+        """Return 'q' if weights are stored as integers, else 'd'."""
+        weights = self.weights
+        return weights.typecode if isinstance(weights, array) else weights.format
+
+    def append(self, edge):
+        """Store an edge, and return its new key."""
+        if self._owner is not None:  # Borrowed columns are read-only
+            for name in self.COLUMNS:
+                setattr(self, name, _own_column(getattr(self, name)))
+            self._owner = None
+        # Converted before any column is touched, so a bad edge leaves them in step
+        try:
+            nodes = array('q', (edge.head, edge.tail))
+        except (TypeError, OverflowError):
+            raise ValueError('Edge nodes must be integers: {}'.format(edge))
+        try:
+            weight = array(self.weights.typecode, [edge.weight])
+        except (TypeError, OverflowError):  # A float weight, or too big an integer
+            try:
+                weight = array('d', [edge.weight])
+            except (TypeError, OverflowError):
+                raise ValueError('Edge weight must be a number: {}'.format(edge))
+        if weight.typecode != self.weights.typecode:  # Switch to a float column
+            self.weights = array('d', self.weights)
+        self.weights.extend(weight)
+        self.heads.append(nodes[0])
+        self.tails.append(nodes[1])
+        self.directed.append(bool(edge.directed))
+        self.alive.append(1)
+        self._count += 1
+        return len(self.alive) - 1
+
+    def pop(self, key):
+        """Remove an edge by key, and return it."""
+        edge = self[key]
+        self.alive[key] = 0
+        self._count -= 1
+        return edge
+
+    def __getitem__(self, key):
+        try:
+            if key < 0 or not self.alive[key]:
+                raise KeyError(key)
+        except (IndexError, TypeError):
+            raise KeyError(key)
+        return Edge(
+            self.heads[key], self.tails[key], self.weights[key], bool(self.directed[key])
+        )
+
+    def __contains__(self, key):
+        try:
+            return key >= 0 and bool(self.alive[key])
+        except (IndexError, TypeError):
+            return False
+
+    def __iter__(self):
+        alive = self.alive
+        return (key for key in range(len(alive)) if alive[key])
+
+    def __len__(self):
+        return self._count
+
+
+def _own_column(column):
+    """Return a column as an array, or bytearray, of our own."""
+    if isinstance(column, (array, bytearray)):
+        return column
+    if column.format == 'B':
+        return bytearray(column)
+    owned = array(column.format)
+    owned.frombytes(column.cast('B'))
+    return owned
+
+
+class _EdgesView(Mapping):
+    """Read-only {key: edge} mapping of the edges visible through a GraphView."""
+
+    def __init__(self, view):
+        self._view = view
+
+    def __getitem__(self, key):
+        view = self._view
+        if key in view._added:
+            return view._added[key]
+        if key in view._hidden:
+            raise KeyError(key)
+        return view._graph.edges[key]
+
+    def __iter__(self):
+        view = self._view
+        for key in view._graph.edges:
+            if key not in view._hidden:
+                yield key
+        for key in view._added:
+            yield key
+
+    def __len__(self):
+        view = self._view
+        return len(view._graph.edges) - len(view._hidden) + len(view._added)
+
+
 class Edge(object):
     """A connection between nodes."""
 
+    __slots__ = ('head', 'tail', 'weight', 'directed')
+
     def __init__(self, head=None, tail=None, weight=0, directed=False):
         self.head = head  # Start node
         self.tail = tail  # End node
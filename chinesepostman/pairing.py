@@ -0,0 +1,162 @@
+"""
+Anytime pairing of odd nodes, for when exact matching takes too long.
+
+A greedy matching, cheapest pairs first, is improved by 2-opt moves: two
+pairs swap partners whenever that makes them cheaper. Each node only tries
+its nearest few candidates, and the moves stop once none help, or at a
+deadline. Alongside, a lower bound on the cheapest matching tells how far
+from optimal the answer can be.
+"""
+import time
+
+from . import profiling
+
+NEIGHBOURS = 10  # Nearest candidates each node tries to swap towards
+
+
+class Pairing(object):
+    """A perfect matching of odd nodes, its cost & a lower bound on the optimum."""
+
+    def __init__(self, pairs, cost, lower_bound, swaps=0):
+        self.pairs = pairs
+        self.cost = cost
+        self.lower_bound = lower_bound
+        self.swaps = swaps  # Improving moves made
+
+    def __repr__(self):
+        return 'Pairing(<{}> pairs, cost {}, lower bound {})'.format(
+            len(self.pairs), self.cost, self.lower_bound
+        )
+
+    @property
+    def gap(self):
+        """Return how much dearer than optimal this could be, as a fraction."""
+        if not self.lower_bound:
+            return 0.0 if not self.cost else float('inf')
+        return (self.cost - self.lower_bound) / float(self.lower_bound)
+
+
+def nearest_candidates(pair_costs, size=NEIGHBOURS):
+    """Return {node: [other nodes]}, the cheapest `size` pairs of each node first."""
+    options = {}
+    for (u, v), cost in pair_costs.items():
+        options.setdefault(u, []).append((cost, v))
+        options.setdefault(v, []).append((cost, u))
+    return {node: [x for _, x in sorted(costs)[:size]] for node, costs in options.items()}
+
+
+def greedy_matching(pair_costs):
+    """
+    Return {node: mate}, taking the cheapest pair of unmatched nodes each time.
+
+    Raises ValueError if some nodes can't be matched, e.g. when `pair_costs`
+    is sparse.
+    """
+    mate = {}
+    unmatched = _match_cheapest(pair_costs, mate)
+    if unmatched:
+        raise ValueError('Greedy matching left <{}> nodes unmatched'.format(
+            len(unmatched)
+        ))
+    return mate
+
+
+def _match_cheapest(pair_costs, mate):
+    """Add the cheapest pairs of unmatched nodes to `mate`, & return any left."""
+    for (u, v), _ in sorted(pair_costs.items(), key=lambda x: x[1]):
+        if u != v and u not in mate and v not in mate:
+            mate[u], mate[v] = v, u
+    return set(node for pair in pair_costs for node in pair).difference(mate)
+
+
+def improve(mate, near, cost, deadline=None):
+    """
+    Improve a matching in place by 2-opt swaps, & return how many were made.
+
+    For a pair (a, b), each candidate c nearer to a than b is, in pair (c, d),
+    is tried as the swap to (a, c) & (b, d). Stops when a pass over every node
+    finds no swap, or at the `deadline`, a time.monotonic() value.
+    """
+    swaps = 0
+    improved = True
+    while improved:
+        improved = False
+        for i, a in enumerate(near):
+            if deadline is not None and not i % 64 and time.monotonic() > deadline:
+                return swaps
+            b = mate[a]
+            ab = cost(a, b)
+            for c in near[a]:
+                ac = cost(a, c)
+                if ac >= ab:
+                    break  # Candidates are nearest first
+                d = mate[c]
+                if ac + cost(b, d) < ab + cost(c, d):
+                    mate[a], mate[c] = c, a
+                    mate[b], mate[d] = d, b
+                    swaps += 1
+                    improved = True
+                    break
+    return swaps
+
+
+def lower_bound(near, cost):
+    """
+    Return a lower bound on the cost of any perfect matching.
+
+    Every node's pair costs at least its cheapest pair, and each pair is
+    counted from both its nodes, so half the sum of these is a bound.
+    """
+    return sum(cost(node, others[0]) for node, others in near.items()) / 2.0
+
+
+def anytime_matching(pair_costs, time_limit=None, more_costs=None):
+    """
+    Return a Pairing of the nodes in {(node, node): cost} pair costs.
+
+    With a `time_limit` in seconds, improvement stops when it's up, else when
+    no swap helps. The greedy start is always completed, however long. If it
+    leaves nodes unmatched, as it can when `pair_costs` is sparse, they are
+    passed to `more_costs`, which returns pair costs between some of them,
+    until all are matched.
+    """
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    if not pair_costs:
+        return Pairing([], 0, 0)
+
+    def cost(u, v):
+        if (u, v) in pair_costs:
+            return pair_costs[(u, v)]
+        return pair_costs.get((v, u), float('inf'))
+
+    mate = {}
+    unmatched = _match_cheapest(pair_costs, mate)
+    if unmatched and more_costs is not None:
+        pair_costs = dict(pair_costs)  # Don't add to the caller's
+        while unmatched:
+            extra = more_costs(list(unmatched))
+            pair_costs.update(extra)
+            _match_cheapest(extra, mate)
+            if unmatched.isdisjoint(mate):
+                break  # No more pairs to be had
+            unmatched.difference_update(mate)
+    if unmatched:
+        raise ValueError('Greedy matching left <{}> nodes unmatched'.format(
+            len(unmatched)
+        ))
+    near = nearest_candidates(pair_costs)
+    swaps = improve(mate, near, cost, deadline)
+    profiling.count('pair swaps', swaps)
+
+    pairs, seen = [], set()
+    for u, v in mate.items():
+        if u not in seen:
+            seen.update((u, v))
+            pairs.append((u, v) if (u, v) in pair_costs else (v, u))
+    total = sum(pair_costs[x] for x in pairs)
+    return Pairing(pairs, total, lower_bound(near, cost), swaps)
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['pairing'])
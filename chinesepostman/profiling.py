@@ -0,0 +1,124 @@
+"""
+Phase timers and counters for the solver.
+
+Solver code marks its phases with `phase(name)` and bumps counters with
+`count(name)`. Both do nothing unless a Stats is active, e.g.
+
+    with profiling.Stats(memory=True) as stats:
+        eularian.make_eularian(graph)
+    print(stats.report())
+
+Peak memory per phase is measured with tracemalloc, which slows everything
+down, so it is only traced if asked for.
+"""
+import contextlib
+import time
+import tracemalloc
+
+_active = []  # Stack of active Stats, innermost last
+
+
+class Stats(object):
+    """Timings, peak memory & counters, collected while active."""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.phases = {}  # {name: {'calls', 'seconds', 'peak_bytes'}}, in order
+        self.counters = {}
+        self.seconds = 0.0
+        self._started = None
+        self._tracing = False  # True if we started tracemalloc
+        self._peaks = []  # Peak memory of each open phase, so far
+
+    def __enter__(self):
+        _active.append(self)
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self._started = time.time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds += time.time() - self._started
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        _active.remove(self)
+
+    def count(self, name, number=1):
+        """Add to a counter."""
+        self.counters[name] = self.counters.get(name, 0) + number
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a phase, and trace its peak memory if asked to."""
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            self._fold_peak()
+            self._peaks.append(0)
+        started = time.time()
+        try:
+            yield
+        finally:
+            seconds = time.time() - started
+            phase = self.phases.setdefault(name, {'calls': 0, 'seconds': 0.0})
+            phase['calls'] += 1
+            phase['seconds'] += seconds
+            if tracing:
+                self._fold_peak()
+                peak = self._peaks.pop()
+                phase['peak_bytes'] = max(phase.get('peak_bytes', 0), peak)
+                if self._peaks:  # The enclosing phase peaked at least as high
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+
+    def _fold_peak(self):
+        """Credit the peak since the last reset to the innermost open phase."""
+        peak = tracemalloc.get_traced_memory()[1]
+        if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+, else peak of the run
+            tracemalloc.reset_peak()
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+
+    def as_dict(self):
+        """Return everything collected, ready to dump as JSON."""
+        return {
+            'seconds': self.seconds,
+            'phases': self.phases,
+            'counters': self.counters,
+        }
+
+    def report(self):
+        """Return a table of phases and counters."""
+        header = ('Phase', 'Calls', 'Seconds', 'Peak KiB')
+        lines = ['{:<24}{:>8}{:>12}{:>14}'.format(*header)]
+        for name, phase in self.phases.items():
+            peak = phase.get('peak_bytes')
+            lines.append('{:<24}{:>8}{:>12.4f}{:>14}'.format(
+                name, phase['calls'], phase['seconds'],
+                '-' if peak is None else '{:.1f}'.format(peak / 1024.0),
+            ))
+        lines.append('{:<24}{:>8}{:>12.4f}'.format('Total', '', self.seconds))
+        for name, number in sorted(self.counters.items()):
+            lines.append('{:<24}{:>8}'.format(name, number))
+        return '\n'.join(lines)
+
+
+def phase(name):
+    """Return a context that times a phase for every active Stats."""
+    if not _active:
+        return contextlib.nullcontext()
+    stack = contextlib.ExitStack()
+    for stats in _active:
+        stack.enter_context(stats.phase(name))
+    return stack
+
+
+def count(name, number=1):
+    """Add to a counter of every active Stats."""
+    for stats in _active:
+        stats.count(name, number)
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['profiling'])
@@ -0,0 +1,174 @@
+"""
+Rural Postman: walk a few required edges of a larger graph.
+
+Only the required edges must be walked, the rest of the graph may be used to
+get between them. The required edges are split into connected pieces, which
+are joined up along shortest paths by a minimum spanning tree, as in
+Frederickson's heuristic. Then only their odd nodes are paired, through the
+whole graph, as in the Chinese-Postman problem.
+
+The spanning tree is found from a single multi-source Dijkstra search, which
+splits the graph into regions around the nearest piece (Mehlhorn's method).
+Only the odd nodes of the required edges are searched from and paired, so
+the pairing grows with the required part of the graph, not the whole.
+"""
+import logging
+
+from . import dijkstra
+from . import profiling
+from .eularian import DisconnectedGraphError
+from .eularian import add_new_edges
+from .eularian import build_node_pairs
+from .eularian import find_nearest_pairing
+from .eularian import find_pairing
+from .eularian import hierholzer_walk
+from .eularian import solve_node_pairs
+from .network import Graph
+
+log = logging.getLogger(__name__)
+
+
+def required_graph(graph, required):
+    """Return a graph of the required edges of a graph, by key."""
+    edges = graph.edges
+    return Graph([edges[key].contents for key in sorted(set(required))])
+
+
+def required_keys(graph, pairs):
+    """
+    Return the keys of all edges between some (head, tail) pairs of nodes.
+
+    Raises ValueError if there is no edge between a pair.
+    """
+    keys = set()
+    for head, tail in pairs:
+        found = graph.find_edges(head, tail) if head in graph.nodes else {}
+        if not found:
+            raise ValueError('No edge between {} and {}'.format(head, tail))
+        keys.update(found)
+    return keys
+
+
+def find_connections(graph, pieces):
+    """
+    Return the paths of a spanning tree joining pieces of a graph, cheapest first.
+
+    `pieces` are node sets. Every node is labelled with its nearest piece by
+    one search from all of them, and each edge between two labels offers a
+    path between their pieces. Kruskal's algorithm picks among these, which
+    gives a minimum spanning tree of the pieces' shortest distances. Raises
+    DisconnectedGraphError if some pieces can't be reached.
+    """
+    label = {}  # {start node: piece index}
+    for i, nodes in enumerate(pieces):
+        for node in nodes:
+            label.setdefault(node, i)
+    node_costs, previous_nodes = dijkstra.find_costs_from(list(label), graph)
+    for node in node_costs:  # In settled order, so previous nodes come first
+        if node not in label:
+            label[node] = label[previous_nodes[node]]
+
+    offers = []
+    for key, edge in graph.edges.items():
+        head, tail = edge.head, edge.tail
+        if head in node_costs and tail in node_costs and label[head] != label[tail]:
+            cost = node_costs[head] + edge.weight + node_costs[tail]
+            offers.append((cost, key, head, tail))
+    offers.sort()
+
+    parents = list(range(len(pieces)))  # Union-find of joined pieces
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    paths = []
+    for cost, key, head, tail in offers:
+        first, second = find(label[head]), find(label[tail])
+        if first == second:
+            continue
+        parents[first] = second
+        to_head = dijkstra.summarize_path(head, previous_nodes)
+        to_tail = dijkstra.summarize_path(tail, previous_nodes)
+        paths.append(to_head + to_tail[::-1])
+        if len(paths) == len(pieces) - 1:
+            return paths
+    if len(pieces) > 1:
+        raise DisconnectedGraphError(graph.components())
+    return paths
+
+
+def make_eularian(
+    graph, required, start=None, strategy='blossom', backend='auto', workers=None,
+    time_limit=None, nearest=None
+):
+    """
+    Return an Eularian graph walking every required edge of a graph, by key.
+
+    It is made of the required edges, the paths joining them up, and the paths
+    pairing their odd nodes, as edges of the whole graph. If `start` is set,
+    it is joined up too, so the circuit can start there. The odd nodes are
+    paired by `strategy`, among their `nearest` odd nodes if set, as in
+    eularian.make_eularian.
+    """
+    reduced = required_graph(graph, required)
+    pieces = reduced.components()
+    if start is not None and start not in reduced.nodes:
+        pieces.append({start})
+
+    with profiling.phase('connections'):
+        log.info('\tJoining <%s> pieces of required edges', len(pieces))
+        paths = find_connections(graph, pieces)
+        reduced = add_new_edges(reduced, paths, graph)
+
+    if nearest and strategy != 'brute':
+        _, min_route = find_nearest_pairing(
+            reduced.odd_nodes, graph, nearest, strategy, time_limit, workers
+        )
+    else:
+        with profiling.phase('node pairs'):
+            log.info('\tBuilding possible odd node pairs')
+            node_pairs = list(build_node_pairs(reduced))
+            log.info('\t\t(%s pairs)', len(node_pairs))
+
+        with profiling.phase('pair solutions'):
+            log.info('\tFinding pair solutions')
+            pair_solutions = solve_node_pairs(node_pairs, graph, backend, workers)
+
+        with profiling.phase('pairing'):
+            _, min_route = find_pairing(
+                reduced.odd_nodes, node_pairs, pair_solutions, strategy, time_limit
+            )
+
+    with profiling.phase('new edges'):
+        log.info('\tAdding new edges')
+        return add_new_edges(reduced, min_route, graph)
+
+
+def solve(
+    graph, required, start=None, strategy='blossom', backend='auto', workers=None,
+    time_limit=None, nearest=None
+):
+    """
+    Return a circuit walking every required edge of a graph, by key, & its cost.
+
+    The circuit may use any edge of the graph to get between required edges.
+    If `start` is set, the circuit starts there.
+    """
+    if not required:
+        raise ValueError('No edges are required')
+    eularian_graph = make_eularian(
+        graph, required, start, strategy, backend, workers, time_limit, nearest
+    )
+    with profiling.phase('circuit'):
+        route, _ = hierholzer_walk(eularian_graph, start)
+    if len(route) != len(eularian_graph) + 1:
+        raise ValueError('The circuit missed some edges')
+    return route, eularian_graph.total_cost
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['rural'])
@@ -0,0 +1,191 @@
+"""
+A long-lived solver, answering HTTP requests over localhost or a Unix socket.
+
+    GET  /solve?graph=north&start=1&strategy=blossom
+    POST /solve  {"graph": "north", "start": 1}
+    GET  /health
+
+Solved graphs stay warm between requests, see batch.solve_graph, so asking
+for another start on a graph only walks a new circuit. Solving runs in an
+executor, keeping the event loop free to accept requests. Identical requests
+that arrive while one is being solved wait for its answer, rather than
+solving it again.
+"""
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
+from . import batch
+
+log = logging.getLogger(__name__)
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    500: 'Internal Server Error',
+}
+MAX_BODY = 1024 ** 2  # Bytes
+
+
+class SolverServer(object):
+    """Solves jobs in an executor, coalescing identical jobs in flight."""
+
+    def __init__(self, load, workers=None):
+        self.load = load  # As for batch.solve_jobs
+        if workers:  # Each process keeps its own warm graphs
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        else:  # One thread, so the warm graphs here are never shared
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        self.requests = 0
+        self.coalesced = 0
+        self._pending = {}  # {job key: future of its results}
+
+    def close(self):
+        """Shut the executor down."""
+        self.executor.shutdown()
+
+    async def solve(self, job):
+        """Return the result of a job, as batch.solve_group would."""
+        self.requests += 1
+        options = tuple((x, job.get(x)) for x in batch.OPTIONS)
+        key = (job['graph'], options, job['start'])
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self.executor, batch.solve_group, job['graph'], options, [job], self.load
+            )
+            self._pending[key] = future
+            future.add_done_callback(lambda _: self._pending.pop(key, None))
+        else:
+            self.coalesced += 1
+        results = await asyncio.shield(future)  # A dropped client can't cancel it
+        return dict(results[0], id=job['id'])
+
+    async def respond(self, method, target, body):
+        """Return the status & JSON payload answering a request."""
+        url = urlsplit(target)
+        if url.path == '/health':
+            return 200, {
+                'status': 'ok',
+                'requests': self.requests,
+                'coalesced': self.coalesced,
+                'pending': len(self._pending),
+            }
+        if url.path != '/solve':
+            return 404, {'error': 'Not found: {}'.format(url.path)}
+        if method == 'GET':
+            spec = dict(parse_qsl(url.query))
+        elif method == 'POST':
+            spec = json.loads(body.decode('utf-8') or '{}')
+            if not isinstance(spec, dict):
+                raise ValueError('Expected a JSON object')
+        else:
+            return 405, {'error': 'Use GET or POST'}
+        if 'graph' not in spec:
+            raise ValueError('No graph given')
+        job = batch.check_options(spec)
+        job.update(id=spec.get('id'), graph=spec['graph'], start=spec.get('start'))
+        result = await self.solve(job)
+        return (400 if 'error' in result else 200), result
+
+    async def handle(self, reader, writer):
+        """Answer HTTP/1.1 requests on a connection, until it's closed."""
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    status, payload = await self.respond(method, target, body)
+                except ValueError as error:  # Includes bad JSON
+                    status, payload = 400, {'error': str(error)}
+                except Exception as error:  # Answer, rather than drop the connection
+                    log.exception('%s %s failed', method, target)
+                    status, payload = 500, {'error': '{}: {}'.format(
+                        type(error).__name__, error
+                    )}
+                log.info('%s %s %s', method, target, status)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError) as error:
+            await write_response(writer, 400, {'error': str(error)}, False)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8080, path=None):
+        """Serve forever, on a localhost port, or a Unix socket if `path` is set."""
+        if path:
+            server = await asyncio.start_unix_server(self.handle, path=path)
+            log.info('Serving on %s', path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+            log.info('Serving on http://%s:%s', host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def served_path(directory, name):
+    """
+    Return the path of a graph file named by a request, or None.
+
+    Only files under `directory` are served, so a request can't name any
+    other file on the machine. There are none without a directory.
+    """
+    if directory is None or not isinstance(name, str):
+        return None
+    root = os.path.realpath(directory)
+    path = os.path.realpath(os.path.join(root, name))
+    if not path.startswith(os.path.join(root, '')) or not os.path.isfile(path):
+        return None
+    return path
+
+
+async def read_request(reader):
+    """Return the method, target, {header: value} & body of a request, or None."""
+    line = await reader.readline()
+    if not line:
+        return None  # Closed
+    method, target, _ = line.decode('latin-1').split(' ', 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    if length > MAX_BODY:
+        raise ValueError('Request body too large')
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, headers, body
+
+
+async def write_response(writer, status, payload, keep_alive=True):
+    """Write a JSON response."""
+    body = json.dumps(payload).encode('utf-8')
+    head = (
+        'HTTP/1.1 {} {}\r\n'
+        'Content-Type: application/json\r\n'
+        'Content-Length: {}\r\n'
+        'Connection: {}\r\n\r\n'
+    ).format(status, REASONS[status], len(body), 'keep-alive' if keep_alive else 'close')
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['server'])
@@ -0,0 +1,125 @@
+"""
+Vectorised shortest paths between odd nodes, using SciPy's sparse graphs.
+
+The graph is exported to a CSR matrix and all odd node searches are run in a
+single call to scipy.sparse.csgraph.dijkstra. NumPy and SciPy are optional:
+check AVAILABLE before use, eularian falls back to pure Python without them.
+"""
+try:
+    import numpy
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+except ImportError:  # Optional dependencies
+    numpy = None
+
+from . import dijkstra
+from . import profiling
+from .network import EdgeStore
+
+AVAILABLE = numpy is not None
+
+
+def edge_columns(graph):
+    """
+    Return head, tail & weight NumPy arrays of all edges in a graph.
+
+    Weights stay integers if they all are.
+    """
+    store = graph.edges
+    if isinstance(store, EdgeStore):  # Share the columns, no Edge objects
+        alive = numpy.frombuffer(store.alive, dtype=numpy.uint8).astype(bool)
+        heads = numpy.frombuffer(store.heads, dtype=numpy.int64)[alive]
+        tails = numpy.frombuffer(store.tails, dtype=numpy.int64)[alive]
+        weights = numpy.frombuffer(store.weights, dtype=store.weight_typecode)[alive]
+    else:  # e.g. a GraphView
+        edges = list(store.values())
+        heads = numpy.array([x.head for x in edges], dtype=numpy.int64)
+        tails = numpy.array([x.tail for x in edges], dtype=numpy.int64)
+        weights = numpy.array([x.weight for x in edges])
+    return heads, tails, weights
+
+
+def to_csr(graph):
+    """
+    Return a CSR adjacency matrix of a graph, and its array of node names.
+
+    Matrix indices are positions in the node array. Only the cheapest of any
+    parallel edges is kept, and self-loops are dropped. Edges are stored once,
+    in the upper triangle, so the matrix must be searched as undirected.
+    """
+    heads, tails, weights = edge_columns(graph)
+    nodes, ends = numpy.unique(numpy.concatenate((heads, tails)), return_inverse=True)
+    heads, tails = ends[:len(heads)], ends[len(heads):]
+    rows, cols = numpy.minimum(heads, tails), numpy.maximum(heads, tails)
+
+    keep = rows != cols  # No self-loops
+    rows, cols, weights = rows[keep], cols[keep], weights[keep]
+    order = numpy.lexsort((weights, cols, rows))  # Cheapest parallel edge first
+    rows, cols, weights = rows[order], cols[order], weights[order]
+    first = numpy.ones(len(rows), dtype=bool)
+    first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+
+    size = len(nodes)
+    matrix = csr_matrix((weights[first], (rows[first], cols[first])), shape=(size, size))
+    return matrix, nodes
+
+
+class PredecessorRow(object):
+    """A {node: previous node} view of one row of csgraph predecessors."""
+
+    def __init__(self, predecessors, nodes, index):
+        self.predecessors = predecessors
+        self.nodes = nodes
+        self.index = index  # {node: position in nodes}
+
+    def get(self, node):
+        """Return the previous node, or None at the start."""
+        prev = self.predecessors[self.index[node]]
+        if prev < 0:  # csgraph marks the start with a negative value
+            return None
+        return int(self.nodes[prev])
+
+
+def find_node_pair_solutions(node_pairs, graph):
+    """
+    Return path and cost for all node pairs, like eularian's pure Python version.
+
+    Runs one multi-source Dijkstra over the CSR matrix, from every first node.
+    Returns a dijkstra.PairSolutions.
+    """
+    searches = dijkstra.group_searches(node_pairs)
+    if not searches:
+        return dijkstra.PairSolutions()
+
+    matrix, nodes = to_csr(graph)
+    integer = matrix.dtype.kind in 'iu'  # Report integer costs like the Python search
+    index = {int(node): i for i, node in enumerate(nodes)}
+    starts = list(searches)
+    profiling.count('dijkstra runs', len(starts))
+    costs, predecessors = csgraph_dijkstra(
+        matrix,
+        directed=False,
+        indices=[index[start] for start in starts],
+        return_predecessors=True,
+    )
+
+    node_pair_solutions = dijkstra.PairSolutions()
+    for row, start in enumerate(starts):
+        end_costs = {}
+        for end in searches[start]:
+            cost = costs[row, index[end]]
+            if numpy.isinf(cost):  # Unreachable
+                end_costs[end] = float('inf')
+            else:
+                end_costs[end] = int(cost) if integer else cost.item()
+        reached = [end for end, cost in end_costs.items() if cost != float('inf')]
+        # Keep only the paths we need, so the predecessor matrix can be freed
+        predecessor_row = PredecessorRow(predecessors[row], nodes, index)
+        tree = dijkstra.prune_tree(reached, predecessor_row)
+        node_pair_solutions.add(start, end_costs, tree)
+    return node_pair_solutions
+
+
+if __name__ == '__main__':
+    import tests.run_tests
+    tests.run_tests.run(['sparse'])
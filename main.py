@@ -7,48 +7,372 @@ required to complete an Eularian circuit.
 
 """
 import argparse
+import asyncio
+import csv
+import functools
+import json
+import logging
+import os
 import sys
 
 import data.data
-from chinesepostman import eularian, network
+from chinesepostman import batch, binary, cache, contract, directed, edgelist, eularian
+from chinesepostman import network, profiling, rural, server, sparse
+
+
+def positive_int(text):
+    """Return a command line value as an int of at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError('must be a whole number, at least 1')
+    return value
 
 
 def setup_args():
     """Setup argparse to take graph name argument."""
     parser = argparse.ArgumentParser(description='Find an Eularian Cicruit.')
-    parser.add_argument('graph', nargs='?', help='Name of graph to load')
+    parser.add_argument(
+        'graph',
+        nargs='?',
+        help='Name of graph to load, or a binary graph, CSV or TSV file'
+    )
     parser.add_argument(
         'start',
         nargs='?',
-        type=int,
         help='The staring node. Random if none provided.'
     )
+    parser.add_argument(
+        '--strategy',
+        choices=eularian.PAIRING_STRATEGIES,
+        default='blossom',
+        help='How to pair odd nodes. "brute" tries every pair set, "anytime" is quick.'
+    )
+    parser.add_argument(
+        '--time-limit',
+        type=float,
+        default=None,
+        help='Seconds to spend improving an "anytime" pairing. Until done if none.'
+    )
+    parser.add_argument(
+        '--nearest',
+        type=positive_int,
+        metavar='K',
+        default=None,
+        help='Only pair each odd node with its K nearest odd nodes.'
+    )
+    parser.add_argument(
+        '--method',
+        choices=eularian.CIRCUIT_METHODS,
+        default='hierholzer',
+        help='How to walk the circuit. "fleury" makes random choices.'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=eularian.PATH_BACKENDS,
+        default='auto',
+        help='Shortest path solver. "auto" uses SciPy if installed.'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of processes for the Python shortest path solver, or batch jobs.'
+    )
+    parser.add_argument(
+        '--contract',
+        action='store_true',
+        help='Peel dead-end trees & contract chains of nodes before solving.'
+    )
+    parser.add_argument(
+        '--required',
+        metavar='FILE',
+        help='CSV file of "start node,end node" rows. Only walk these edges.'
+    )
+    parser.add_argument(
+        '--cache',
+        metavar='FILE',
+        help='SQLite file to keep shortest paths in, between runs.'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=256,
+        help='Maximum size of the shortest path cache, in MB.'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print the time & peak memory of each phase, and solver counters.'
+    )
+    parser.add_argument(
+        '--stats-json',
+        metavar='FILE',
+        help='Write phase timings & solver counters to a JSON file.'
+    )
+    parser.add_argument(
+        '--batch',
+        metavar='MANIFEST',
+        help='Solve the jobs in a JSON lines manifest, instead of one graph.'
+    )
+    parser.add_argument(
+        '--out',
+        metavar='FILE',
+        help='Write batch results to a JSON lines file, instead of stdout.'
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run a solver server, answering HTTP requests, instead of one graph.'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Address to serve on.')
+    parser.add_argument('--port', type=int, default=8080, help='Port to serve on.')
+    parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        help='Serve on a Unix socket, instead of a port.'
+    )
+    parser.add_argument(
+        '--graph-dir',
+        metavar='DIR',
+        help='Directory of graph files to serve. Only built-in graphs if none.'
+    )
+    parser.add_argument(
+        '--dedupe',
+        action='store_true',
+        help='Skip repeated rows of a CSV or TSV file. Holds every edge in memory.'
+    )
+    parser.add_argument(
+        '--save',
+        metavar='FILE',
+        help='Write the graph to a binary graph file, before solving it.'
+    )
     args = parser.parse_args()
+    if args.backend == 'scipy' and not sparse.AVAILABLE:
+        parser.error('The scipy backend requires NumPy and SciPy')
     return args
 
 
+def read_graph(graph_name, progress=None, dedupe=False):
+    """
+    Return a built-in graph by name, or the graph in a file, & its node names.
+
+    Node names are only returned for CSV and TSV files, else None. Raises
+    ValueError if there's no such graph.
+    """
+    if graph_name and os.path.isfile(graph_name):
+        if binary.is_graph_file(graph_name):
+            return binary.read_graph(graph_name), None
+        graph, node_ids, stats = edgelist.load_edge_list(
+            graph_name,
+            columns=(0, 1, 2, 3),  # An optional 4th column flags one-way edges
+            dedupe=dedupe,
+            progress=progress,
+        )
+        if progress is not None:
+            progress(stats)  # Final counts
+        return graph, node_ids
+    return read_builtin_graph(graph_name)
+
+
+def read_builtin_graph(graph_name):
+    """Return a built-in graph by name, & None. Raises ValueError if there's none."""
+    available = [x for x in dir(data.data) if not x.startswith('__')]
+    if graph_name not in available:
+        raise ValueError(
+            'Invalid graph name.'
+            ' Available graphs:\n\t{}'.format('\n\t'.join(available))
+        )
+    return network.Graph(getattr(data.data, graph_name)), None
+
+
+def read_served_graph(graph_dir, graph_name):
+    """
+    Return a graph for the server, as read_graph, or raise ValueError.
+
+    Only built-in graphs & files under `graph_dir` can be read. Errors in a
+    file are logged, but not sent back, as they may quote its contents.
+    """
+    path = server.served_path(graph_dir, graph_name)
+    if path is None:
+        return read_builtin_graph(graph_name)
+    try:
+        return read_graph(path)
+    except (IOError, OSError, ValueError) as error:
+        logging.warning('Failed to read %s: %s', path, error)
+        raise ValueError('Invalid graph file: {}'.format(graph_name))
+
+
+def load_graph(graph_name, dedupe=False):
+    """Return a graph & its node names, as read_graph, or exit if it's invalid."""
+    try:
+        return read_graph(graph_name, lambda stats: print('\t{}'.format(stats)), dedupe)
+    except ValueError as error:
+        print('\n{}\n'.format(error))
+        sys.exit()
+
+
+def read_start(start, graph, node_ids):
+    """Return the start node given by name, or None. Raises ValueError if unknown."""
+    if start is None:
+        return None
+    node = node_ids.ids.get(start) if node_ids is not None else start
+    if node_ids is None and start.lstrip('-').isdigit():
+        node = int(start)
+    if node not in graph.nodes:
+        raise ValueError('Unknown start node: {}'.format(start))
+    return node
+
+
+def load_required(path, graph, node_ids):
+    """Return the keys of the edges listed in a CSV file of node pairs."""
+    names = int if node_ids is None else node_ids.ids.get
+    pairs = []
+    with edgelist.open_text(path) as f:
+        for row in csv.reader(f):
+            if row and not row[0].startswith('#'):
+                pairs.append((names(row[0].strip()), names(row[1].strip())))
+    return rural.required_keys(graph, pairs)
+
+
+def solve_batch(args):
+    """Solve the jobs of a manifest, writing results as JSON lines."""
+    with open(args.batch) as f:
+        jobs = batch.read_manifest(f)
+    out = open(args.out, 'w') if args.out else sys.stdout
+    try:
+        for result in batch.solve_jobs(jobs, read_graph, args.workers):
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
 def main():
     """Make it so."""
-    edges = None
     args = setup_args()
+    if args.batch:
+        logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+        solve_batch(args)
+        return
+    if args.serve:
+        logging.basicConfig(level=logging.WARNING, format='%(message)s')
+        server.log.setLevel(logging.INFO)  # Requests, but not every solve
+        load = functools.partial(read_served_graph, args.graph_dir)  # Picklable
+        solver = server.SolverServer(load, args.workers)
+        try:
+            asyncio.run(solver.serve(args.host, args.port, args.socket))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            solver.close()
+        return
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    stats = profiling.Stats(memory=args.profile)
+    with stats:
+        solve(args)
+    if args.profile:
+        print('Profile:')
+        print(stats.report())
+    if args.stats_json:
+        with open(args.stats_json, 'w') as f:
+            json.dump(stats.as_dict(), f, indent=2)
+
+
+def solve(args):
+    """Load, solve & print the graph given on the command line."""
     graph_name = args.graph
+    print('Loading graph: {}'.format(graph_name))
+    with profiling.phase('load'):
+        original_graph, node_ids = load_graph(graph_name, args.dedupe)
     try:
-        print('Loading graph: {}'.format(graph_name))
-        edges = getattr(data.data, graph_name)
-    except (AttributeError, TypeError):
-        available = [x for x in dir(data.data) if not x.startswith('__')]
-        print(
-            '\nInvalid graph name.'
-            ' Available graphs:\n\t{}\n'.format('\n\t'.join(available))
-        )
-        sys.exit()
-
-    original_graph = network.Graph(edges)
+        start = read_start(args.start, original_graph, node_ids)
+    except ValueError as error:
+        print('\n{}\n'.format(error))
+        return
+    if args.save:
+        binary.write_graph(original_graph, args.save)
+    path_cache = None
+    if args.cache:
+        path_cache = cache.PathCache(args.cache, args.cache_size * 1024 ** 2)
 
     print('<{}> edges'.format(len(original_graph)))
+    if args.required:
+        print('Solving required edges only...')
+        try:
+            required = load_required(args.required, original_graph, node_ids)
+            route, cost = rural.solve(
+                original_graph, required, start, args.strategy, args.backend,
+                args.workers, args.time_limit, args.nearest
+            )
+        except (IndexError, ValueError) as error:
+            print('\n{}\n'.format(error))
+            return
+        print('\t<{}> required edges, total cost is {}'.format(len(required), cost))
+        if node_ids is not None:
+            route = [node_ids.names[x] for x in route]
+        print('Solution: (<{}> edges)'.format(len(route) - 1))
+        print('\t{}'.format(route))
+        return
+
+    if directed.has_one_way_edges(original_graph):
+        print('Solving graph with one-way edges...')
+        try:
+            route, cost = directed.solve(
+                original_graph, start, args.strategy, args.backend, args.time_limit,
+                args.nearest
+            )
+        except ValueError as error:
+            print('\n{}\n'.format(error))
+            return
+        print('\tTotal cost is {}'.format(cost))
+        if node_ids is not None:
+            route = [node_ids.names[x] for x in route]
+        print('Solution: (<{}> edges)'.format(len(route) - 1))
+        print('\t{}'.format(route))
+        return
+
+    components = original_graph.components()
+    if len(components) > 1:
+        print('Graph has <{}> components, solving each'.format(len(components)))
+        try:
+            results = eularian.solve_components(
+                original_graph, start, args.strategy, args.method, args.backend,
+                args.workers, path_cache, args.time_limit, args.nearest, args.contract
+            )
+        except ValueError as error:
+            print('\n{}\n'.format(error))
+            return
+        for i, (route, cost) in enumerate(results, 1):
+            if node_ids is not None:
+                route = [node_ids.names[x] for x in route]
+            print('Component {}: (<{}> edges, cost {})'.format(i, len(route) - 1, cost))
+            print('\t{}'.format(route))
+        print('Total cost is {}'.format(sum(cost for _, cost in results)))
+        return
+
+    if args.contract:
+        print('Solving contracted graph...')
+        route, cost = contract.solve(
+            original_graph, start, args.strategy, args.backend, args.workers,
+            path_cache, args.time_limit, args.nearest
+        )
+        print('\tTotal cost is {}'.format(cost))
+        if node_ids is not None:
+            route = [node_ids.names[x] for x in route]
+        print('Solution: (<{}> edges)'.format(len(route) - 1))
+        print('\t{}'.format(route))
+        return
+
     if not original_graph.is_eularian:
         print('Converting to Eularian path...')
-        graph, num_dead_ends = eularian.make_eularian(original_graph)
+        graph, num_dead_ends = eularian.make_eularian(
+            original_graph, args.strategy, args.backend, args.workers, path_cache,
+            args.time_limit, args.nearest
+        )
         print('Conversion complete')
         print('\tAdded {} edges'.format(len(graph) - len(original_graph) + num_dead_ends))
         print('\tTotal cost is {}'.format(graph.total_cost))
@@ -56,12 +380,14 @@ def main():
         graph = original_graph
 
     print('Attempting to solve Eularian Circuit...')
-    route, attempts = eularian.eularian_path(graph, args.start)
+    route, attempts = eularian.eularian_path(graph, start, method=args.method)
     if not route:
         print('\tGave up after <{}> attempts.'.format(attempts))
     else:
         print('\tSolved in <{}> attempts'.format(attempts))
         print('Solution: (<{}> edges)'.format(len(route) - 1))
+        if node_ids is not None:
+            route = [node_ids.names[x] for x in route]
         print('\t{}'.format(route))
 
 
@@ -23,5 +23,8 @@ setup(
     author='Mitch LeBlanc',
     author_email='supermitch@gmail.com',
     packages=['chinesepostman'],
+    extras_require={
+        'scipy': ['numpy', 'scipy'],  # Vectorised shortest paths
+    },
     license='MIT',
 )
@@ -0,0 +1,131 @@
+import unittest
+
+from chinesepostman import batch
+from chinesepostman import eularian
+from chinesepostman.edgelist import NodeIds
+from chinesepostman.network import Graph
+
+GRAPHS = {
+    'square': [(1, 2, 1), (2, 3, 1), (3, 4, 1), (4, 1, 1)],
+    'kite': [(1, 2, 1), (2, 3, 1), (3, 4, 1), (4, 1, 1), (1, 3, 3)],
+    'one-way': [(1, 2, 1, True), (2, 3, 1, True), (3, 1, 1, True), (1, 3, 1, True)],
+    'split': [(1, 2, 1), (3, 4, 1)],
+}
+loads = []
+
+
+def load(name):
+    """Load a test graph, with named nodes if it ends in '!'."""
+    loads.append(name)
+    if name.endswith('!'):
+        node_ids = NodeIds()
+        edges = [(node_ids(str(h)), node_ids(str(t)), w) for h, t, w in GRAPHS['kite']]
+        return Graph(edges), node_ids
+    if name == 'broken':
+        raise KeyError('broken')  # Not an error solving is expected to raise
+    if name not in GRAPHS:
+        raise ValueError('No graph named {}'.format(name))
+    return Graph(GRAPHS[name]), None
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        batch._solved.clear()
+        del loads[:]
+
+    def solve(self, lines, workers=None):
+        jobs = batch.read_manifest(lines)
+        return {x['id']: x for x in batch.solve_jobs(jobs, load, workers)}
+
+    def test_read_manifest(self):
+        jobs = batch.read_manifest([
+            '{"id": "a", "graph": "kite", "start": 1, "strategy": "brute"}',
+            '',
+            '# A comment',
+            '{"graph": "square", "starts": [1, 2]}',
+        ])
+        self.assertEqual(
+            [('a', 'kite', 1), ('4:0', 'square', 1), ('4:1', 'square', 2)],
+            [(x['id'], x['graph'], x['start']) for x in jobs],
+        )
+        self.assertEqual('brute', jobs[0]['strategy'])
+        self.assertRaises(ValueError, batch.read_manifest, ['{"start": 1}'])
+        self.assertRaises(ValueError, batch.read_manifest, ['not json'])
+
+    def test_group_jobs(self):
+        jobs = batch.read_manifest([
+            '{"graph": "kite", "starts": [1, 2, 3]}',
+            '{"graph": "kite", "start": 4, "strategy": "brute"}',
+            '{"graph": "kite", "start": 4}',
+        ])
+        groups = batch.group_jobs(jobs)
+        self.assertEqual([4, 1], [len(x) for x in groups.values()])
+
+    def test_starts_share_a_solution(self):
+        results = self.solve(['{"id": "k", "graph": "kite", "starts": [1, 2, 3, 4]}'])
+        self.assertEqual(['kite'], loads)  # Loaded & solved once
+        _, expected = eularian.solve_component(Graph(GRAPHS['kite']))
+        for i, start in enumerate([1, 2, 3, 4]):
+            result = results['k:{}'.format(i)]
+            self.assertEqual(expected, result['cost'])
+            self.assertEqual(start, result['route'][0])
+            self.assertEqual(start, result['route'][-1])
+            self.assertEqual(result['edges'], len(result['route']) - 1)
+
+    def test_reuse_across_batches(self):
+        self.solve(['{"graph": "kite", "start": 1}'])
+        self.solve(['{"graph": "kite", "start": 2}'])
+        self.assertEqual(['kite'], loads)
+        self.assertEqual(5, len(Graph(GRAPHS['kite'])))  # Not changed by solving
+
+    def test_errors(self):
+        results = self.solve([
+            '{"id": "missing", "graph": "nope"}',
+            '{"id": "split", "graph": "split"}',
+            '{"id": "start", "graph": "square", "start": 9}',
+        ])
+        self.assertEqual('No graph named nope', results['missing']['error'])
+        self.assertIn('disconnected', results['split']['error'])
+        self.assertEqual('Unknown start node', results['start']['error'])
+
+    def test_invalid_options(self):
+        results = self.solve([
+            '{"id": "nearest", "graph": "square", "nearest": [2]}',
+            '{"id": "strategy", "graph": "square", "strategy": "psychic"}',
+            '{"id": "time", "graph": "square", "time_limit": "soon"}',
+            '{"id": "start", "graph": "square", "start": [1]}',
+            '{"id": "graph", "graph": ["square"]}',
+            '{"id": "ok", "graph": "square", "nearest": "2", "time_limit": 1}',
+        ])
+        self.assertEqual('nearest must be a number', results['nearest']['error'])
+        self.assertEqual('Unknown strategy: psychic', results['strategy']['error'])
+        self.assertEqual('time_limit must be a number', results['time']['error'])
+        self.assertIn('Start must be', results['start']['error'])
+        self.assertIn('Graph must be', results['graph']['error'])
+        self.assertEqual(4, results['ok']['cost'])
+        self.assertEqual(['square'], loads)
+
+    def test_unexpected_error(self):
+        """Only the broken group fails."""
+        results = self.solve([
+            '{"id": "broken", "graph": "broken"}',
+            '{"id": "ok", "graph": "square"}',
+        ])
+        self.assertEqual("KeyError: 'broken'", results['broken']['error'])
+        self.assertEqual(4, results['ok']['cost'])
+
+    def test_named_and_one_way(self):
+        results = self.solve([
+            '{"id": "named", "graph": "kite!", "start": "3"}',
+            '{"id": "one-way", "graph": "one-way", "start": "2"}',
+        ])
+        self.assertEqual('3', results['named']['route'][0])
+        self.assertEqual(9, results['named']['cost'])
+        self.assertEqual([2, 3, 1, 3, 1, 2], results['one-way']['route'])
+
+    def test_workers(self):
+        lines = ['{{"id": "{0}", "graph": "{0}", "start": 1}}'.format(x) for x in GRAPHS]
+        results = self.solve(lines, workers=2)
+        self.assertEqual(set(GRAPHS), set(results))
+        self.assertEqual(4, results['square']['cost'])
@@ -0,0 +1,61 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks import bench
+
+
+class TestBench(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_run_case(self):
+        case = bench.run_case('grid', 100, backend='python', repeat=2)
+        self.assertEqual(112, case['edges'])
+        self.assertEqual(24, case['odd_nodes'])
+        self.assertEqual(
+            ['pair solutions', 'pairing', 'circuit'], list(case['seconds'])[:3]
+        )
+        self.assertIn('total', case['seconds'])
+        self.assertEqual(1, case['counters']['matchings'])
+
+    def test_max_pairs(self):
+        case = bench.run_case('grid', 100, max_pairs=100)
+        self.assertIn('skipped', case)
+        self.assertNotIn('seconds', case)
+
+    def test_max_seconds(self):
+        results = bench.run(['odd'], [100, 200], backend='python', max_seconds=0)
+        first, second = results['cases']
+        self.assertIn('seconds', first)
+        self.assertIn('skipped', second)
+
+    def test_compare(self):
+        def results(seconds):
+            case = {'generator': 'grid', 'size': 100, 'seed': 0, 'seconds': seconds}
+            return {'cases': [case, {'generator': 'odd', 'size': 100, 'seed': 0}]}
+
+        old = results({'pairing': 1.0, 'circuit': 0.001, 'total': 1.0})
+        new = results({'pairing': 2.0, 'circuit': 0.002, 'total': 1.1})
+        rows = bench.compare(old, new, threshold=1.25, min_seconds=0.005)
+        regressed = [(case, stage) for case, stage, _, _, _, x in rows if x]
+        self.assertEqual([('grid/100/0', 'pairing')], regressed)
+
+    def test_main(self):
+        old = os.path.join(self.directory, 'old.json')
+        new = os.path.join(self.directory, 'new.json')
+        argv = ['run', '--generators', 'odd', '--sizes', '100', '--backend', 'python']
+        self.assertEqual(0, bench.main(argv + ['--out', old]))
+        with open(old) as f:
+            results = json.load(f)
+        results['cases'][0]['seconds']['pairing'] += 1.0
+        with open(new, 'w') as f:
+            json.dump(results, f)
+        self.assertEqual(0, bench.main(['compare', old, old]))
+        self.assertEqual(1, bench.main(['compare', old, new]))
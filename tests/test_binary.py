@@ -0,0 +1,64 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from chinesepostman import binary, eularian
+from chinesepostman.network import Graph
+
+
+class TestBinary(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'graph.cpg')
+        self.edges = [(1, 2, 4), (1, 4, 4), (2, 4, 1), (2, 3, 4), (3, 4, 4, True)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        binary.write_graph(Graph(self.edges), self.path)
+        self.assertTrue(binary.is_graph_file(self.path))
+        graph = binary.read_graph(self.path)
+        self.assertEqual(self.edges, graph.all_edges)
+        self.assertEqual([2, 4], graph.odd_nodes)
+        self.assertEqual(25 * 5 + binary.HEADER.size, os.path.getsize(self.path))
+
+    def test_float_weights(self):
+        binary.write_graph(Graph([(1, 2, 1.5), (2, 3, 2)]), self.path)
+        graph = binary.read_graph(self.path)
+        self.assertEqual(3.5, graph.total_cost)
+        self.assertEqual('d', graph.edges.weight_typecode)
+
+    def test_removed_edges_skipped(self):
+        graph = Graph(self.edges)
+        graph.remove_edge(2, 4, 1)
+        binary.write_graph(graph, self.path)
+        self.assertEqual(4, len(binary.read_graph(self.path)))
+
+    def test_memory_mapped_graph_can_change(self):
+        binary.write_graph(Graph(self.edges), self.path)
+        graph = binary.read_graph(self.path)
+        graph.remove_edge(1, 2, 4)
+        graph.add_edge(1, 3, 2.5)
+        self.assertEqual((1, 3, 2.5), graph.edges[5])
+        self.assertEqual(15.5, graph.total_cost)
+        new_graph, _ = eularian.make_eularian(binary.read_graph(self.path))
+        self.assertEqual(18, new_graph.total_cost)
+
+    def test_pickle(self):
+        binary.write_graph(Graph(self.edges), self.path)
+        graph = pickle.loads(pickle.dumps(binary.read_graph(self.path)))
+        self.assertEqual(self.edges, graph.all_edges)
+
+    def test_not_a_graph_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'(1, 2, 3)\n')
+        self.assertFalse(binary.is_graph_file(self.path))
+        self.assertRaises(ValueError, binary.read_graph, self.path)
+
+    def test_empty(self):
+        binary.write_graph(Graph(), self.path)
+        self.assertEqual(0, len(binary.read_graph(self.path)))
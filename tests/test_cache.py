@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from chinesepostman import cache, eularian
+from chinesepostman.network import Graph
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path_cache = cache.PathCache(os.path.join(self.directory, 'paths.db'))
+        # Non-eularian w/ 6 odd nodes
+        self.edges = [
+            (1, 2, 8), (1, 5, 4), (1, 8, 3), (2, 3, 9), (2, 7, 6), (3, 4, 5),
+            (3, 6, 3), (4, 5, 5), (4, 6, 1), (5, 6, 2), (5, 7, 3), (7, 8, 1),
+        ]
+
+    def tearDown(self):
+        self.path_cache.close()
+        shutil.rmtree(self.directory)
+
+    def solve(self, graph):
+        node_pairs = eularian.build_node_pairs(graph)
+        return node_pairs, eularian.find_node_pair_solutions(node_pairs, graph)
+
+    def test_fingerprint_ignores_order(self):
+        self.assertEqual(
+            cache.fingerprint(Graph(self.edges)),
+            cache.fingerprint(Graph(self.edges[::-1])),
+        )
+
+    def test_fingerprint_changes(self):
+        key = cache.fingerprint(Graph(self.edges))
+        self.assertNotEqual(key, cache.fingerprint(Graph(self.edges[1:])))
+        reweighted = [(1, 2, 7)] + self.edges[1:]
+        self.assertNotEqual(key, cache.fingerprint(Graph(reweighted)))
+        floats = [(1, 2, 8.0)] + self.edges[1:]
+        self.assertNotEqual(key, cache.fingerprint(Graph(floats)))
+
+    def test_round_trip(self):
+        graph = Graph(self.edges)
+        node_pairs, solutions = self.solve(graph)
+        key = cache.fingerprint(graph)
+        self.assertIsNone(self.path_cache.get(key))
+        self.path_cache.put(key, solutions)
+        self.assertEqual(solutions, self.path_cache.get(key, node_pairs))
+
+    def test_missing_pairs(self):
+        graph = Graph(self.edges)
+        _, solutions = self.solve(graph)
+        key = cache.fingerprint(graph)
+        self.path_cache.put(key, solutions)
+        self.assertIsNone(self.path_cache.get(key, [(1, 9)]))
+
+    def test_lru_eviction(self):
+        graph = Graph(self.edges)
+        _, solutions = self.solve(graph)
+        self.path_cache.put('a', solutions)
+        self.path_cache.put('b', solutions)
+        self.path_cache.get('a')  # 'b' is now the least recently used
+        size = self.path_cache._db.execute('SELECT size FROM tables').fetchone()[0]
+        self.path_cache.max_bytes = 2 * size
+        self.path_cache.put('c', solutions)
+        self.assertEqual(2, len(self.path_cache))
+        self.assertIsNone(self.path_cache.get('b'))
+        self.assertIsNotNone(self.path_cache.get('a'))
+
+    def test_make_eularian_uses_cache(self):
+        first, _ = eularian.make_eularian(Graph(self.edges), cache=self.path_cache)
+        self.assertEqual(1, len(self.path_cache))
+        second, _ = eularian.make_eularian(Graph(self.edges), cache=self.path_cache)
+        self.assertEqual(1, len(self.path_cache))
+        self.assertEqual(first.total_cost, second.total_cost)
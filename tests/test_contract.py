@@ -0,0 +1,56 @@
+import unittest
+
+from chinesepostman import contract, eularian
+from chinesepostman.network import Graph
+
+
+class TestContract(unittest.TestCase):
+
+    def setUp(self):
+        # A square 1-2-3-4, with a chain 1-5-6-3 across it, and a tree off 2
+        self.graph = Graph([
+            (1, 2, 1), (2, 3, 1), (3, 4, 1), (4, 1, 1),
+            (1, 5, 2), (5, 6, 2), (6, 3, 2),
+            (2, 7, 3), (7, 8, 1), (7, 9, 1),
+        ])
+
+    def test_peel_trees(self):
+        contraction = contract.Contraction(self.graph)
+        self.assertEqual(10, contraction.tree_cost)
+        self.assertEqual({1, 3}, contraction.reduced.nodes)
+
+    def test_contract_chains(self):
+        contraction = contract.Contraction(self.graph)
+        reduced = contraction.reduced
+        edges = [edge.contents[:3] for edge in reduced.all_edges]
+        self.assertCountEqual([(1, 3, 2), (1, 3, 2), (1, 3, 6)], edges)
+        self.assertCountEqual([[2], [4], [5, 6]], contraction.chains)
+
+    def test_contract_cycle(self):
+        """A plain cycle keeps one inner node, rather than becoming a self-loop."""
+        contraction = contract.Contraction(Graph([(1, 2, 1), (2, 3, 1), (3, 1, 1)]))
+        self.assertEqual([(1, 2, 1), (2, 1, 2)], contraction.reduced.all_edges)
+
+    def test_solve(self):
+        circuit, cost = contract.solve(self.graph, 8)
+        edges = [edge.contents for edge in self.graph.all_edges]
+        expected, _ = eularian.make_eularian(Graph(edges))
+        self.assertEqual(expected.total_cost, cost)
+        self.assertEqual((8, 8), (circuit[0], circuit[-1]))
+        self.assertEqual(set(self.graph.nodes), set(circuit))
+
+    def test_solve_options(self):
+        """Pairing options reach make_eularian."""
+        circuit, cost = contract.solve(self.graph, 8, 'anytime', 'python', nearest=1)
+        self.assertEqual((8, 8), (circuit[0], circuit[-1]))
+        self.assertEqual(set(self.graph.nodes), set(circuit))
+        self.assertRaises(ValueError, contract.solve, self.graph, nearest=0)
+
+    def test_solve_tree(self):
+        circuit, cost = contract.solve(Graph([(1, 2, 1), (2, 3, 2), (2, 4, 3)]))
+        self.assertIn(circuit, ([1, 2, 3, 2, 4, 2, 1], [1, 2, 4, 2, 3, 2, 1]))
+        self.assertEqual(12, cost)
+
+    def test_disconnected(self):
+        graph = Graph([(1, 2, 1), (3, 4, 1)])
+        self.assertRaises(eularian.DisconnectedGraphError, contract.solve, graph)
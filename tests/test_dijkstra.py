@@ -16,3 +16,111 @@ class TestDijkstra(unittest.TestCase):
         cost, route = di.find_cost(path, graph)
         expected = (2, [1, 2, 3])
         self.assertEqual(expected, (cost, route))
+
+    def test_find_cost_unreachable(self):
+        graph = network.Graph([(1, 2, 1), (3, 4, 1)])
+        self.assertEqual((float('inf'), []), di.find_cost((1, 4), graph))
+
+    def test_find_costs_all(self):
+        graph = network.Graph([(1, 2, 1), (2, 3, 1), (3, 4, 5), (4, 1, 5)])
+        costs, previous = di.find_costs(1, graph)
+        self.assertEqual({1: 0, 2: 1, 3: 2, 4: 5}, costs)
+        self.assertEqual([1, 2, 3], di.summarize_path(3, previous))
+
+    def test_find_costs_targets(self):
+        graph = network.Graph([(1, 2, 1), (2, 3, 1), (3, 4, 5), (4, 1, 5)])
+        costs, previous = di.find_costs(1, graph, [2])
+        self.assertEqual(1, costs[2])
+        self.assertNotIn(4, costs)  # Stopped before settling the far side
+
+    def test_find_costs_max_cost(self):
+        graph = network.Graph([(1, 2, 1), (2, 3, 1), (3, 4, 5), (4, 1, 5)])
+        costs, _ = di.find_costs(1, graph, max_cost=2)
+        self.assertEqual({1: 0, 2: 1, 3: 2}, costs)
+
+    def test_find_costs_from(self):
+        graph = network.Graph([(1, 2, 1), (2, 3, 1), (3, 4, 5), (4, 1, 5)])
+        node_costs, previous_nodes = di.find_costs_from([1, 3], graph)
+        self.assertEqual({1: 0, 3: 0, 2: 1, 4: 5}, node_costs)
+        self.assertEqual([1, 3], list(node_costs)[:2])  # Settled in order of cost
+        self.assertEqual(None, previous_nodes[3])
+
+    def test_prune_tree(self):
+        previous = {1: None, 2: 1, 3: 2, 4: 1, 5: 4}
+        self.assertEqual({1: None, 2: 1, 3: 2}, di.prune_tree([3], previous))
+
+
+class TestSearchSpace(unittest.TestCase):
+
+    def setUp(self):
+        graph = network.Graph([(1, 2, 1), (2, 3, 1), (3, 4, 5), (4, 1, 5), (5, 6, 1)])
+        self.space = di.SearchSpace(graph)
+
+    def test_search(self):
+        self.space.search([1])
+        self.assertEqual(5, self.space.cost(4))
+        self.assertEqual(float('inf'), self.space.cost(5))  # Unreachable
+        self.assertEqual({3: 2, 2: 1, 1: None}, self.space.tree([3]))
+
+    def test_search_targets(self):
+        self.space.search([1], [2])
+        self.assertEqual(1, self.space.cost(2))
+        self.assertEqual(float('inf'), self.space.cost(4))  # Not settled yet
+
+    def test_search_limit(self):
+        self.space.search([2], [1, 2, 3, 4], limit=2)
+        self.assertEqual([2, 1], self.space.found)  # Ties go to the lower node
+        self.assertEqual(float('inf'), self.space.cost(3))
+
+    def test_search_again(self):
+        """A search doesn't see what the one before it settled."""
+        self.space.search([1])
+        self.space.search([5])
+        self.assertEqual(1, self.space.cost(6))
+        self.assertEqual(float('inf'), self.space.cost(2))
+        self.assertEqual({}, self.space.tree([2, 3]))
+        self.space.search([3], [1])
+        self.assertEqual(2, self.space.cost(1))
+        self.assertEqual({1: 2, 2: 3, 3: None}, self.space.tree([1]))
+
+    def test_search_changed_targets(self):
+        """Targets changed in place between searches are looked up again."""
+        targets = {2}
+        self.space.search([1], targets)
+        targets.add(4)
+        self.space.search([1], targets)
+        self.assertEqual([2, 4], sorted(self.space.found))
+
+
+class TestPairSolutions(unittest.TestCase):
+
+    def setUp(self):
+        self.solutions = di.PairSolutions()
+        self.solutions.add(1, {3: 2, 5: float('inf')}, {1: None, 2: 1, 3: 2})
+
+    def test_lookup(self):
+        self.assertEqual((2, [1, 2, 3]), self.solutions[(1, 3)])
+        self.assertEqual((2, [3, 2, 1]), self.solutions[(3, 1)])
+        self.assertEqual((float('inf'), []), self.solutions[(5, 1)])
+
+    def test_missing(self):
+        self.assertNotIn((3, 5), self.solutions)
+        self.assertRaises(KeyError, self.solutions.cost, (3, 5))
+
+    def test_len(self):
+        self.assertEqual(4, len(self.solutions))
+        self.assertIn((5, 1), list(self.solutions))
+
+    def test_searched_both_ways(self):
+        """Pairs searched from both ends are only counted once."""
+        self.solutions.add(3, {1: 2}, {3: None, 2: 3, 1: 2})
+        self.assertEqual(4, len(self.solutions))
+        self.assertEqual(len(self.solutions), len(dict(self.solutions)))
+
+    def test_merge(self):
+        """Another search from a start adds to its tree, rather than replacing it."""
+        other = di.PairSolutions()
+        other.add(1, {4: 3, 3: 9}, {1: None, 2: 1, 4: 2})
+        self.solutions.merge(other)
+        self.assertEqual((2, [1, 2, 3]), self.solutions[(1, 3)])
+        self.assertEqual((3, [1, 2, 4]), self.solutions[(1, 4)])
@@ -0,0 +1,83 @@
+import unittest
+
+from chinesepostman import directed, eularian
+from chinesepostman.network import Graph
+
+
+class TestDirected(unittest.TestCase):
+
+    def setUp(self):
+        # A one-way square 1-2-3-4, with a one-way short cut 1-3
+        self.graph = Graph([
+            (1, 2, 1, True), (2, 3, 1, True), (3, 4, 1, True), (4, 1, 1, True),
+            (1, 3, 1, True),
+        ])
+
+    def assertWalks(self, graph, route):
+        """Check a route is closed, and walks every edge the right way."""
+        self.assertEqual(route[0], route[-1])
+        steps = list(zip(route, route[1:]))
+        for edge in graph.edges.values():
+            step = (edge.head, edge.tail)
+            if edge.directed:
+                self.assertIn(step, steps)
+                steps.remove(step)
+            else:
+                self.assertTrue(step in steps or step[::-1] in steps)
+                steps.remove(step if step in steps else step[::-1])
+
+    def test_imbalances(self):
+        self.assertEqual({1: -1, 3: 1}, directed.imbalances(self.graph))
+
+    def test_has_one_way_edges(self):
+        self.assertTrue(directed.has_one_way_edges(self.graph))
+        self.assertFalse(directed.has_one_way_edges(Graph([(1, 2, 1)])))
+
+    def test_extra_walks(self):
+        walks = directed.find_extra_walks(self.graph)
+        self.assertEqual({2: (1, 0), 3: (1, 0)}, walks)  # 3-4-1 again
+
+    def test_solve_directed(self):
+        route, cost = directed.solve(self.graph, start=2)
+        self.assertEqual(7, cost)
+        self.assertEqual(2, route[0])
+        self.assertEqual(8, len(route))
+        self.assertWalks(self.graph, route)
+
+    def test_solve_mixed(self):
+        # A two-way edge 1-3 can be walked back the cheap way, 3 to 1
+        graph = Graph([
+            (1, 2, 1, True), (2, 3, 1, True), (3, 4, 5, True), (4, 1, 5, True),
+            (1, 3, 1),
+        ])
+        route, cost = directed.solve(graph)
+        self.assertEqual(14, cost)
+        self.assertWalks(graph, route)
+
+    def test_two_way_only(self):
+        """Without one-way edges, the cost is that of the undirected problem."""
+        edges = [
+            (1, 2, 8), (1, 5, 4), (1, 8, 3), (2, 3, 9), (2, 7, 6), (3, 4, 5),
+            (3, 6, 3), (4, 5, 5), (4, 6, 1), (5, 6, 2), (5, 7, 3), (7, 8, 1),
+        ]
+        route, cost = directed.solve(Graph(edges))
+        _, expected = eularian.solve_component(Graph(edges))
+        self.assertEqual(expected, cost)
+        self.assertWalks(Graph(edges), route)
+
+    def test_strongly_connected(self):
+        graph = Graph([(1, 2, 1, True), (2, 3, 1, True), (1, 3, 1)])
+        self.assertEqual(3, directed.solve(graph)[1])  # 1-3 is walked back, 3 to 1
+        graph = Graph([(1, 2, 1, True), (2, 3, 1, True)])
+        self.assertRaises(ValueError, directed.solve, graph)
+
+    def test_disconnected(self):
+        graph = Graph([(1, 2, 1, True), (2, 1, 1, True), (3, 4, 1, True)])
+        self.assertRaises(eularian.DisconnectedGraphError, directed.solve, graph)
+
+    def test_hierholzer_one_way(self):
+        graph = Graph([(1, 2, 1, True), (2, 3, 1, True), (3, 1, 1, True)])
+        route, keys = eularian.hierholzer_walk(graph, 1)
+        self.assertEqual([1, 2, 3, 1], route)
+        route, keys = eularian.hierholzer_walk(graph, 3)
+        self.assertEqual([3, 1, 2, 3], route)
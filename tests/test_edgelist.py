@@ -0,0 +1,83 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from chinesepostman import edgelist
+from chinesepostman.network import Graph
+
+
+class TestEdgeList(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'wt') as f:
+            f.write(text)
+        return path
+
+    def test_csv_with_header(self):
+        text = 'from,to,length\nA,B,4\nB,C,2.5\n# closed\nC,A,1\n'
+        path = self.write('roads.csv', text)
+        graph, node_ids, stats = edgelist.load_edge_list(path)
+        self.assertEqual(['A', 'B', 'C'], node_ids.names)
+        self.assertEqual([(0, 1, 4), (1, 2, 2.5), (2, 0, 1)], graph.all_edges)
+        self.assertEqual(3, stats.rows)
+        self.assertEqual(3, stats.edges)
+
+    def test_bad_first_row(self):
+        """A first row with numbers in it is data, not a header."""
+        path = self.write('roads.csv', '1,2,x\n2,3,4\n')
+        self.assertRaises(ValueError, edgelist.load_edge_list, path, intern=False)
+        _, _, stats = edgelist.load_edge_list(path, intern=False, strict=False)
+        self.assertEqual((2, 1), (stats.rows, stats.invalid))
+
+    def test_tsv_gzipped(self):
+        path = self.write('roads.tsv.gz', '1\t2\t4\n2\t3\t2\n')
+        graph, node_ids, _ = edgelist.load_edge_list(path, intern=False)
+        self.assertIsNone(node_ids)
+        self.assertEqual([(1, 2, 4), (2, 3, 2)], graph.all_edges)
+
+    def test_directed_column(self):
+        path = self.write('roads.csv', 'A,B,4,true\nB,A,4,0\n')
+        graph, _, _ = edgelist.load_edge_list(path, columns=(0, 1, 2, 3))
+        self.assertEqual([(0, 1, 4, True), (1, 0, 4, False)], graph.all_edges)
+
+    def test_duplicates(self):
+        path = self.write('roads.csv', 'A,B,4\nB,A,4\nA,B,5\n')
+        graph, _, stats = edgelist.load_edge_list(path, dedupe=True)
+        self.assertEqual(2, len(graph))
+        self.assertEqual(1, stats.duplicates)
+        graph, _, stats = edgelist.load_edge_list(path)  # Parallel edges are kept
+        self.assertEqual(3, len(graph))
+        self.assertEqual(0, stats.duplicates)
+
+    def test_invalid_rows(self):
+        path = self.write('roads.csv', 'A,B,4\nA,C\nA,D,-1\nA,E,x\nA,F,2\n')
+        self.assertRaises(ValueError, edgelist.load_edge_list, path)
+        graph, _, stats = edgelist.load_edge_list(path, strict=False)
+        self.assertEqual(2, len(graph))
+        self.assertEqual(3, stats.invalid)
+
+    def test_chunks(self):
+        rows = ''.join('{},{},1\n'.format(i, i + 1) for i in range(10))
+        path = self.write('roads.csv', rows)
+        reports = []
+        graph, _, stats = edgelist.load_edge_list(
+            path, chunk_size=4, progress=lambda stats: reports.append(stats.edges)
+        )
+        self.assertEqual([4, 8, 10], reports)
+        self.assertIsInstance(graph, Graph)
+        self.assertGreaterEqual(stats.rate, 0)
+
+    def test_node_ids(self):
+        node_ids = edgelist.NodeIds()
+        self.assertEqual([0, 1, 0], [node_ids('x'), node_ids('y'), node_ids('x')])
+        self.assertEqual(2, len(node_ids))
@@ -1,6 +1,6 @@
 import unittest
 
-from chinesepostman import eularian
+from chinesepostman import cache, eularian, profiling
 from chinesepostman.network import Graph, Edge
 
 
@@ -43,3 +43,157 @@ class TestEularian(unittest.TestCase):
         self.assertCountEqual(
             [Edge(2, 3, 1), Edge(4, 5, 1)], eularian.find_dead_ends(graph)
         )
+
+    def test_find_node_pair_solutions(self):
+        """Pair solutions on a belted diamond, in both directions."""
+        graph = Graph([(1, 2, 4), (1, 3, 4), (2, 3, 1), (2, 4, 4), (3, 4, 4)])
+        solutions = eularian.find_node_pair_solutions([(1, 2), (1, 4), (2, 4)], graph)
+        self.assertEqual((4, [1, 2]), solutions[(1, 2)])
+        self.assertEqual((4, [2, 1]), solutions[(2, 1)])
+        self.assertEqual(8, solutions[(1, 4)][0])
+        self.assertEqual(6, len(solutions))
+
+    def test_make_eularian_strategies_agree(self):
+        """Six odd nodes: matching costs the same as trying every pair set."""
+        edges = [
+            (1, 2, 8), (1, 5, 4), (1, 8, 3), (2, 3, 9), (2, 7, 6), (3, 4, 5),
+            (3, 6, 3), (4, 5, 5), (4, 6, 1), (5, 6, 2), (5, 7, 3), (7, 8, 1),
+        ]
+        brute, _ = eularian.make_eularian(Graph(edges), strategy='brute')
+        blossom, _ = eularian.make_eularian(Graph(edges), strategy='blossom')
+        self.assertTrue(blossom.is_eularian)
+        self.assertEqual(brute.total_cost, blossom.total_cost)
+
+    def test_make_eularian_unknown_strategy(self):
+        graph = Graph([(1, 2, 1)])
+        self.assertRaises(ValueError, eularian.make_eularian, graph, 'psychic')
+
+    def test_hierholzer_walk_keys(self):
+        """Square with parallel edges: every key used once, joining its nodes."""
+        graph = Graph(
+            [(1, 2, 1), (1, 2, 2), (2, 3, 1), (2, 3, 2), (3, 4, 1), (3, 4, 2), (4, 1, 1),
+             (4, 1, 2)]
+        )
+        route, keys = eularian.hierholzer_walk(graph, 3)
+        self.assertEqual(sorted(graph.edges), sorted(keys))
+        for i, key in enumerate(keys):
+            edge = graph.edges[key]
+            self.assertCountEqual((edge.head, edge.tail), route[i:i + 2])
+
+    def test_eularian_path_circuit(self):
+        graph = Graph([(1, 2, 1), (2, 3, 1), (3, 4, 1), (4, 1, 1), (1, 3, 1), (1, 3, 1)])
+        route, attempts = eularian.eularian_path(graph, 4)
+        self.assertEqual(1, attempts)
+        self.assertEqual(7, len(route))
+        self.assertEqual((4, 4), (route[0], route[-1]))
+
+    def test_eularian_path_semi_eularian(self):
+        """Kite: trail must run between the two odd nodes."""
+        graph = Graph([(1, 2, 4), (2, 3, 3), (3, 4, 2), (2, 4, 3), (5, 4, 2), (4, 1, 3)])
+        route, _ = eularian.eularian_path(graph)
+        self.assertEqual(7, len(route))
+        self.assertCountEqual([2, 5], [route[0], route[-1]])
+        self.assertEqual(([], None), eularian.eularian_path(graph, 1))
+
+    def test_eularian_path_disconnected(self):
+        graph = Graph([(1, 2, 1), (2, 3, 1), (3, 1, 1), (4, 5, 1), (5, 6, 1), (6, 4, 1)])
+        with self.assertRaises(eularian.DisconnectedGraphError) as context:
+            eularian.eularian_path(graph, 1, method='fleury')
+        self.assertEqual(2, len(context.exception.components))
+
+    def test_solve_components(self):
+        """A triangle and a separate kite, solved one by one."""
+        graph = Graph([
+            (1, 2, 1), (2, 3, 1), (3, 1, 1),
+            (11, 12, 4), (12, 13, 3), (13, 14, 2), (12, 14, 3), (15, 14, 2), (14, 11, 3),
+        ])
+        expected = [(22, 11), (3, 2)]
+        for workers in (None, 2):
+            results = eularian.solve_components(graph, start=2, workers=workers)
+            self.assertEqual(expected, [(cost, route[0]) for route, cost in results])
+
+    def test_solve_components_options(self):
+        """Pairing, cache & contraction options reach every component."""
+        graph = Graph([
+            (1, 2, 1), (2, 3, 1), (3, 1, 1), (3, 4, 2),
+            (11, 12, 4), (12, 13, 3), (13, 14, 2), (12, 14, 3), (15, 14, 2), (14, 11, 3),
+        ])
+        path_cache = cache.PathCache(':memory:')
+        for contract in (False, True):
+            for options in ({'cache': path_cache}, {'time_limit': 1, 'nearest': 1}):
+                results = eularian.solve_components(
+                    graph, 4, 'anytime', backend='python', contract=contract, **options
+                )
+                self.assertEqual([22, 7], [cost for _, cost in results])
+                self.assertEqual(4, results[1][0][0])
+        self.assertEqual(3, len(path_cache))  # Both components, then the contracted kite
+        self.assertRaises(ValueError, eularian.solve_components, graph, nearest=0)
+
+    def test_eularian_path_unknown_start(self):
+        graph = Graph([(1, 2, 1), (2, 3, 1), (3, 4, 1), (4, 1, 1)])
+        self.assertEqual(([], None), eularian.eularian_path(graph, 99))
+        self.assertEqual(([], None), eularian.eularian_path(graph, 99, method='fleury'))
+
+    def test_eularian_path_fleury(self):
+        graph = Graph([(1, 2, 1), (2, 3, 1), (3, 4, 1), (4, 1, 1)])
+        route, attempts = eularian.eularian_path(graph, 1, method='fleury')
+        self.assertEqual(5, len(route))
+        self.assertEqual((1, 1), (route[0], route[-1]))
+
+    def test_find_node_pair_solutions_workers(self):
+        """Sharding searches across processes gives the same solutions."""
+        graph = Graph([
+            (1, 2, 8), (1, 5, 4), (1, 8, 3), (2, 3, 9), (2, 7, 6), (3, 4, 5),
+            (3, 6, 3), (4, 5, 5), (4, 6, 1), (5, 6, 2), (5, 7, 3), (7, 8, 1),
+        ])
+        node_pairs = eularian.build_node_pairs(graph)
+        expected = eularian.find_node_pair_solutions(node_pairs, graph)
+        result = eularian.find_node_pair_solutions(node_pairs, graph, workers=2)
+        self.assertEqual(expected, result)
+
+    def test_find_nearest_pair_solutions(self):
+        graph = Graph([(1, 2, 1), (2, 3, 1), (3, 4, 1), (4, 5, 1), (5, 6, 1), (6, 7, 1)])
+        solutions, pairs = eularian.find_nearest_pair_solutions([1, 3, 5, 7], graph, 1)
+        self.assertEqual([(1, 3), (5, 3), (7, 5)], pairs)  # Ties go to the lower node
+        self.assertEqual((2, [3, 4, 5]), solutions[(3, 5)])
+        self.assertNotIn((1, 7), solutions)
+
+    def test_find_nearest_pairing_widens(self):
+        """Nodes 3 & 4 are both nearest to 1, which can't pair with both."""
+        graph = Graph([(0, 1, 1), (0, 2, 2), (0, 3, 3), (0, 4, 4)])
+        for strategy in ('blossom', 'anytime'):
+            stats = profiling.Stats()
+            with stats:
+                pairs, route = eularian.find_nearest_pairing(
+                    [1, 2, 3, 4], graph, 1, strategy
+                )
+            self.assertCountEqual([1, 2, 3, 4], [node for pair in pairs for node in pair])
+            cost = sum(graph.edge_cost(*x) for path in route for x in zip(path, path[1:]))
+            self.assertEqual(10, cost)  # Every perfect pairing here costs 10
+            widenings = stats.counters.get('candidate widenings', 0)
+            self.assertEqual(1 if strategy == 'blossom' else 0, widenings)
+
+    def test_make_eularian_nearest(self):
+        edges = [
+            (1, 2, 8), (1, 5, 4), (1, 8, 3), (2, 3, 9), (2, 7, 6), (3, 4, 5),
+            (3, 6, 3), (4, 5, 5), (4, 6, 1), (5, 6, 2), (5, 7, 3), (7, 8, 1),
+        ]
+        blossom, _ = eularian.make_eularian(Graph(edges))
+        nearest, _ = eularian.make_eularian(Graph(edges), nearest=2)
+        self.assertTrue(nearest.is_eularian)
+        self.assertLessEqual(blossom.total_cost, nearest.total_cost)
+        every, _ = eularian.make_eularian(Graph(edges), nearest=5)  # All six odd nodes
+        self.assertEqual(blossom.total_cost, every.total_cost)
+        self.assertRaises(ValueError, eularian.make_eularian, Graph(edges), nearest=0)
+
+    def test_make_eularian_anytime_nearest(self):
+        """Searches for nodes left unmatched keep the paths found before them."""
+        edges = [
+            (1, 2, 8), (1, 3, 3), (1, 4, 2), (3, 5, 4), (1, 6, 9), (5, 7, 4), (6, 8, 2),
+            (6, 9, 5), (7, 10, 6), (3, 11, 3), (3, 7, 6), (10, 3, 7), (10, 5, 9),
+            (11, 3, 2), (2, 6, 8),
+        ]
+        graph, _ = eularian.make_eularian(Graph(edges), 'anytime', nearest=1)
+        self.assertTrue(graph.is_eularian)
+        route, _ = eularian.eularian_path(graph)
+        self.assertEqual(len(graph) + 1, len(route))
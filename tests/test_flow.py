@@ -0,0 +1,39 @@
+import unittest
+
+from chinesepostman import flow
+
+
+class TestMinCostFlow(unittest.TestCase):
+
+    def test_cheapest_route(self):
+        arcs = [('a', 'b', 1, None), ('b', 'c', 1, None), ('a', 'c', 3, None)]
+        self.assertEqual([2, 2, 0], flow.min_cost_flow({'a': 2, 'c': -2}, arcs))
+
+    def test_capacity(self):
+        arcs = [('a', 'b', 1, 1), ('b', 'c', 1, None), ('a', 'c', 3, None)]
+        self.assertEqual([1, 1, 1], flow.min_cost_flow({'a': 2, 'c': -2}, arcs))
+
+    def test_many_sources(self):
+        arcs = [
+            (1, 3, 4, None), (1, 4, 1, None), (2, 3, 1, None), (2, 4, 4, None),
+        ]
+        flows = flow.min_cost_flow({1: 1, 2: 2, 3: -2, 4: -1}, arcs)
+        self.assertEqual([0, 1, 2, 0], flows)
+
+    def test_reverses_flow(self):
+        # The first, cheapest path must be partly undone for both units to arrive
+        arcs = [
+            ('s', 'a', 1, 1), ('a', 'b', 1, 1), ('b', 't', 1, 1), ('s', 'b', 3, 1),
+            ('a', 't', 4, 1),
+        ]
+        flows = flow.min_cost_flow({'s': 2, 't': -2}, arcs)
+        self.assertEqual([1, 0, 1, 1, 1], flows)
+
+    def test_zero_supply(self):
+        self.assertEqual([0], flow.min_cost_flow({}, [(1, 2, 1, None)]))
+
+    def test_infeasible(self):
+        arcs = [(1, 2, 1, None)]
+        self.assertRaises(ValueError, flow.min_cost_flow, {2: 1, 1: -1}, arcs)
+        self.assertRaises(ValueError, flow.min_cost_flow, {1: 2, 2: -1}, arcs)
+        self.assertRaises(ValueError, flow.min_cost_flow, {1: 1, 2: -1}, [(1, 2, -1, 1)])
@@ -0,0 +1,44 @@
+import unittest
+
+from benchmarks import generators
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_seeded(self):
+        for name, generator in generators.GENERATORS.items():
+            first = generator(500, seed=3)
+            second = generator(500, seed=3)
+            self.assertEqual(
+                [x.contents for x in first.edges.values()],
+                [x.contents for x in second.edges.values()],
+                name,
+            )
+
+    def test_connected(self):
+        for name, generator in generators.GENERATORS.items():
+            graph = generator(1000, seed=1)
+            self.assertTrue(graph.is_connected, name)
+            self.assertLess(abs(len(graph) - 1000), 200, name)
+
+    def test_grid(self):
+        graph = generators.grid(12)  # 3 x 3 blocks
+        self.assertEqual(12, len(graph))
+        self.assertEqual([1, 3, 5, 7], graph.odd_nodes)
+
+    def test_tree(self):
+        graph = generators.tree(100, core=0.1)
+        self.assertEqual(100, len(graph))
+        self.assertEqual(100, len(graph.node_keys))  # One cycle, the ring
+
+    def test_odd_nodes(self):
+        for odd in (0, 2, 50, 300):
+            graph = generators.odd_nodes(1000, odd=odd, seed=odd)
+            self.assertEqual(odd, len(graph.odd_nodes))
+            self.assertEqual(1000, len(graph))
+
+    def test_odd_nodes_invalid(self):
+        with self.assertRaises(ValueError):
+            generators.odd_nodes(1000, odd=3)
+        with self.assertRaises(ValueError):
+            generators.odd_nodes(100, odd=100)
@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from chinesepostman import incremental
+from chinesepostman.network import Graph
+
+
+class TestIncremental(unittest.TestCase):
+
+    def setUp(self):
+        # Non-eularian w/ 6 odd nodes, plus a dead-end
+        self.edges = [
+            (1, 2, 8), (1, 5, 4), (1, 8, 3), (2, 3, 9), (2, 7, 6), (3, 4, 5),
+            (3, 6, 3), (4, 5, 5), (4, 6, 1), (5, 6, 2), (5, 7, 3), (7, 8, 1),
+            (8, 9, 2),
+        ]
+
+    def assertSolved(self, solution):
+        """Check a solution against solving its graph from scratch."""
+        graph = Graph([edge.contents for edge in solution.graph.edges.values()])
+        expected = incremental.solve(graph)
+        self.assertEqual(expected.total_cost, solution.total_cost)
+        self.assertEqual(len(solution.eularian_graph) + 1, len(solution.route))
+        self.assertEqual(solution.route[0], solution.route[-1])
+
+    def test_solve(self):
+        solution = incremental.solve(Graph(self.edges), 1)
+        self.assertEqual([1, 2, 3, 4, 6, 7], solution.odd_nodes)
+        self.assertEqual(1, solution.route[0])
+        self.assertEqual(1, len(solution.dead_ends))
+
+    def test_add_edge(self):
+        solution = incremental.solve(Graph(self.edges))
+        self.assertSolved(incremental.update(solution, added=[(2, 4, 1)]))
+
+    def test_remove_edge(self):
+        solution = incremental.solve(Graph(self.edges))
+        self.assertSolved(incremental.update(solution, removed=[(4, 6, 1)]))
+
+    def test_remove_dead_end(self):
+        solution = incremental.solve(Graph(self.edges))
+        updated = incremental.update(solution, removed=[(8, 9, 2)])
+        self.assertEqual({}, updated.dead_ends)
+        self.assertSolved(updated)
+
+    def test_reweight(self):
+        solution = incremental.solve(Graph(self.edges))
+        self.assertSolved(incremental.update(solution, reweighted=[(5, 6, 20)]))
+        self.assertSolved(incremental.update(solution, reweighted=[(2, 3, 1)]))
+
+    def test_unchanged_matching_kept(self):
+        solution = incremental.solve(Graph(self.edges))
+        updated = incremental.update(solution, added=[(1, 3, 50), (1, 3, 50)])
+        self.assertIs(solution.cheapest_set, updated.cheapest_set)
+        self.assertSolved(updated)
+
+    def test_random_deltas(self):
+        rand = random.Random(4)
+        solution = incremental.solve(Graph(self.edges))
+        for _ in range(30):
+            edges = list(solution.graph.edges.values())
+            if rand.random() < 0.5 and len(edges) > 12:
+                edge = rand.choice(edges)
+                solution = incremental.update(solution, removed=[edge.contents])
+            elif rand.random() < 0.5:
+                edge = rand.choice(edges)
+                weight = rand.randint(1, 10)
+                solution = incremental.update(
+                    solution, reweighted=[(edge.head, edge.tail, weight)]
+                )
+            else:
+                head, tail = rand.sample(range(1, 10), 2)
+                solution = incremental.update(
+                    solution, added=[(head, tail, rand.randint(1, 10))]
+                )
+            self.assertSolved(solution)
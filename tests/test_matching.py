@@ -0,0 +1,49 @@
+import itertools
+import random
+import unittest
+
+from chinesepostman import eularian, matching
+
+
+class TestMatching(unittest.TestCase):
+
+    def test_min_weight_matching_square(self):
+        costs = {(1, 2): 1, (1, 3): 5, (1, 4): 5, (2, 3): 5, (2, 4): 5, (3, 4): 1}
+        self.assertCountEqual([(1, 2), (3, 4)], matching.min_weight_matching(costs))
+
+    def test_min_weight_matching_prefers_total(self):
+        """Greedy would take the cheap middle pair and pay for the outer one."""
+        costs = {(1, 2): 2, (2, 3): 1, (3, 4): 2, (1, 4): 10, (1, 3): 10, (2, 4): 10}
+        self.assertCountEqual([(1, 2), (3, 4)], matching.min_weight_matching(costs))
+
+    def test_min_weight_matching_sparse_impossible(self):
+        costs = {(1, 2): 1, (1, 3): 1, (1, 4): 1}  # A star has no perfect matching
+        self.assertRaises(ValueError, matching.min_weight_matching, costs)
+
+    def test_min_weight_matching_empty(self):
+        self.assertEqual([], matching.min_weight_matching({}))
+
+    def test_min_weight_matching_brute_force(self):
+        """Agrees with trying every pair set, on random complete graphs."""
+        rng = random.Random(42)
+        for _ in range(100):
+            nodes = list(range(rng.choice([2, 4, 6, 8])))
+            pairs = itertools.combinations(nodes, 2)
+            costs = {pair: rng.randint(0, 20) for pair in pairs}
+            expected = min(
+                sum(costs[pair] for pair in pair_set)
+                for pair_set in eularian.unique_pairs(nodes)
+            )
+            result = matching.min_weight_matching(costs)
+            self.assertEqual(expected, sum(costs[pair] for pair in result))
+            self.assertCountEqual(nodes, [node for pair in result for node in pair])
+
+    def test_max_weight_matching_simple(self):
+        self.assertEqual([-1, 2, 1], matching.max_weight_matching([(1, 2, 3)]))
+
+    def test_max_weight_matching_max_cardinality(self):
+        edges = [(0, 1, 2), (1, 2, 5), (2, 3, 2)]
+        self.assertEqual([-1, 2, 1, -1], matching.max_weight_matching(edges))
+        self.assertEqual(
+            [1, 0, 3, 2], matching.max_weight_matching(edges, max_cardinality=True)
+        )
@@ -1,6 +1,6 @@
 import unittest
 
-from chinesepostman.network import Graph, Edge
+from chinesepostman.network import Graph, GraphView, Edge, EdgeStore
 
 class TestGraph(unittest.TestCase):
 
@@ -63,6 +63,31 @@ class TestGraph(unittest.TestCase):
         expected = {0: Edge(1,2,4), 1: Edge(1,4,4)}
         self.assertEqual(expected, self.graph.edge_options(1))
 
+    def test_node_orders(self):
+        self.assertEqual({1: 2, 2: 3, 3: 2, 4: 3}, self.graph.node_orders)
+
+    def test_node_order_missing(self):
+        self.assertEqual(0, self.graph.node_order(5))
+
+    def test_odd_nodes_after_remove(self):
+        graph = Graph(self.edges)
+        graph.remove_edge(2,4,1)  # Crossing edge gone: a simple Eularian diamond
+        self.assertEqual([], graph.odd_nodes)
+        self.assertEqual([1, 3], graph.node_options(2))
+
+    def test_remove_edge_drops_node(self):
+        graph = Graph([(1,2,1), (2,3,1)])
+        graph.remove_edge(2,3,1)
+        self.assertEqual({1, 2}, graph.nodes)
+
+    def test_add_edge_after_remove(self):
+        graph = Graph([(1,2,1), (2,3,1), (3,1,1)])
+        graph.remove_edge(0)
+        self.assertEqual(3, graph.add_edge(3, 4, 1))  # Keys are never reused
+        self.assertEqual([1, 2, 3], list(graph.edges))
+        self.assertEqual(Edge(3,1,1), graph.edges[2])
+        self.assertEqual([1, 2, 3, 4], graph.odd_nodes)
+
     def test_is_eularian_true(self):
         # A simple Eularian diamond
         graph = Graph([(1,2,1), (2,3, 1), (3,4,1), (4,1,1)])
@@ -103,6 +128,119 @@ class TestGraph(unittest.TestCase):
         graph = Graph([(1,2,1), (1,3,1), (2,3,1), (3,4,1), (4,5,1), (4,6,1), (5,6,1)])
         self.assertFalse(graph.is_bridge(2))  # Edge 2 aka '2-3' is not a bridge
 
+    def test_find_bridges(self):
+        #  Two triangles 1-2-3 and 4-5-6 joined by '3-4' bridge, plus a '6-7' tail
+        graph = Graph(
+            [(1,2,1), (1,3,1), (2,3,1), (3,4,1), (4,5,1), (4,6,1), (5,6,1), (6,7,1)]
+        )
+        self.assertEqual({3, 7}, graph.find_bridges())
+
+    def test_find_bridges_parallel(self):
+        # A doubled edge is not a bridge, a single one is
+        graph = Graph([(1,2,1), (1,2,1), (2,3,1)])
+        self.assertEqual({2}, graph.find_bridges())
+
+    def test_find_bridges_start_and_skip(self):
+        # Two separate triangles: skipping one edge turns the others into bridges
+        graph = Graph([(1,2,1), (2,3,1), (3,1,1), (4,5,1), (5,6,1), (6,4,1)])
+        self.assertEqual(set(), graph.find_bridges())
+        self.assertEqual({0, 1}, graph.find_bridges(1, skip={2}))
+
+
+class TestGraphView(unittest.TestCase):
+
+    def setUp(self):
+        # Two very wide, flat triangles, Semi-Eularian
+        self.edges = [(1,2,4), (1,4,4), (2,4,1), (2,3,4), (3,4,4)]
+        self.graph = Graph(self.edges)
+
+    def test_hidden_edges(self):
+        view = GraphView(self.graph, hidden=[2])  # Hide '2-4'
+        self.assertEqual(4, len(view))
+        self.assertEqual([], view.odd_nodes)
+        self.assertEqual({0: Edge(1,2,4), 3: Edge(2,3,4)}, view.edge_options(2))
+        self.assertEqual(5, len(self.graph))  # Underlying graph untouched
+        self.assertEqual([2, 4], self.graph.odd_nodes)
+
+    def test_added_edges(self):
+        view = GraphView(self.graph)
+        view.add_edge(2, 4, 1)
+        self.assertTrue(view.is_eularian)
+        self.assertEqual(18, view.total_cost)
+        self.assertEqual(Edge(2,4,1), view.edges[5])
+        self.assertEqual([1, 3, 4, 4], view.node_options(2))
+
+    def test_remove_added_edge(self):
+        view = GraphView(self.graph)
+        view.add_edge(4, 5, 1)
+        view.remove_edge(4, 5, 1)
+        self.assertEqual({1, 2, 3, 4}, view.nodes)
+        self.assertEqual(self.graph.all_edges, view.all_edges)
+
+    def test_removed_node(self):
+        view = GraphView(self.graph, hidden=[3, 4])  # Hide '2-3' & '3-4'
+        self.assertEqual({1, 2, 4}, view.nodes)
+        self.assertEqual(0, view.node_order(3))
+
+    def test_nested_views(self):
+        view = GraphView(GraphView(self.graph, hidden=[2]), hidden=[0])
+        self.assertEqual([1, 2], view.odd_nodes)
+        self.assertRaises(KeyError, view.remove_edge, 2)
+
+
+class TestComponents(unittest.TestCase):
+
+    def setUp(self):
+        # A triangle, a separate edge & a separate self-loop
+        self.graph = Graph([(1,2,1), (2,3,1), (3,1,1), (7,8,2), (5,5,1)])
+
+    def test_components(self):
+        self.assertEqual([{1, 2, 3}, {7, 8}, {5}], self.graph.components())
+        self.assertFalse(self.graph.is_connected)
+
+    def test_connected(self):
+        self.assertTrue(Graph([(1,2,1), (2,3,1)]).is_connected)
+        self.assertTrue(Graph().is_connected)
+
+    def test_subgraph(self):
+        subgraph = self.graph.subgraph({7, 8})
+        self.assertEqual([(7,8,2)], subgraph.all_edges)
+
+
+class TestEdgeStore(unittest.TestCase):
+
+    def test_append_and_pop(self):
+        store = EdgeStore()
+        self.assertEqual(0, store.append(Edge(1, 2, 3)))
+        self.assertEqual(1, store.append(Edge(2, 3, 4, True)))
+        self.assertEqual(Edge(2, 3, 4, True), store.pop(1))
+        self.assertEqual({0: Edge(1, 2, 3)}, dict(store))
+        self.assertNotIn(1, store)
+        self.assertRaises(KeyError, store.__getitem__, 1)
+        self.assertRaises(KeyError, store.__getitem__, -1)
+
+    def test_float_weights(self):
+        store = EdgeStore()
+        store.append(Edge(1, 2, 3))
+        store.append(Edge(2, 3, 0.5))
+        self.assertEqual('d', store.weights.typecode)
+        self.assertEqual([3, 0.5], [edge.weight for edge in store.values()])
+
+    def test_invalid_weight(self):
+        store = EdgeStore()
+        store.append(Edge(1, 2, 3))
+        self.assertRaises(ValueError, store.append, Edge(2, 3, None))
+        self.assertRaises(ValueError, Graph, [(2, 3, 'far')])
+        self.assertEqual({0: Edge(1, 2, 3)}, dict(store))
+
+    def test_invalid_nodes(self):
+        """A rejected edge leaves the columns in step for the next one."""
+        graph = Graph([(1, 2, 1)])
+        self.assertRaises(ValueError, graph.add_edge, 'x', 2, 5)
+        self.assertRaises(ValueError, graph.add_edge, 2 ** 63, 2, 6)
+        graph.add_edge(3, 4, 7)
+        self.assertEqual([Edge(1, 2, 1), Edge(3, 4, 7)], list(graph.edges.values()))
+
 
 class TestEdge(unittest.TestCase):
 
@@ -118,3 +256,6 @@ class TestEdge(unittest.TestCase):
     def test_edge_instance_short(self):
         edge = Edge(1, 2)
         self.assertEqual((1, 2, 0, False), edge)
+
+    def test_edge_slots(self):
+        self.assertRaises(AttributeError, setattr, self.edge, 'colour', 'red')
@@ -0,0 +1,85 @@
+import itertools
+import random
+import unittest
+
+from chinesepostman import eularian, matching, pairing
+from chinesepostman.network import Graph
+
+
+class TestPairing(unittest.TestCase):
+
+    def test_greedy_matching(self):
+        """Takes the cheap middle pair, and pays for the outer one."""
+        costs = {(1, 2): 2, (2, 3): 1, (3, 4): 2, (1, 4): 10, (1, 3): 10, (2, 4): 10}
+        self.assertEqual({1: 4, 4: 1, 2: 3, 3: 2}, pairing.greedy_matching(costs))
+
+    def test_greedy_matching_impossible(self):
+        costs = {(1, 2): 1, (1, 3): 1, (1, 4): 1}
+        self.assertRaises(ValueError, pairing.greedy_matching, costs)
+
+    def test_improve_swaps(self):
+        costs = {(1, 2): 2, (2, 3): 1, (3, 4): 2, (1, 4): 10, (1, 3): 10, (2, 4): 10}
+        result = pairing.anytime_matching(costs)
+        self.assertCountEqual([(1, 2), (3, 4)], result.pairs)
+        self.assertEqual(4, result.cost)
+        self.assertEqual(1, result.swaps)
+
+    def test_lower_bound(self):
+        costs = {(1, 2): 2, (2, 3): 1, (3, 4): 2, (1, 4): 10, (1, 3): 10, (2, 4): 10}
+        result = pairing.anytime_matching(costs)
+        self.assertEqual(3, result.lower_bound)  # (2 + 1 + 1 + 2) / 2
+        self.assertAlmostEqual(1 / 3.0, result.gap)
+
+    def test_no_time(self):
+        """Still returns the greedy pairing."""
+        costs = {(1, 2): 2, (2, 3): 1, (3, 4): 2, (1, 4): 10, (1, 3): 10, (2, 4): 10}
+        result = pairing.anytime_matching(costs, time_limit=0)
+        self.assertCountEqual([(1, 4), (2, 3)], result.pairs)
+        self.assertEqual(11, result.cost)
+
+    def test_more_costs(self):
+        """Nodes the sparse greedy start leaves unmatched are paired with more costs."""
+        costs = {(1, 2): 3, (1, 3): 4, (1, 4): 5}
+        self.assertRaises(ValueError, pairing.anytime_matching, costs)
+        asked = []
+
+        def more_costs(nodes):
+            asked.append(sorted(nodes))
+            return {(3, 4): 7}
+
+        result = pairing.anytime_matching(costs, more_costs=more_costs)
+        self.assertEqual([[3, 4]], asked)
+        self.assertCountEqual([(1, 2), (3, 4)], result.pairs)
+        self.assertEqual(10, result.cost)
+
+    def test_empty(self):
+        result = pairing.anytime_matching({})
+        self.assertEqual([], result.pairs)
+        self.assertEqual(0.0, result.gap)
+
+    def test_bounds_optimum(self):
+        """The optimum lies between the bound & the cost, on random points."""
+        rng = random.Random(42)
+        for _ in range(100):
+            nodes = list(range(rng.choice([2, 4, 6, 8, 10])))
+            points = [(rng.random(), rng.random()) for _ in nodes]
+            costs = {
+                (u, v): int(100 * abs(complex(*points[u]) - complex(*points[v])))
+                for u, v in itertools.combinations(nodes, 2)
+            }
+            optimum = sum(costs[x] for x in matching.min_weight_matching(costs))
+            result = pairing.anytime_matching(costs)
+            self.assertLessEqual(result.lower_bound, optimum)
+            self.assertLessEqual(optimum, result.cost)
+            self.assertEqual(result.cost, sum(costs[x] for x in result.pairs))
+            self.assertCountEqual(nodes, [node for pair in result.pairs for node in pair])
+
+    def test_make_eularian(self):
+        graph = Graph([(1, 2, 1), (2, 3, 1), (3, 4, 1), (4, 1, 1), (1, 3, 1)])
+        eularian_graph, _ = eularian.make_eularian(graph, strategy='anytime')
+        self.assertTrue(eularian_graph.is_eularian)
+        self.assertEqual(6, eularian_graph.total_cost)
+
+    def test_make_eularian_unknown_strategy(self):
+        graph = Graph([(1, 2, 1)])
+        self.assertRaises(ValueError, eularian.make_eularian, graph, strategy='fast')
@@ -0,0 +1,44 @@
+import unittest
+
+from chinesepostman import eularian, profiling
+from chinesepostman.network import Graph
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        # Non-eularian w/ 6 odd nodes
+        self.graph = Graph([
+            (1, 2, 8), (1, 5, 4), (1, 8, 3), (2, 3, 9), (2, 7, 6), (3, 4, 5),
+            (3, 6, 3), (4, 5, 5), (4, 6, 1), (5, 6, 2), (5, 7, 3), (7, 8, 1),
+        ])
+
+    def test_phases_and_counters(self):
+        with profiling.Stats() as stats:
+            graph, _ = eularian.make_eularian(self.graph, 'brute', 'python')
+            eularian.eularian_path(graph, method='fleury')
+        phases = ['dead ends', 'node pairs', 'pair solutions', 'pairing', 'new edges']
+        self.assertEqual(phases + ['circuit'], list(stats.phases))
+        self.assertEqual(5, stats.counters['dijkstra runs'])
+        self.assertGreaterEqual(stats.counters['heap pushes'], 5)
+        self.assertEqual(15, stats.counters['pair sets'])
+        self.assertGreaterEqual(stats.counters['fleury attempts'], 1)
+        self.assertIn('pair solutions', stats.report())
+
+    def test_memory(self):
+        with profiling.Stats(memory=True) as stats:
+            with profiling.phase('outer'):
+                with profiling.phase('inner'):
+                    data = [0] * 100000
+                del data
+        self.assertGreater(stats.phases['inner']['peak_bytes'], 100000)
+        self.assertGreaterEqual(
+            stats.phases['outer']['peak_bytes'], stats.phases['inner']['peak_bytes']
+        )
+
+    def test_inactive(self):
+        profiling.count('nothing')
+        with profiling.phase('nothing'):
+            pass
+        stats = profiling.Stats()
+        self.assertEqual({'seconds': 0.0, 'phases': {}, 'counters': {}}, stats.as_dict())
@@ -0,0 +1,64 @@
+import unittest
+
+from chinesepostman import eularian, rural
+from chinesepostman.network import Graph
+
+
+class TestRural(unittest.TestCase):
+
+    def setUp(self):
+        # A ladder: 1-2-3-4 along the top, 5-6-7-8 along the bottom, & rungs
+        self.graph = Graph([
+            (1, 2, 1), (2, 3, 1), (3, 4, 1),
+            (5, 6, 1), (6, 7, 1), (7, 8, 1),
+            (1, 5, 5), (2, 6, 5), (3, 7, 5), (4, 8, 5),
+        ])
+
+    def keys(self, *pairs):
+        return rural.required_keys(self.graph, pairs)
+
+    def test_required_keys(self):
+        self.assertEqual({0, 6}, self.keys((1, 2), (5, 1)))
+        self.assertRaises(ValueError, self.keys, (1, 3))
+        self.assertRaises(ValueError, self.keys, (9, 1))
+
+    def test_find_connections(self):
+        pieces = [{1, 2}, {4}, {5}]
+        paths = rural.find_connections(self.graph, pieces)
+        self.assertEqual([[2, 3, 4], [1, 5]], paths)
+
+    def test_one_piece(self):
+        route, cost = rural.solve(self.graph, self.keys((2, 3)))
+        self.assertEqual(2, cost)  # There & back
+        self.assertEqual(3, len(route))
+
+    def test_far_pieces(self):
+        route, cost = rural.solve(self.graph, self.keys((1, 2), (3, 4)), start=1)
+        self.assertEqual(6, cost)  # Along the top & back
+        self.assertEqual([1, 2, 3, 4, 3, 2, 1], route)
+
+    def test_start_off_the_required_edges(self):
+        route, cost = rural.solve(self.graph, self.keys((2, 3)), start=5)
+        self.assertEqual(5, route[0])
+        self.assertEqual(5, route[-1])
+        self.assertEqual(14, cost)  # 5-1-2-3, then back 3-2-1-5 or 3-2-6-5
+
+    def test_every_edge_required(self):
+        route, cost = rural.solve(self.graph, list(self.graph.edges))
+        _, expected = eularian.solve_component(self.graph)
+        self.assertEqual(expected, cost)
+        self.assertEqual(route[0], route[-1])
+
+    def test_anytime_nearest(self):
+        route, cost = rural.solve(
+            self.graph, list(self.graph.edges), strategy='anytime', nearest=1
+        )
+        self.assertEqual(13, len(route))  # Doubles 2-3 & 6-7
+        self.assertEqual(28, cost)
+
+    def test_unreachable(self):
+        graph = Graph([(1, 2, 1), (3, 4, 1)])
+        self.assertRaises(
+            eularian.DisconnectedGraphError, rural.solve, graph, [0, 1]
+        )
+        self.assertRaises(ValueError, rural.solve, graph, [])
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from chinesepostman import batch
+from chinesepostman import server
+from chinesepostman.network import Graph
+
+loads = []
+
+
+def slow_load(name):
+    """Load a square slowly, so requests for it pile up."""
+    loads.append(name)
+    if name != 'square':
+        raise ValueError('No graph named {}'.format(name))
+    time.sleep(0.2)
+    return Graph([(1, 2, 1), (2, 3, 1), (3, 4, 1), (4, 1, 1), (1, 3, 1)]), None
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        batch._solved.clear()
+        del loads[:]
+        self.solver = server.SolverServer(slow_load)
+
+    def tearDown(self):
+        self.solver.close()
+
+    def job(self, start, graph='square'):
+        return {'id': start, 'graph': graph, 'start': start}
+
+    def test_coalescing(self):
+        async def solve_all():
+            return await asyncio.gather(
+                self.solver.solve(self.job(1)),
+                self.solver.solve(self.job(1)),
+                self.solver.solve(self.job(3)),
+            )
+
+        first, second, third = asyncio.run(solve_all())
+        self.assertEqual(['square'], loads)
+        self.assertEqual(first['route'], second['route'])
+        self.assertEqual(3, third['route'][0])
+        self.assertEqual(1, self.solver.coalesced)
+        self.assertEqual({}, self.solver._pending)
+
+    def test_responsive(self):
+        """The loop keeps answering while a solve runs in the executor."""
+        async def check():
+            solving = asyncio.ensure_future(self.solver.solve(self.job(1)))
+            await asyncio.sleep(0.01)
+            status, health = await self.solver.respond('GET', '/health', b'')
+            self.assertFalse(solving.done())
+            self.assertEqual(1, health['pending'])
+            return await solving
+
+        self.assertEqual(6, asyncio.run(check())['cost'])
+
+    def serve(self, *texts):
+        """Return the (status, payload) answering each request, on one connection."""
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'solver.sock')
+
+        async def run():
+            task = asyncio.ensure_future(self.solver.serve(path=path))
+            while not os.path.exists(path):
+                await asyncio.sleep(0.01)
+            reader, writer = await asyncio.open_unix_connection(path)
+            results = []
+            for text in texts:
+                writer.write(text.encode('latin-1'))
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+                body = await reader.readexactly(length)
+                results.append((int(head.split()[1]), json.loads(body.decode('utf-8'))))
+            writer.close()
+            task.cancel()
+            return results
+
+        try:
+            return asyncio.run(run())
+        finally:
+            shutil.rmtree(directory)
+
+    def post(self, body):
+        return 'POST /solve HTTP/1.1\r\nContent-Length: {}\r\n\r\n{}'.format(
+            len(body), body
+        )
+
+    def test_http(self):
+        results = self.serve(
+            'GET /solve?graph=square&start=4 HTTP/1.1\r\n\r\n',
+            self.post('{"graph": "square", "start": 2, "id": "a"}'),
+            'GET /solve?graph=nope HTTP/1.1\r\n\r\n',
+            'GET /solve HTTP/1.1\r\n\r\n',
+            'GET /other HTTP/1.1\r\n\r\n',
+            'DELETE /solve?graph=square HTTP/1.1\r\n\r\n',
+        )
+        (status, by_get), (_, by_post), missing, no_graph, other, delete = results
+        self.assertEqual(200, status)
+        self.assertEqual(4, by_get['route'][0])
+        self.assertEqual('a', by_post['id'])
+        self.assertEqual(2, by_post['route'][0])
+        self.assertEqual(6, by_post['cost'])
+        self.assertEqual((400, 'No graph named nope'), (missing[0], missing[1]['error']))
+        self.assertEqual(400, no_graph[0])
+        self.assertEqual(404, other[0])
+        self.assertEqual(405, delete[0])
+
+    def test_invalid_options(self):
+        """Bad fields are answered with a 400, and the connection stays open."""
+        results = self.serve(
+            self.post('{"graph": "x", "start": [1]}'),
+            self.post('{"graph": "square", "time_limit": [1]}'),
+            self.post('{"graph": ["square"]}'),
+            'GET /solve?graph=square&backend=fast HTTP/1.1\r\n\r\n',
+            'GET /solve?graph=square&start=1 HTTP/1.1\r\n\r\n',
+        )
+        self.assertEqual([400, 400, 400, 400, 200], [status for status, _ in results])
+        self.assertEqual('Start must be a node name or number', results[0][1]['error'])
+        self.assertEqual(['square'], loads)
+
+    def test_internal_error(self):
+        """Unexpected errors are answered with a 500."""
+        async def respond(method, target, body):
+            raise RuntimeError('Broken')
+
+        self.solver.respond = respond
+        results = self.serve(*['GET /health HTTP/1.1\r\n\r\n'] * 2)
+        self.assertEqual([(500, {'error': 'RuntimeError: Broken'})] * 2, results)
+
+    def test_served_path(self):
+        """Only files under the graph directory can be named."""
+        directory = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(directory, 'roads'))
+            path = os.path.join(directory, 'roads', 'north.csv')
+            open(path, 'w').close()
+            served = os.path.realpath(path)
+            self.assertEqual(served, server.served_path(directory, 'roads/north.csv'))
+            for name in ('/etc/passwd', '../' * 10 + 'etc/passwd', 'roads', 'south.csv'):
+                self.assertIsNone(server.served_path(directory, name))
+            self.assertIsNone(server.served_path(None, path))
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,49 @@
+import unittest
+
+from chinesepostman import eularian, sparse
+from chinesepostman.network import Graph, GraphView
+
+
+@unittest.skipUnless(sparse.AVAILABLE, 'NumPy and SciPy are not installed')
+class TestSparse(unittest.TestCase):
+
+    def setUp(self):
+        # Non-eularian w/ 6 odd nodes, plus a cheaper parallel edge & a self-loop
+        self.graph = Graph([
+            (1, 2, 8), (1, 5, 4), (1, 8, 3), (2, 3, 9), (2, 7, 6), (3, 4, 5),
+            (3, 6, 3), (4, 5, 5), (4, 6, 1), (5, 6, 2), (5, 7, 3), (7, 8, 1),
+            (1, 2, 7), (3, 3, 1),
+        ])
+
+    def test_to_csr(self):
+        matrix, nodes = sparse.to_csr(self.graph)
+        self.assertEqual([1, 2, 3, 4, 5, 6, 7, 8], list(nodes))
+        self.assertEqual(12, matrix.nnz)
+        self.assertEqual(7, matrix[0, 1])  # Cheapest parallel edge
+
+    def test_find_node_pair_solutions_matches_python(self):
+        node_pairs = eularian.build_node_pairs(self.graph)
+        expected = eularian.find_node_pair_solutions(node_pairs, self.graph)
+        result = sparse.find_node_pair_solutions(node_pairs, self.graph)
+        self.assertEqual(set(expected), set(result))
+        for pair, (cost, path) in result.items():
+            self.assertEqual(expected[pair][0], cost)
+            self.assertEqual(pair, (path[0], path[-1]))
+
+    def test_graph_view(self):
+        view = GraphView(self.graph, hidden=[12])  # Hide the cheaper '1-2'
+        matrix, _ = sparse.to_csr(view)
+        self.assertEqual(8, matrix[0, 1])
+
+
+class TestBackends(unittest.TestCase):
+
+    def test_auto_backend_falls_back(self):
+        graph = Graph([(1, 2, 4), (1, 3, 4), (2, 3, 1), (2, 4, 4), (3, 4, 4)])
+        new_graph, _ = eularian.make_eularian(graph, backend='auto')
+        self.assertEqual(18, new_graph.total_cost)
+
+    @unittest.skipIf(sparse.AVAILABLE, 'NumPy and SciPy are installed')
+    def test_scipy_backend_unavailable(self):
+        graph = Graph([(1, 2, 1)])
+        self.assertRaises(ImportError, eularian.make_eularian, graph, backend='scipy')